@@ -2,11 +2,17 @@ from django.conf import settings
 from rest_framework.routers import DefaultRouter
 from rest_framework.routers import SimpleRouter
 
+from wm_test.cat_expo.api.views import CatViewSet
+from wm_test.cat_expo.api.views import LeaderboardViewSet
+from wm_test.cat_expo.api.views import RatingViewSet
 from wm_test.users.api.views import UserViewSet
 
 router = DefaultRouter() if settings.DEBUG else SimpleRouter()
 
 router.register("users", UserViewSet)
+router.register("cats", CatViewSet)
+router.register("ratings", RatingViewSet, basename="rating")
+router.register("leaderboard", LeaderboardViewSet, basename="leaderboard")
 
 
 app_name = "api"
@@ -0,0 +1,30 @@
+# ruff: noqa
+"""
+ASGI config for wm_test project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Production serves it with gunicorn's uvicorn worker, see
+``compose/production/django/start-asgi``. The async views then share one
+event loop per worker, sync views run in its thread pool.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/dev/howto/deployment/asgi/
+
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from django.core.asgi import get_asgi_application
+
+# This allows easy placement of apps within the interior
+# wm_test directory.
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(BASE_DIR / "wm_test"))
+
+# If DJANGO_SETTINGS_MODULE is unset, default to the production settings
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+
+# This application object is used by any ASGI server configured to use this file.
+application = get_asgi_application()
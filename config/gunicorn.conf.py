@@ -0,0 +1,158 @@
+# ruff: noqa: N999
+"""
+Gunicorn settings for the production image, see compose/production/django/start.
+
+Workers and threads are derived from the CPUs and memory the container may
+use (cgroup limits first, then the host). Every value can be pinned from the
+environment:
+
+- ``WEB_CONCURRENCY``: worker processes.
+- ``GUNICORN_THREADS``: threads per worker, more than one selects gthread.
+- ``GUNICORN_WORKER_MEMORY_MB``: expected RSS of one worker, used to keep
+  the workers inside the memory limit.
+- ``GUNICORN_PRELOAD``: ``false`` imports the app in every worker instead.
+- ``GUNICORN_MAX_REQUESTS``: requests before a worker is recycled, jittered
+  by a tenth so the workers don't all restart at once.
+- ``GUNICORN_STATSD_HOST``: ``host:port`` to send gunicorn's own metrics to.
+- ``GUNICORN_STATS_DIR``: where each worker writes its stats as JSON.
+"""
+
+import json
+import math
+import os
+import resource
+import threading
+import time
+from pathlib import Path
+
+# Leave a share of the memory limit to the master, page cache and spikes.
+MEMORY_HEADROOM = 0.75
+MAX_THREADS = 4
+STATS_EVERY = 100
+
+
+def cpu_count() -> int:
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(cpus, 1)
+
+
+def memory_bytes() -> int | None:
+    try:
+        limit = Path("/sys/fs/cgroup/memory.max").read_text().strip()
+        if limit != "max":
+            return int(limit)
+    except (OSError, ValueError):
+        pass
+    try:
+        for line in Path("/proc/meminfo").read_text().splitlines():
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def sizing() -> tuple[int, int]:
+    """Return ``(workers, threads)`` for this machine."""
+    wanted = 2 * cpu_count() + 1
+    worker_memory = int(os.environ.get("GUNICORN_WORKER_MEMORY_MB", "200")) << 20
+    memory = memory_bytes()
+    fitting = (
+        wanted if memory is None else int(memory * MEMORY_HEADROOM) // worker_memory
+    )
+    workers = int(os.environ.get("WEB_CONCURRENCY", max(1, min(wanted, fitting))))
+    # Make up for workers the memory cannot hold with threads.
+    threads = min(MAX_THREADS, math.ceil(wanted / workers))
+    return workers, int(os.environ.get("GUNICORN_THREADS", threads))
+
+
+bind = "0.0.0.0:5000"
+workers, threads = sizing()
+# Import Django once in the master, the workers share its pages copy-on-write.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() != "false"
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = max_requests // 10
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+# Heartbeat files in memory, /tmp may be on the container's overlay disk.
+worker_tmp_dir = "/dev/shm" if Path("/dev/shm").is_dir() else None  # noqa: S108
+accesslog = "-"
+statsd_host = os.environ.get("GUNICORN_STATSD_HOST") or None
+statsd_prefix = "wm_test.gunicorn"
+stats_dir = Path(os.environ.get("GUNICORN_STATS_DIR", "/tmp/gunicorn-stats"))  # noqa: S108
+
+
+def when_ready(server):
+    stats_dir.mkdir(parents=True, exist_ok=True)
+    server.log.info(
+        "Serving with %s workers x %s threads (%s CPUs, %s MiB memory)",
+        server.cfg.workers,
+        server.cfg.threads,
+        cpu_count(),
+        (memory_bytes() or 0) >> 20,
+    )
+
+
+def post_fork(server, worker):
+    # Connections must not be shared with the master or between workers,
+    # should preloading ever have opened one.
+    from django.db import connections
+
+    connections.close_all()
+    worker.stats = {"pid": worker.pid, "started": time.time(), "requests": 0}
+    worker.stats_lock = threading.Lock()
+    write_stats(worker)
+
+
+def post_request(worker, req, environ, resp):
+    with worker.stats_lock:
+        worker.stats["requests"] += 1
+        due = worker.stats["requests"] % STATS_EVERY == 0
+    if due:
+        write_stats(worker)
+
+
+def worker_exit(server, worker):
+    stats = getattr(worker, "stats", None)
+    if stats is not None:
+        server.log.info(
+            "Worker %s exiting after %s requests, peak RSS %s MiB",
+            worker.pid,
+            stats["requests"],
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss >> 10,
+        )
+    (stats_dir / f"worker-{worker.pid}.json").unlink(missing_ok=True)
+
+
+def write_stats(worker):
+    stats = {
+        **worker.stats,
+        "rss": current_rss(),
+        "updated": time.time(),
+        "max_requests": worker.max_requests,
+    }
+    path = stats_dir / f"worker-{worker.pid}.json"
+    temporary = path.with_suffix(".tmp")
+    try:
+        temporary.write_text(json.dumps(stats))
+        temporary.replace(path)
+    except OSError:
+        worker.log.warning("Could not write worker stats to %s", path)
+
+
+def current_rss() -> int:
+    try:
+        resident = int(Path("/proc/self/statm").read_text().split()[1])
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss << 10
+    return resident * os.sysconf("SC_PAGE_SIZE")
@@ -48,9 +48,56 @@ LOCALE_PATHS = [str(BASE_DIR / "locale")]
 # https://docs.djangoproject.com/en/dev/ref/settings/#databases
 DATABASES = {"default": env.db("DATABASE_URL")}
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# https://docs.djangoproject.com/en/dev/ref/settings/#conn-health-checks
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+# A psycopg connection pool per process, see wm_test/utils/postgresql_pool.
+if env.bool("DJANGO_DB_POOL", default=False):
+    DATABASES["default"]["ENGINE"] = "wm_test.utils.postgresql_pool"
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": env.int("DJANGO_DB_POOL_MIN_SIZE", default=1),
+        "max_size": env.int("DJANGO_DB_POOL_MAX_SIZE", default=4),
+        # Seconds a request waits for a connection before failing.
+        "timeout": env.float("DJANGO_DB_POOL_TIMEOUT", default=10.0),
+        "max_idle": env.float("DJANGO_DB_POOL_MAX_IDLE", default=300.0),
+    }
+else:
+    # https://docs.djangoproject.com/en/dev/ref/settings/#conn-max-age
+    DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=0)
+# Reads of views wrapped in wm_test.utils.db.read_only_requests go to the
+# replicas in DATABASE_REPLICA_URLS, a comma separated list. The lag checks
+# connect from the request path, an unreachable replica must fail fast.
+REPLICA_CONNECT_TIMEOUT = env.int("DJANGO_REPLICA_CONNECT_TIMEOUT", default=2)
+for number, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[]), start=1):
+    replica = env.db_url_config(url)
+    replica_options = {
+        **DATABASES["default"].get("OPTIONS", {}),
+        **replica.get("OPTIONS", {}),
+        "connect_timeout": REPLICA_CONNECT_TIMEOUT,
+    }
+    if isinstance(replica_options.get("pool"), dict):
+        # Waiting on the pool of an unreachable replica would take as long.
+        replica_options["pool"] = {
+            **replica_options["pool"],
+            "timeout": REPLICA_CONNECT_TIMEOUT,
+        }
+    DATABASES[f"replica_{number}"] = {
+        **DATABASES["default"],
+        **replica,
+        "ENGINE": DATABASES["default"]["ENGINE"],
+        "OPTIONS": replica_options,
+        "ATOMIC_REQUESTS": False,
+        "TEST": {"MIRROR": "default"},
+    }
+# https://docs.djangoproject.com/en/dev/ref/settings/#database-routers
+DATABASE_ROUTERS = ["wm_test.utils.db.ReplicaRouter"]
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# REDIS
+# ------------------------------------------------------------------------------
+# Shared by the production cache and the cat_expo rating buffer.
+REDIS_URL = env("REDIS_URL", default="redis://redis:6379/0")
+
 # URLS
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#root-urlconf
@@ -88,6 +135,7 @@ LOCAL_APPS = [
     "wm_test.users",
     # Your stuff: custom apps go here
     "wm_test.cat_expo",
+    "wm_test.outbox",
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -101,8 +149,10 @@ MIGRATION_MODULES = {"sites": "wm_test.contrib.sites.migrations"}
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#authentication-backends
 AUTHENTICATION_BACKENDS = [
-    "django.contrib.auth.backends.ModelBackend",
-    "allauth.account.auth_backends.AuthenticationBackend",
+    # Django's and allauth's email logins in one pass. Sessions logged in
+    # through the backends it replaced are moved over by
+    # wm_test.utils.sessions, the production session engine.
+    "wm_test.users.backends.EmailBackend",
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#auth-user-model
 AUTH_USER_MODEL = "users.User"
@@ -116,7 +166,8 @@ LOGIN_URL = "account_login"
 # https://docs.djangoproject.com/en/dev/ref/settings/#password-hashers
 PASSWORD_HASHERS = [
     # https://docs.djangoproject.com/en/dev/topics/auth/passwords/#using-argon2-with-django
-    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    # With the ARGON2_* cost below.
+    "wm_test.users.hashers.Argon2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
     "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
@@ -135,10 +186,17 @@ AUTH_PASSWORD_VALIDATORS = [
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    # First, so the timings cover every other middleware.
+    "wm_test.utils.metrics.MetricsMiddleware",
+    # Removes itself unless PROFILER_ENABLED is set.
+    "wm_test.utils.profiler.SamplingProfilerMiddleware",
+    # Removes itself without replicas, must come before the session saves.
+    "wm_test.utils.db.ReplicaPinningMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    # Django's, minus saving unchanged sessions of the production engine.
+    "wm_test.utils.sessions.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -290,7 +348,8 @@ SOCIALACCOUNT_FORMS = {"signup": "wm_test.users.forms.UserSocialSignupForm"}
 # django-rest-framework - https://www.django-rest-framework.org/api-guide/settings/
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # simplejwt's JWTAuthentication, minus the per-request user query.
+        "wm_test.users.authentication.LazyJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
@@ -315,4 +374,64 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    # Blacklists in Redis, see wm_test.users.tokens.
+    "TOKEN_REFRESH_SERIALIZER": "wm_test.users.api.serializers.TokenRefreshSerializer",
 }
+# Per-process Bloom filter in front of the refresh-token blacklist.
+JWT_BLACKLIST_BLOOM_CAPACITY = env.int(
+    "DJANGO_JWT_BLACKLIST_BLOOM_CAPACITY",
+    default=100_000,
+)
+JWT_BLACKLIST_BLOOM_ERROR_RATE = 0.001
+# Seconds a token blacklisted by another process may pass a check outside of
+# rotation, which always asks Redis.
+JWT_BLACKLIST_SYNC_INTERVAL = 1.0
+# Bearer token Prometheus sends to /metrics/, staff users may read it without.
+METRICS_TOKEN = env("DJANGO_METRICS_TOKEN", default="")
+
+# Sampling profiler, see wm_test.utils.profiler.
+PROFILER_ENABLED = env.bool("DJANGO_PROFILER_ENABLED", default=False)
+# Fraction of requests profiled without a token.
+PROFILER_SAMPLE_RATE = env.float("DJANGO_PROFILER_SAMPLE_RATE", default=0.0)
+PROFILER_DIR = env("DJANGO_PROFILER_DIR", default=str(APPS_DIR / "profiles"))
+PROFILER_INTERVAL = 0.005
+PROFILER_MAX_SAMPLES = 6000
+PROFILER_MAX_FILES = 200
+PROFILER_MAX_BYTES = 50 * 1024 * 1024
+PROFILER_TOKEN_MAX_AGE = 60 * 60
+
+# Read replicas, see wm_test.utils.db.
+# Seconds a client reads from the primary after writing.
+REPLICA_PIN_SECONDS = env.int("DJANGO_REPLICA_PIN_SECONDS", default=5)
+# Replicas further behind than this many seconds are skipped.
+REPLICA_MAX_LAG = env.float("DJANGO_REPLICA_MAX_LAG", default=2.0)
+REPLICA_LAG_CHECK_INTERVAL = 5.0
+
+# Seconds the home and about pages are cached for anonymous visitors, see
+# wm_test.utils.page_cache. 0 turns the page cache off.
+PAGE_CACHE_TIMEOUT = env.int("DJANGO_PAGE_CACHE_TIMEOUT", default=600)
+
+# Cat photo variants, see wm_test.cat_expo.images. With an internal nginx
+# location as prefix, responses hand the file to nginx with X-Accel-Redirect.
+MEDIA_ACCEL_REDIRECT_PREFIX = env("DJANGO_MEDIA_ACCEL_REDIRECT_PREFIX", default="")
+
+# Argon2 password hashing cost, see wm_test.users.hashers. Pick it with
+# ``manage.py calibrate_argon2``, older hashes are upgraded on login.
+ARGON2_TIME_COST = env.int("DJANGO_ARGON2_TIME_COST", default=2)
+# KiB.
+ARGON2_MEMORY_COST = env.int("DJANGO_ARGON2_MEMORY_COST", default=102400)
+ARGON2_PARALLELISM = env.int("DJANGO_ARGON2_PARALLELISM", default=8)
+
+# Paginators of wm_test.utils.paginator show the estimated row count of
+# unfiltered tables larger than this, instead of running COUNT(*).
+PAGINATOR_ESTIMATE_THRESHOLD = 100_000
+
+# Emails queued by wm_test.outbox.backends.OutboxEmailBackend are sent by
+# ``manage.py send_outbox`` through this backend.
+OUTBOX_EMAIL_BACKEND = env(
+    "DJANGO_OUTBOX_EMAIL_BACKEND",
+    default="django.core.mail.backends.smtp.EmailBackend",
+)
+OUTBOX_MAX_ATTEMPTS = 8
+# Seconds before the first retry of a failed email, doubled for each next one.
+OUTBOX_RETRY_DELAY = 30
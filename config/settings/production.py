@@ -2,7 +2,9 @@
 from .base import *  # noqa: F403
 from .base import DATABASES
 from .base import INSTALLED_APPS
+from .base import REDIS_URL
 from .base import SPECTACULAR_SETTINGS
+from .base import TEMPLATES
 from .base import env
 
 # GENERAL
@@ -14,14 +16,17 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["example.com"])
 
 # DATABASES
 # ------------------------------------------------------------------------------
-DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+if "pool" not in DATABASES["default"].get("OPTIONS", {}):
+    # Pooled connections go back to the pool after every request instead.
+    for database in DATABASES.values():
+        database["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
 
 # CACHES
 # ------------------------------------------------------------------------------
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
-        "LOCATION": env("REDIS_URL"),
+        "BACKEND": "wm_test.utils.cache.RedisCache",
+        "LOCATION": REDIS_URL,
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
             # Mimicing memcache behavior.
@@ -30,6 +35,9 @@ CACHES = {
         },
     },
 }
+# https://docs.djangoproject.com/en/dev/ref/settings/#session-engine
+# Sessions read from Redis, the database only serves cache misses.
+SESSION_ENGINE = "wm_test.utils.sessions"
 
 # SECURITY
 # ------------------------------------------------------------------------------
@@ -69,9 +77,12 @@ STORAGES = {
         "BACKEND": "django.core.files.storage.FileSystemStorage",
     },
     "staticfiles": {
-        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+        "BACKEND": "wm_test.utils.storage.ParallelCompressedManifestStaticFilesStorage",
     },
 }
+# collectstatic runs in the image build, only the hashed names are served.
+# https://whitenoise.readthedocs.io/en/latest/django.html#WHITENOISE_KEEP_ONLY_HASHED_FILES
+WHITENOISE_KEEP_ONLY_HASHED_FILES = True
 
 # EMAIL
 # ------------------------------------------------------------------------------
@@ -101,7 +112,9 @@ INSTALLED_APPS += ["anymail"]
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
 # https://anymail.readthedocs.io/en/stable/installation/#anymail-settings-reference
 # https://anymail.readthedocs.io/en/stable/esps
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+# Queued in the request's transaction, ``manage.py send_outbox`` sends them.
+EMAIL_BACKEND = "wm_test.outbox.backends.OutboxEmailBackend"
+OUTBOX_EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 ANYMAIL = {}
 
 
@@ -113,6 +126,9 @@ ANYMAIL = {}
 # A sample logging configuration. The only tangible logging
 # performed by this configuration is to send an email to
 # the site admins on every HTTP 500 error when DEBUG=False.
+# The mails are sent from a background thread, one per error fingerprint and
+# window, with a digest of the repeats. They go straight over SMTP, an error
+# report must not depend on the database the outbox lives in.
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -126,7 +142,9 @@ LOGGING = {
         "mail_admins": {
             "level": "ERROR",
             "filters": ["require_debug_false"],
-            "class": "django.utils.log.AdminEmailHandler",
+            "()": "wm_test.utils.error_reports.ErrorReportHandler",
+            "window": env.float("DJANGO_ERROR_REPORT_WINDOW", default=300.0),
+            "email_backend": "django.core.mail.backends.smtp.EmailBackend",
         },
         "console": {
             "level": "DEBUG",
@@ -155,5 +173,26 @@ LOGGING = {
 SPECTACULAR_SETTINGS["SERVERS"] = [
     {"url": "https://example.com", "description": "Production server"},
 ]
+# TEMPLATES
+# ------------------------------------------------------------------------------
+# https://docs.djangoproject.com/en/dev/ref/templates/api/#django.template.loaders.cached.Loader
+# Django caches compiled templates by default since 4.1, spell it out so the
+# production image keeps doing so whatever the DEBUG setting.
+TEMPLATES[0]["APP_DIRS"] = False
+TEMPLATES[0]["OPTIONS"]["loaders"] = [  # type: ignore[index]
+    (
+        "django.template.loaders.cached.Loader",
+        [
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ],
+    ),
+]
+
 # Your stuff...
 # ------------------------------------------------------------------------------
+# nginx serves the cat photo variants, see compose/production/nginx/default.conf.
+MEDIA_ACCEL_REDIRECT_PREFIX = env(
+    "DJANGO_MEDIA_ACCEL_REDIRECT_PREFIX",
+    default="/internal-media/",
+)
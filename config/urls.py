@@ -10,11 +10,28 @@ from drf_spectacular.views import SpectacularAPIView
 from drf_spectacular.views import SpectacularSwaggerView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from wm_test.cat_expo.views import photo_variant_view
+from wm_test.utils.db import read_only_requests
+from wm_test.utils.page_cache import cache_anonymous_page
+from wm_test.utils.views import metrics_view
+
 urlpatterns = [
-    path("", TemplateView.as_view(template_name="pages/home.html"), name="home"),
+    path(
+        "",
+        read_only_requests(
+            cache_anonymous_page(
+                TemplateView.as_view(template_name="pages/home.html"),
+            ),
+        ),
+        name="home",
+    ),
     path(
         "about/",
-        TemplateView.as_view(template_name="pages/about.html"),
+        read_only_requests(
+            cache_anonymous_page(
+                TemplateView.as_view(template_name="pages/about.html"),
+            ),
+        ),
         name="about",
     ),
     # Django Admin, use {% url 'admin:index' %}
@@ -23,7 +40,14 @@ urlpatterns = [
     path("users/", include("wm_test.users.urls", namespace="users")),
     path("accounts/", include("allauth.urls")),
     # Your stuff: custom urls includes go here
-    # ...
+    path("metrics/", metrics_view, name="metrics"),
+    # Below MEDIA_URL: nginx serves the variants that exist, see
+    # wm_test.cat_expo.images.
+    path(
+        "media/variants/<str:variant>/<path:name>",
+        read_only_requests(photo_variant_view),
+        name="cat-photo-variant",
+    ),
     # Media files
     *static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT),
 ]
@@ -1 +1,37 @@
-# Register your models here.
+from django.contrib import admin
+
+from .models import Breed
+from .models import Cat
+from .models import Rating
+
+
+@admin.register(Breed)
+class BreedAdmin(admin.ModelAdmin):
+    list_display = ["name"]
+    search_fields = ["name"]
+
+
+@admin.register(Cat)
+class CatAdmin(admin.ModelAdmin):
+    list_display = ["name", "breed", "owner", "rating_count", "rating_average"]
+    list_filter = ["breed"]
+    list_select_related = ["breed", "owner"]
+    search_fields = ["name"]
+    raw_id_fields = ["owner"]
+    readonly_fields = ["rating_count", "rating_sum", "rating_average"]
+
+
+@admin.register(Rating)
+class RatingAdmin(admin.ModelAdmin):
+    list_display = ["cat", "user", "score", "updated"]
+    list_select_related = ["cat", "user"]
+    raw_id_fields = ["cat", "user"]
+    # Scores must go through Rating.objects.rate to keep the cat aggregates
+    # in step, so the admin only shows them.
+    readonly_fields = ["cat", "user", "score"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,7 @@
+from wm_test.users.api.pagination import KeysetCursorPagination
+
+
+class CatCursorPagination(KeysetCursorPagination):
+    """Newest cats first, served from the primary key index."""
+
+    ordering = ("-id",)
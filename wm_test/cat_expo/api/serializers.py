@@ -0,0 +1,88 @@
+from rest_framework import serializers
+
+from wm_test.cat_expo.images import VARIANTS
+from wm_test.cat_expo.images import variant_url
+from wm_test.cat_expo.models import MAX_SCORE
+from wm_test.cat_expo.models import MIN_SCORE
+from wm_test.cat_expo.models import Breed
+from wm_test.cat_expo.models import Cat
+from wm_test.utils.serializers import PlannedModelSerializer
+
+
+class BreedSerializer(PlannedModelSerializer):
+    class Meta:
+        model = Breed
+        fields = ["id", "name"]
+
+
+class PhotoVariantsField(serializers.Field):
+    """The URL of every size variant of a photo, ``null`` without a photo."""
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        request = self.context.get("request")
+        urls = {variant: variant_url(value.name, variant) for variant in VARIANTS}
+        if request is not None:
+            urls = {
+                variant: request.build_absolute_uri(url)
+                for variant, url in urls.items()
+            }
+        return urls
+
+
+class CatSerializer(PlannedModelSerializer):
+    breed = BreedSerializer()
+    owner_name = serializers.CharField(source="owner.name")
+    photos = PhotoVariantsField(source="photo")
+
+    class Meta:
+        model = Cat
+        fields = [
+            "id",
+            "url",
+            "name",
+            "breed",
+            "owner_name",
+            "color",
+            "birth_date",
+            "photos",
+            "rating_count",
+            "rating_average",
+        ]
+        extra_kwargs = {
+            "url": {"view_name": "api:cat-detail", "lookup_field": "pk"},
+        }
+
+
+class RatingSerializer(serializers.Serializer):
+    """
+    A vote as accepted by the buffered rating endpoint.
+
+    ``cat`` is a plain integer rather than a related field so that accepting
+    a vote needs no database query. Votes for unknown cats are dropped when
+    the buffer is flushed.
+    """
+
+    cat = serializers.IntegerField(min_value=1)
+    score = serializers.IntegerField(min_value=MIN_SCORE, max_value=MAX_SCORE)
+
+
+class LeaderboardQuerySerializer(serializers.Serializer):
+    breed = serializers.IntegerField(min_value=1, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+class LeaderboardEntrySerializer(serializers.Serializer):
+    """A leaderboard row, serialized from the cached entry, not a ``Cat``."""
+
+    rank = serializers.IntegerField()
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    breed = serializers.CharField()
+    rating_count = serializers.IntegerField()
+    rating_average = serializers.FloatField()
@@ -0,0 +1,100 @@
+from django.db import transaction
+from rest_framework import status
+from rest_framework.mixins import ListModelMixin
+from rest_framework.mixins import RetrieveModelMixin
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from wm_test.cat_expo import leaderboard
+from wm_test.cat_expo.buffer import buffer_rating
+from wm_test.cat_expo.models import Cat
+from wm_test.utils.db import read_only_requests
+from wm_test.utils.serializers import PlannedQuerysetMixin
+
+from .pagination import CatCursorPagination
+from .serializers import CatSerializer
+from .serializers import LeaderboardEntrySerializer
+from .serializers import LeaderboardQuerySerializer
+from .serializers import RatingSerializer
+
+
+class CatViewSet(
+    PlannedQuerysetMixin,
+    RetrieveModelMixin,
+    ListModelMixin,
+    GenericViewSet,
+):
+    """Exhibited cats, optionally filtered with ``?breed=<id>``."""
+
+    serializer_class = CatSerializer
+    queryset = Cat.objects.all()
+    lookup_field = "pk"
+    pagination_class = CatCursorPagination
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        return read_only_requests(super().as_view(actions, **initkwargs))
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        breed = self.request.query_params.get("breed")
+        if breed is not None and self.action == "list":
+            queryset = (
+                queryset.filter(breed_id=breed) if breed.isdigit() else queryset.none()
+            )
+        return queryset
+
+
+class RatingViewSet(GenericViewSet):
+    """
+    Accept votes into the Redis rating buffer.
+
+    Votes are applied by the ``flush_ratings`` worker, so the response is
+    ``202 Accepted``. Voting again for the same cat before a flush replaces
+    the pending vote.
+    """
+
+    serializer_class = RatingSerializer
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        # Accepting a vote never touches the database, don't open a
+        # transaction for it under ATOMIC_REQUESTS.
+        return transaction.non_atomic_requests(super().as_view(actions, **initkwargs))
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        buffer_rating(
+            request.user.pk,
+            serializer.validated_data["cat"],
+            serializer.validated_data["score"],
+        )
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+
+class LeaderboardViewSet(GenericViewSet):
+    """
+    Top rated cats, overall or for one breed with ``?breed=<id>``.
+
+    Rows come from the Redis leaderboard, a request reads no database rows
+    unless the leaderboard has to be rebuilt.
+    """
+
+    serializer_class = LeaderboardEntrySerializer
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        # A rebuild reads the ratings from the replica, when there is one.
+        return read_only_requests(super().as_view(actions, **initkwargs))
+
+    def list(self, request, *args, **kwargs):
+        query = LeaderboardQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        entries = leaderboard.top(
+            query.validated_data["limit"],
+            breed_id=query.validated_data.get("breed"),
+        )
+        for rank, entry in enumerate(entries, start=1):
+            entry["rank"] = rank
+        return Response(self.get_serializer(entries, many=True).data)
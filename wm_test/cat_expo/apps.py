@@ -1,6 +1,14 @@
+import contextlib
+
 from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
 
 
 class CatExpoConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "cat_expo"
+    name = "wm_test.cat_expo"
+    verbose_name = _("Cat expo")
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import wm_test.cat_expo.leaderboard  # noqa: F401
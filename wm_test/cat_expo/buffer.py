@@ -0,0 +1,88 @@
+"""
+Redis buffer in front of ``Rating.objects.rate_many``.
+
+The rating endpoint only writes ``"<user_id>:<cat_id>" -> score`` into a
+Redis hash, so a repeated vote overwrites the earlier one instead of
+queueing a second write. ``flush_ratings`` moves the hash aside with
+``RENAMENX`` and applies it to Postgres in batched upserts. If a flush dies
+half way, the next one picks the same hash up again, which is safe because
+applying a vote twice does not change anything. A batch the database
+rejects is retried once, then its votes are moved to ``FAILED_KEY`` so they
+cannot block the votes after them.
+"""
+
+import logging
+from typing import cast
+
+import redis
+from django.db import DataError
+from django.db import IntegrityError
+
+from wm_test.utils.redis_client import get_redis
+
+from .models import Rating
+
+PENDING_KEY = "cat_expo:ratings:pending"
+PROCESSING_KEY = "cat_expo:ratings:processing"
+FAILED_KEY = "cat_expo:ratings:failed"
+
+logger = logging.getLogger(__name__)
+
+
+def buffer_rating(
+    user_id: int,
+    cat_id: int,
+    score: int,
+    client: redis.Redis | None = None,
+) -> None:
+    client = client or get_redis()
+    client.hset(PENDING_KEY, f"{user_id}:{cat_id}", str(score))
+
+
+def pending_ratings(client: redis.Redis | None = None) -> int:
+    client = client or get_redis()
+    # The sync client's stubs also allow the asyncio client's awaitables.
+    return cast(int, client.hlen(PENDING_KEY)) + cast(int, client.hlen(PROCESSING_KEY))
+
+
+def flush_ratings(batch_size: int = 1000, client: redis.Redis | None = None) -> int:
+    """Write buffered votes to the database, return how many changed."""
+    client = client or get_redis()
+    try:
+        # False means an earlier flush did not finish, retry its votes
+        # first and leave the newer ones for the next call.
+        client.renamenx(PENDING_KEY, PROCESSING_KEY)
+    except redis.ResponseError:
+        # Nothing pending.
+        if not client.exists(PROCESSING_KEY):
+            return 0
+
+    written = 0
+    batch = []
+    for field, score in client.hscan_iter(PROCESSING_KEY, count=batch_size):
+        user_id, cat_id = field.split(b":")
+        batch.append((int(user_id), int(cat_id), int(score)))
+        if len(batch) >= batch_size:
+            written += _apply(batch, client)
+            batch = []
+    written += _apply(batch, client)
+    client.delete(PROCESSING_KEY)
+    return written
+
+
+def _apply(batch: list[tuple[int, int, int]], client: redis.Redis) -> int:
+    try:
+        return Rating.objects.rate_many(batch)
+    except (IntegrityError, DataError):
+        # Typically a voter deleted between rate_many's check and its
+        # commit, the retry no longer sees them.
+        logger.warning("Retrying %d votes.", len(batch), exc_info=True)
+    try:
+        return Rating.objects.rate_many(batch)
+    except (IntegrityError, DataError):
+        logger.exception("Moving %d votes to %s.", len(batch), FAILED_KEY)
+        client.hset(
+            FAILED_KEY,
+            mapping={f"{user}:{cat}": score for user, cat, score in batch},
+        )
+        return 0
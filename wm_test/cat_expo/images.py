@@ -0,0 +1,87 @@
+"""
+Size variants of cat photos.
+
+A variant is generated on its first request and stored next to the uploads
+as ``variants/<variant>/<photo name>`` under ``MEDIA_ROOT``, at the same path
+below ``MEDIA_URL`` that it is requested from. nginx serves the files that
+exist and passes the other requests to ``photo_variant_view``, which writes
+the variant and hands it back to nginx with ``X-Accel-Redirect`` when
+``MEDIA_ACCEL_REDIRECT_PREFIX`` is set, so Django never streams the bytes.
+Photo uploads never overwrite an existing name, so a stored variant never
+goes stale.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.urls import reverse
+from PIL import Image
+from PIL import ImageOps
+
+VARIANTS_DIR = "variants"
+# Name -> bounding box, images keep their aspect ratio and are never enlarged.
+VARIANTS = {
+    "thumbnail": (160, 160),
+    "card": (480, 480),
+    "full": (1600, 1600),
+}
+JPEG_QUALITY = 85
+
+
+def variant_name(name: str, variant: str) -> str:
+    return f"{VARIANTS_DIR}/{variant}/{name}"
+
+
+def variant_url(name: str, variant: str) -> str:
+    return reverse("cat-photo-variant", kwargs={"variant": variant, "name": name})
+
+
+def file_mode() -> int:
+    """The mode ``FileSystemStorage`` gives uploads, for files nginx reads."""
+    if settings.FILE_UPLOAD_PERMISSIONS is not None:
+        return settings.FILE_UPLOAD_PERMISSIONS
+    # What open() would create. The umask can only be read by setting it.
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def generate_variant(source: str, target: str, size: tuple[int, int]) -> None:
+    """
+    Write ``source`` scaled down to fit ``size`` to ``target``.
+
+    The file appears atomically, concurrent first requests for the same
+    variant each write their own copy and the last one wins.
+    """
+    with Image.open(source) as image:
+        image_format = image.format
+        # JPEG can decode at 1/2, 1/4 or 1/8 of the size, much faster than
+        # decoding everything to throw most of it away.
+        image.draft("RGB", size)
+        # Applies the EXIF orientation, the written file carries no EXIF.
+        variant = ImageOps.exif_transpose(image)
+        assert variant is not None  # Only None when transposed in place.
+        variant.thumbnail(size, Image.Resampling.LANCZOS)
+        options = {}
+        if image_format == "JPEG":
+            variant = variant.convert("RGB")
+            options = {"quality": JPEG_QUALITY, "optimize": True, "progressive": True}
+
+        target_path = Path(target)
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(
+            dir=target_path.parent,
+            prefix=".",
+            suffix=target_path.suffix,
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as output:
+                variant.save(output, format=image_format, **options)
+            # mkstemp creates the file 0600, unreadable to nginx.
+            Path(temporary).chmod(file_mode())
+            Path(temporary).replace(target_path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
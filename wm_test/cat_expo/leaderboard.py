@@ -0,0 +1,226 @@
+"""
+Cat leaderboards kept in Redis sorted sets.
+
+``ALL_KEY`` and one ``BREED_KEY`` per breed map cat ids to their average
+rating. ``CATS_KEY`` is a hash of the fields a leaderboard row shows, so a
+page is one ``ZREVRANGE`` plus one ``HMGET`` and never reaches Postgres.
+
+The sets follow ``ratings_changed`` and cat saves/deletes incrementally.
+``rebuild()`` recreates them from the database. It runs from the
+``rebuild_leaderboard`` command, or on the first read after Redis lost the
+data. Cats updated while a rebuild runs would be overwritten by its older
+snapshot, so each running rebuild collects their ids and updates them again
+once its sets are live.
+"""
+
+import json
+import logging
+import time
+import uuid
+from collections.abc import Iterable
+from functools import partial
+from typing import cast
+
+import redis
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from wm_test.utils.redis_client import get_redis
+
+from .models import Cat
+from .signals import ratings_changed
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "cat_expo:leaderboard"
+ALL_KEY = f"{PREFIX}:all"
+BREED_KEY = f"{PREFIX}:breed:{{breed_id}}"
+CATS_KEY = f"{PREFIX}:cats"
+# Set by a finished rebuild, its absence means the sets cannot be trusted.
+BUILT_KEY = f"{PREFIX}:built"
+REBUILD_LOCK_KEY = f"{PREFIX}:rebuild-lock"
+REBUILD_LOCK_TIMEOUT = 60
+# Running rebuilds: the key of the set collecting the cats updated meanwhile
+# -> start time. Entries older than REBUILD_TIMEOUT are of dead rebuilds.
+REBUILDS_KEY = f"{PREFIX}:rebuilds"
+REBUILD_TIMEOUT = 60 * 60
+LIVE_KEYS = {"all": ALL_KEY, "breed": BREED_KEY, "cats": CATS_KEY}
+
+CAT_FIELDS = ("id", "name", "breed_id", "breed__name", "rating_count", "rating_average")
+
+
+def _entry(row: dict) -> str:
+    return json.dumps(
+        {
+            "id": row["id"],
+            "name": row["name"],
+            "breed_id": row["breed_id"],
+            "breed": row["breed__name"],
+            "rating_count": row["rating_count"],
+            "rating_average": row["rating_average"],
+        },
+    )
+
+
+def _write(pipe, rows: Iterable[dict], keys: dict[str, str]) -> None:
+    for row in rows:
+        breed_key = keys["breed"].format(breed_id=row["breed_id"])
+        pipe.zadd(keys["all"], {row["id"]: row["rating_average"]})
+        pipe.zadd(breed_key, {row["id"]: row["rating_average"]})
+        pipe.hset(keys["cats"], row["id"], _entry(row))
+
+
+def update_cats(cat_ids: Iterable[int], client: redis.Redis | None = None) -> None:
+    """Refresh the given cats' scores and rows, dropping deleted cats."""
+    client = client or get_redis()
+    cat_ids = list(cat_ids)
+    if not cat_ids:
+        return
+    with client.pipeline(transaction=False) as pipe:
+        pipe.zrangebyscore(REBUILDS_KEY, time.time() - REBUILD_TIMEOUT, "+inf")
+        pipe.exists(BUILT_KEY)
+        rebuilds, built = pipe.execute()
+    if rebuilds:
+        with client.pipeline(transaction=False) as pipe:
+            for changed_key in rebuilds:
+                pipe.sadd(changed_key, *cat_ids)
+                pipe.expire(changed_key, REBUILD_TIMEOUT)
+            pipe.execute()
+    if not built:
+        # The next read rebuilds everything anyway.
+        return
+
+    rows = {
+        row["id"]: row for row in Cat.objects.filter(pk__in=cat_ids).values(*CAT_FIELDS)
+    }
+    previous = cast(list[bytes | None], client.hmget(CATS_KEY, cat_ids))
+    with client.pipeline() as pipe:
+        for cat_id, stored in zip(cat_ids, previous, strict=True):
+            old_breed = json.loads(stored)["breed_id"] if stored else None
+            row = rows.get(cat_id)
+            if old_breed is not None and (row is None or row["breed_id"] != old_breed):
+                pipe.zrem(BREED_KEY.format(breed_id=old_breed), cat_id)
+            if row is None:
+                pipe.zrem(ALL_KEY, cat_id)
+                pipe.hdel(CATS_KEY, str(cat_id))
+        _write(
+            pipe, rows.values(), {"all": ALL_KEY, "breed": BREED_KEY, "cats": CATS_KEY}
+        )
+        pipe.execute()
+
+
+def rebuild(batch_size: int = 5000, client: redis.Redis | None = None) -> int:
+    """
+    Recreate every leaderboard from the database, return the cat count.
+
+    The new sets are built under temporary keys and renamed over the live
+    ones in one transaction, so readers never see a half built board.
+    """
+    client = client or get_redis()
+    staging = f"{PREFIX}:staging:{uuid.uuid4().hex}"
+    keys = {
+        "all": f"{staging}:all",
+        "breed": f"{staging}:breed:{{breed_id}}",
+        "cats": f"{staging}:cats",
+    }
+    changed_key = f"{staging}:changed"
+    # Registered before the snapshot is taken: a cat updated after it is
+    # in the snapshot or in changed_key.
+    with client.pipeline() as pipe:
+        pipe.zremrangebyscore(REBUILDS_KEY, "-inf", time.time() - REBUILD_TIMEOUT)
+        pipe.zadd(REBUILDS_KEY, {changed_key: time.time()})
+        pipe.execute()
+    try:
+        count = _build(client, keys, batch_size)
+    finally:
+        with client.pipeline() as pipe:
+            pipe.zrem(REBUILDS_KEY, changed_key)
+            pipe.smembers(changed_key)
+            pipe.delete(changed_key)
+            _, changed, _ = pipe.execute()
+    # An update that registered its cats here after the pipeline above finds
+    # BUILT_KEY set, and writes the live sets itself.
+    update_cats((int(cat_id) for cat_id in changed), client=client)
+    return count
+
+
+def _build(client: redis.Redis, keys: dict[str, str], batch_size: int) -> int:
+    breed_ids = set()
+    count = 0
+    queryset = Cat.objects.values(*CAT_FIELDS).order_by("pk")
+    with client.pipeline(transaction=False) as pipe:
+        for row in queryset.iterator(chunk_size=batch_size):
+            breed_ids.add(row["breed_id"])
+            _write(pipe, [row], keys)
+            count += 1
+            if count % batch_size == 0:
+                pipe.execute()
+        pipe.execute()
+
+    stale = set(client.scan_iter(BREED_KEY.format(breed_id="*")))
+    with client.pipeline() as pipe:
+        pipe.delete(ALL_KEY, CATS_KEY, *stale)
+        if count:
+            pipe.rename(keys["all"], ALL_KEY)
+            pipe.rename(keys["cats"], CATS_KEY)
+        for breed_id in breed_ids:
+            pipe.rename(
+                keys["breed"].format(breed_id=breed_id),
+                BREED_KEY.format(breed_id=breed_id),
+            )
+        pipe.set(BUILT_KEY, 1)
+        pipe.execute()
+    return count
+
+
+def top(
+    limit: int,
+    breed_id: int | None = None,
+    client: redis.Redis | None = None,
+) -> list[dict]:
+    """
+    Return the best ``limit`` cats, overall or for one breed.
+
+    Cats with equal averages are ordered by the sorted set, which puts the
+    higher id first.
+    """
+    client = client or get_redis()
+    if not client.exists(BUILT_KEY) and client.set(
+        REBUILD_LOCK_KEY,
+        1,
+        nx=True,
+        ex=REBUILD_LOCK_TIMEOUT,
+    ):
+        try:
+            rebuild(client=client)
+        finally:
+            client.delete(REBUILD_LOCK_KEY)
+
+    key = ALL_KEY if breed_id is None else BREED_KEY.format(breed_id=breed_id)
+    cat_ids = cast(list[bytes], client.zrevrange(key, 0, limit - 1))
+    if not cat_ids:
+        return []
+    entries = cast(list[bytes | None], client.hmget(CATS_KEY, cat_ids))
+    return [json.loads(entry) for entry in entries if entry]
+
+
+def _update_quietly(cat_ids: Iterable[int]) -> None:
+    # A stale leaderboard must not fail the write that made it stale, it
+    # is corrected by the next rebuild.
+    try:
+        update_cats(cat_ids)
+    except redis.RedisError:
+        logger.exception("Could not update the leaderboard for cats %s", cat_ids)
+
+
+@receiver(ratings_changed)
+def update_rated_cats(sender, cat_ids, **kwargs) -> None:
+    _update_quietly(cat_ids)
+
+
+@receiver(post_save, sender=Cat)
+@receiver(post_delete, sender=Cat)
+def update_saved_cat(sender, instance: Cat, using, **kwargs) -> None:
+    transaction.on_commit(partial(_update_quietly, [instance.pk]), using=using)
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from wm_test.cat_expo.images import VARIANTS
+from wm_test.cat_expo.images import generate_variant
+from wm_test.cat_expo.images import variant_name
+
+
+def photo(path: Path, size: tuple[int, int], seed: int) -> None:
+    """Write a camera-sized JPEG with enough detail to be costly to encode."""
+    noise = Image.effect_noise(size, 48 + seed % 16).convert("RGB")
+    gradient = Image.linear_gradient("L").resize(size).convert("RGB")
+    Image.blend(noise, gradient, 0.5).save(path, quality=92)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate every size variant of synthetic camera-sized JPEG photos, "
+        "one photo after the other and across a process pool, and report "
+        "variants/sec. Nothing is written outside a temporary directory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--photos", type=int, default=24)
+        parser.add_argument("--width", type=int, default=4000)
+        parser.add_argument("--height", type=int, default=3000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            nargs="+",
+            default=sorted({2, os.cpu_count() or 1}),
+            help="Process pool sizes to compare with the serial run.",
+        )
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            names = []
+            for seed in range(options["photos"]):
+                name = f"cats/photo-{seed}.jpg"
+                (root / "cats").mkdir(exist_ok=True)
+                photo(root / name, (options["width"], options["height"]), seed)
+                names.append(name)
+
+            self.stdout.write(
+                f"{options['photos']} photos of "
+                f"{options['width']}x{options['height']}, {os.cpu_count()} CPUs",
+            )
+            self.stdout.write(
+                f"{'configuration':<16} {'variants':>8} {'seconds':>8} "
+                f"{'variants/s':>10}",
+            )
+            self.run("serial", root, names, None)
+            for workers in options["workers"]:
+                self.run(f"pool of {workers}", root, names, workers)
+
+    def run(self, name, root, names, workers):
+        jobs = [
+            (str(root / photo_name), str(root / name / variant_name(photo_name, v)), s)
+            for photo_name in names
+            for v, s in VARIANTS.items()
+        ]
+        started = time.perf_counter()
+        if workers is None:
+            for job in jobs:
+                generate_variant(*job)
+        else:
+            with ProcessPoolExecutor(workers) as executor:
+                list(executor.map(generate_variant, *zip(*jobs, strict=True)))
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{name:<16} {len(jobs):>8} {elapsed:>8.2f} {len(jobs) / elapsed:>10.1f}",
+        )
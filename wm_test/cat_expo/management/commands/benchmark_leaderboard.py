@@ -0,0 +1,153 @@
+import random
+import statistics
+import time
+from collections import Counter
+from contextlib import ExitStack
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.db.models import Avg
+from django.test import override_settings
+
+from wm_test.cat_expo import leaderboard
+from wm_test.cat_expo.models import Breed
+from wm_test.cat_expo.models import Cat
+from wm_test.cat_expo.models import Rating
+from wm_test.users.models import User
+from wm_test.users.tests.factories import UserFactory
+from wm_test.utils.redis_client import get_redis
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed ratings and compare a leaderboard computed with AVG() over the "
+        "ratings table against the denormalized Cat.rating_average column "
+        "and the Redis leaderboard. Uses fakeredis unless --redis-url is "
+        "given. Seeded rows are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ratings", type=int, default=1_000_000)
+        parser.add_argument("--cats", type=int, default=2_000)
+        parser.add_argument("--breeds", type=int, default=40)
+        parser.add_argument("--top", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=20_000)
+        parser.add_argument(
+            "--redis-url",
+            help="Benchmark against a real Redis, its leaderboard is rebuilt "
+            "from the seeded rows.",
+        )
+
+    @override_settings(
+        PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    )
+    def handle(self, *args, **options):
+        self.repeat = options["repeat"]
+        with ExitStack() as stack:
+            if options["redis_url"]:
+                stack.enter_context(override_settings(REDIS_URL=options["redis_url"]))
+            else:
+                import fakeredis
+
+                stack.enter_context(
+                    mock.patch(
+                        "redis.Redis.from_url",
+                        return_value=fakeredis.FakeRedis(),
+                    ),
+                )
+            get_redis.cache_clear()
+            stack.callback(get_redis.cache_clear)
+            stack.enter_context(transaction.atomic())
+
+            breed = self.seed(options)
+            started = time.perf_counter()
+            leaderboard.rebuild(batch_size=options["batch_size"])
+            self.stdout.write(
+                f"Rebuilt the Redis leaderboard in "
+                f"{time.perf_counter() - started:.2f}s",
+            )
+            self.report(breed, options["top"])
+            transaction.set_rollback(True)
+
+    def seed(self, options):
+        started = time.perf_counter()
+        breeds = Breed.objects.bulk_create(
+            Breed(name=f"bench-breed-{index}") for index in range(options["breeds"])
+        )
+        # One voter per cat gives exactly one vote per (user, cat) pair.
+        voters = -(-options["ratings"] // options["cats"])
+        users = User.objects.bulk_create(
+            UserFactory.build(email=f"bench-voter-{index}@example.com")
+            for index in range(max(voters, options["cats"]))
+        )
+        cats = Cat.objects.bulk_create(
+            Cat(name=f"cat-{index}", breed=breeds[index % len(breeds)], owner=user)
+            for index, user in enumerate(users[: options["cats"]])
+        )
+
+        counts: Counter[int] = Counter()
+        sums: Counter[int] = Counter()
+        batch = []
+        for index in range(options["ratings"]):
+            cat = cats[index % len(cats)]
+            score = random.randint(1, 5)  # noqa: S311
+            counts[cat.pk] += 1
+            sums[cat.pk] += score
+            batch.append(
+                Rating(user=users[index // len(cats)], cat=cat, score=score),
+            )
+            if len(batch) == options["batch_size"]:
+                Rating.objects.bulk_create(batch)
+                batch = []
+        Rating.objects.bulk_create(batch)
+
+        for cat in cats:
+            cat.rating_count = counts[cat.pk]
+            cat.rating_sum = sums[cat.pk]
+        Cat.objects.bulk_update(
+            cats,
+            ["rating_count", "rating_sum"],
+            batch_size=options["batch_size"],
+        )
+        with connection.cursor() as cursor:
+            for model in (Cat, Rating):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")  # noqa: SLF001
+        self.stdout.write(
+            f"Seeded {options['ratings']} ratings for {len(cats)} cats "
+            f"in {time.perf_counter() - started:.1f}s",
+        )
+        return breeds[0]
+
+    def report(self, breed, top):
+        queries = {
+            "AVG() over ratings": lambda: list(
+                Rating.objects.values("cat")
+                .annotate(average=Avg("score"))
+                .order_by("-average", "cat")[:top],
+            ),
+            "AVG() over ratings, one breed": lambda: list(
+                Rating.objects.filter(cat__breed=breed)
+                .values("cat")
+                .annotate(average=Avg("score"))
+                .order_by("-average", "cat")[:top],
+            ),
+            "Cat.objects.leaderboard()": lambda: list(
+                Cat.objects.leaderboard()[:top],
+            ),
+            "Cat.objects.leaderboard(breed)": lambda: list(
+                Cat.objects.leaderboard(breed_id=breed.pk)[:top],
+            ),
+            "leaderboard.top()": lambda: leaderboard.top(top),
+            "leaderboard.top(breed)": lambda: leaderboard.top(top, breed_id=breed.pk),
+        }
+        self.stdout.write(f"{'query':<32} {'median ms':>10}")
+        for name, query in queries.items():
+            samples = []
+            for _ in range(self.repeat):
+                started = time.perf_counter()
+                query()
+                samples.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(f"{name:<32} {statistics.median(samples):>10.2f}")
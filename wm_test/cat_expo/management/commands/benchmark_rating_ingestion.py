@@ -0,0 +1,129 @@
+import random
+import statistics
+import time
+from contextlib import ExitStack
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from wm_test.cat_expo.api.views import RatingViewSet
+from wm_test.cat_expo.buffer import flush_ratings
+from wm_test.cat_expo.buffer import pending_ratings
+from wm_test.cat_expo.models import Breed
+from wm_test.cat_expo.models import Cat
+from wm_test.cat_expo.models import Rating
+from wm_test.users.models import User
+from wm_test.users.tests.factories import UserFactory
+from wm_test.utils.redis_client import get_redis
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare synchronous Rating.objects.rate() writes with the buffered "
+        "rating endpoint plus flush_ratings. Uses fakeredis unless "
+        "--redis-url is given. Database rows are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--votes", type=int, default=20_000)
+        parser.add_argument("--users", type=int, default=1_000)
+        parser.add_argument("--cats", type=int, default=200)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--redis-url",
+            help="Benchmark against a real Redis, it must not hold live votes.",
+        )
+
+    @override_settings(
+        ALLOWED_HOSTS=["testserver"],
+        PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    )
+    def handle(self, *args, **options):
+        with ExitStack() as stack:
+            if options["redis_url"]:
+                stack.enter_context(override_settings(REDIS_URL=options["redis_url"]))
+            else:
+                import fakeredis
+
+                stack.enter_context(
+                    mock.patch(
+                        "redis.Redis.from_url",
+                        return_value=fakeredis.FakeRedis(),
+                    ),
+                )
+            get_redis.cache_clear()
+            stack.callback(get_redis.cache_clear)
+            stack.enter_context(transaction.atomic())
+
+            users, cats = self.seed(options["users"], options["cats"])
+            votes = [
+                (
+                    random.choice(users),  # noqa: S311
+                    random.choice(cats),  # noqa: S311
+                    random.randint(1, 5),  # noqa: S311
+                )
+                for _ in range(options["votes"])
+            ]
+            self.synchronous(votes)
+            self.buffered(votes, options["batch_size"])
+            transaction.set_rollback(True)
+
+    def seed(self, user_count, cat_count):
+        users = User.objects.bulk_create(
+            UserFactory.build(email=f"bench-voter-{index}@example.com")
+            for index in range(user_count)
+        )
+        breed = Breed.objects.create(name="bench-breed")
+        cats = Cat.objects.bulk_create(
+            Cat(name=f"cat-{index}", breed=breed, owner=users[index % len(users)])
+            for index in range(cat_count)
+        )
+        return users, cats
+
+    def synchronous(self, votes):
+        samples = []
+        with transaction.atomic():
+            for user, cat, score in votes:
+                started = time.perf_counter()
+                # A savepoint stands in for the per-request transaction.
+                with transaction.atomic():
+                    Rating.objects.rate(user, cat, score)
+                samples.append(time.perf_counter() - started)
+            transaction.set_rollback(True)
+        self.report("Rating.objects.rate()", samples)
+
+    def buffered(self, votes, batch_size):
+        view = RatingViewSet.as_view({"post": "create"})
+        factory = APIRequestFactory()
+        samples = []
+        for user, cat, score in votes:
+            request = factory.post(
+                "/api/ratings/",
+                {"cat": cat.pk, "score": score},
+                format="json",
+            )
+            force_authenticate(request, user=user)
+            started = time.perf_counter()
+            view(request).render()
+            samples.append(time.perf_counter() - started)
+        self.report("POST /api/ratings/", samples)
+
+        pending = pending_ratings()
+        started = time.perf_counter()
+        written = flush_ratings(batch_size=batch_size)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"flush_ratings: {pending} pending votes, {written} written "
+            f"in {elapsed:.2f}s ({written / elapsed:.0f} ratings/sec)",
+        )
+
+    def report(self, name, samples):
+        total = sum(samples)
+        p99 = statistics.quantiles(samples, n=100)[98] * 1000
+        self.stdout.write(
+            f"{name}: {len(samples) / total:.0f} votes/sec, p99 {p99:.2f} ms",
+        )
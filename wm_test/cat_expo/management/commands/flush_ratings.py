@@ -0,0 +1,47 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from wm_test.cat_expo.buffer import flush_ratings
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Apply votes buffered in Redis by the rating endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between flushes.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Flush once and exit instead of running as a worker.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            try:
+                written = flush_ratings(batch_size=options["batch_size"])
+            except Exception:
+                if options["once"]:
+                    raise
+                # The database or Redis is away, the votes stay buffered
+                # for the next flush.
+                logger.exception("Flushing ratings failed.")
+                close_old_connections()
+            else:
+                if written or options["verbosity"] > 1:
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(f"Wrote {written} ratings in {elapsed:.3f}s")
+                if options["once"]:
+                    return
+            time.sleep(options["interval"])
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from wm_test.cat_expo.leaderboard import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recreate the Redis cat leaderboards from the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = rebuild(batch_size=options["batch_size"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"Rebuilt the leaderboard with {count} cats in {elapsed:.3f}s"
+        )
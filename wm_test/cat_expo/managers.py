@@ -0,0 +1,200 @@
+from collections.abc import Iterable
+from functools import partial
+from typing import TYPE_CHECKING
+from typing import cast
+
+from django.db import models
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import Sum
+from django.db.models import Value
+from django.db.models import When
+
+from .signals import ratings_changed
+
+if TYPE_CHECKING:
+    from wm_test.users.models import User
+
+    from .models import Cat
+    from .models import Rating
+
+
+class CatQuerySet(models.QuerySet["Cat"]):
+    def leaderboard(self, breed_id: int | None = None):
+        """
+        Cats ordered by average rating, best first.
+
+        Reads the stored ``rating_average`` column through its index instead
+        of aggregating the ratings table.
+        """
+        queryset = self if breed_id is None else self.filter(breed_id=breed_id)
+        return queryset.order_by("-rating_average", "id")
+
+    def lock(self, pks: Iterable[int]) -> set[int]:
+        """
+        Lock the given cats' rows and return the pks that exist.
+
+        Every rating write holds the cat's row lock until it commits, which
+        keeps ``rating_count``/``rating_sum`` in step with the ratings
+        table. Rows are locked in pk order so writers cannot deadlock.
+        """
+        return set(
+            self.select_for_update()
+            .filter(pk__in=pks)
+            .order_by("pk")
+            .values_list("pk", flat=True),
+        )
+
+
+class RatingManager(models.Manager["Rating"]):
+    def rate(self, user: "User", cat: "Cat", score: int) -> "Rating":
+        """
+        Record ``user``'s vote for ``cat``, replacing any previous vote.
+
+        The cat's ``rating_count``/``rating_sum`` are adjusted with ``F()``
+        expressions in the same transaction, so concurrent votes never lose
+        an update and the aggregates always match the ratings table.
+        """
+        cats = type(cat)._default_manager  # noqa: SLF001
+        with transaction.atomic(using=self.db):
+            cats.lock([cat.pk])
+            rating = self.select_for_update().filter(user=user, cat=cat).first()
+            if rating is None:
+                rating = self.create(user=user, cat=cat, score=score)
+                cats.filter(pk=cat.pk).update(
+                    rating_count=F("rating_count") + 1,
+                    rating_sum=F("rating_sum") + score,
+                )
+            elif rating.score != score:
+                delta = score - rating.score
+                rating.score = score
+                rating.save(update_fields=["score", "updated"])
+                cats.filter(pk=cat.pk).update(rating_sum=F("rating_sum") + delta)
+            else:
+                return rating
+            self._send_ratings_changed({cat.pk})
+        return rating
+
+    def rate_many(self, votes: Iterable[tuple[int, int, int]]) -> int:
+        """
+        Apply ``(user_id, cat_id, score)`` votes with one upsert.
+
+        Later votes for the same pair win. Votes for cats or users that no
+        longer exist are dropped, as are votes that would not change the
+        stored score. Each cat's aggregates move by the net change in a
+        single ``UPDATE``. Returns the number of ratings written.
+        """
+        latest = {(user_id, cat_id): score for user_id, cat_id, score in votes}
+        if not latest:
+            return 0
+
+        cat_model = cast(
+            "type[Cat]",
+            self.model._meta.get_field("cat").related_model,  # noqa: SLF001
+        )
+        user_model = cast(
+            "type[User]",
+            self.model._meta.get_field("user").related_model,  # noqa: SLF001
+        )
+        with transaction.atomic(using=self.db):
+            cat_ids = cat_model._default_manager.lock({cat for _, cat in latest})  # noqa: SLF001
+            user_ids = set(
+                user_model._default_manager.filter(  # noqa: SLF001
+                    pk__in={user for user, _ in latest},
+                ).values_list("pk", flat=True),
+            )
+            latest = {
+                pair: score
+                for pair, score in latest.items()
+                if pair[0] in user_ids and pair[1] in cat_ids
+            }
+            if not latest:
+                return 0
+
+            # Cat rows are locked, so these scores cannot change under us.
+            # Matching both id lists fetches a superset of the voted pairs
+            # but plans far better than an OR per pair.
+            existing = {
+                (user, cat): score
+                for user, cat, score in self.filter(
+                    user_id__in={user for user, _ in latest},
+                    cat_id__in={cat for _, cat in latest},
+                ).values_list("user_id", "cat_id", "score")
+                if (user, cat) in latest
+            }
+            changed = {
+                pair: score
+                for pair, score in latest.items()
+                if existing.get(pair) != score
+            }
+            if not changed:
+                return 0
+
+            self.bulk_create(
+                [
+                    self.model(user_id=user, cat_id=cat, score=score)
+                    for (user, cat), score in changed.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["user", "cat"],
+                update_fields=["score", "updated"],
+            )
+
+            counts: dict[int, int] = {}
+            sums: dict[int, int] = {}
+            for (user, cat), score in changed.items():
+                previous = existing.get((user, cat))
+                counts[cat] = counts.get(cat, 0) + (previous is None)
+                sums[cat] = sums.get(cat, 0) + score - (previous or 0)
+            cat_model._default_manager.filter(pk__in=sums).update(  # noqa: SLF001
+                rating_count=F("rating_count") + _by_pk(counts),
+                rating_sum=F("rating_sum") + _by_pk(sums),
+            )
+            self._send_ratings_changed(set(sums))
+        return len(changed)
+
+    def delete_for_user(self, user_id: int) -> int:
+        """
+        Delete ``user_id``'s votes and take them out of the cats' aggregates.
+
+        Runs before a user is deleted, the cascade would drop the ratings
+        without touching ``rating_count``/``rating_sum``. Returns the number
+        of ratings deleted.
+        """
+        cat_model = cast(
+            "type[Cat]",
+            self.model._meta.get_field("cat").related_model,  # noqa: SLF001
+        )
+        cats = cat_model._default_manager  # noqa: SLF001
+        votes = self.filter(user_id=user_id)
+        with transaction.atomic(using=self.db):
+            cats.lock(list(votes.values_list("cat_id", flat=True)))
+            totals = votes.values("cat_id").annotate(
+                count=Count("pk"), sum=Sum("score")
+            )
+            counts = {row["cat_id"]: row["count"] for row in totals}
+            sums = {row["cat_id"]: row["sum"] for row in totals}
+            if not counts:
+                return 0
+            votes.delete()
+            cats.filter(pk__in=counts).update(
+                rating_count=F("rating_count") - _by_pk(counts),
+                rating_sum=F("rating_sum") - _by_pk(sums),
+            )
+            self._send_ratings_changed(set(counts))
+        return sum(counts.values())
+
+    def _send_ratings_changed(self, cat_ids: set[int]) -> None:
+        transaction.on_commit(
+            partial(ratings_changed.send, sender=self.model, cat_ids=cat_ids),
+            using=self.db,
+        )
+
+
+def _by_pk(values: dict[int, int]) -> Case:
+    return Case(
+        *(When(pk=pk, then=Value(value)) for pk, value in values.items()),
+        default=Value(0),
+    )
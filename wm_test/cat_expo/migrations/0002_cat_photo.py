@@ -0,0 +1,18 @@
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cat_expo", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cat",
+            name="photo",
+            field=models.ImageField(
+                blank=True, upload_to="cats/", verbose_name="Photo"
+            ),
+        ),
+    ]
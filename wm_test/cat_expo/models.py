@@ -1 +1,130 @@
-# Create your models here.
+from django.conf import settings
+from django.core.validators import MaxValueValidator
+from django.core.validators import MinValueValidator
+from django.db import models
+from django.db.models import Case
+from django.db.models import Q
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.functions import Cast
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+
+from .managers import CatQuerySet
+from .managers import RatingManager
+
+MIN_SCORE = 1
+MAX_SCORE = 5
+
+
+class Breed(models.Model):
+    name = models.CharField(_("Name"), max_length=100, unique=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class Cat(models.Model):
+    """
+    An exhibited cat.
+
+    ``rating_count`` and ``rating_sum`` are maintained by
+    ``Rating.objects.rate`` and ``rating_average`` is a stored generated
+    column derived from them, so leaderboards never aggregate ratings.
+    """
+
+    name = models.CharField(_("Name"), max_length=100)
+    # Both foreign keys lead a composite index below, which also serves
+    # plain lookups by breed or owner.
+    breed = models.ForeignKey(
+        Breed,
+        on_delete=models.PROTECT,
+        related_name="cats",
+        db_index=False,
+    )
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="cats",
+        db_index=False,
+    )
+    color = models.CharField(_("Color"), max_length=50, blank=True)
+    birth_date = models.DateField(_("Birth date"), null=True, blank=True)
+    description = models.TextField(_("Description"), blank=True)
+    # Served in sizes from wm_test.cat_expo.images.VARIANTS.
+    photo = models.ImageField(_("Photo"), upload_to="cats/", blank=True)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_average = models.GeneratedField(
+        expression=Case(
+            When(rating_count=0, then=Value(0.0)),
+            default=Cast("rating_sum", models.FloatField())
+            / Cast("rating_count", models.FloatField()),
+        ),
+        output_field=models.FloatField(),
+        db_persist=True,
+    )
+    created = models.DateTimeField(auto_now_add=True)
+
+    objects = CatQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["-rating_average", "id"],
+                name="cat_expo_cat_leaderboard_idx",
+            ),
+            models.Index(
+                fields=["breed", "-rating_average", "id"],
+                name="cat_expo_cat_breed_idx",
+            ),
+            models.Index(fields=["owner", "name"], name="cat_expo_cat_owner_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class Rating(models.Model):
+    """A single user's vote for a cat, one per (user, cat) pair."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="ratings",
+        # Covered by the unique (user, cat) constraint.
+        db_index=False,
+    )
+    cat = models.ForeignKey(Cat, on_delete=models.CASCADE, related_name="ratings")
+    score = models.PositiveSmallIntegerField(
+        _("Score"),
+        validators=[MinValueValidator(MIN_SCORE), MaxValueValidator(MAX_SCORE)],
+    )
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = RatingManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "cat"],
+                name="cat_expo_rating_user_cat_unique",
+            ),
+            models.CheckConstraint(
+                check=Q(score__gte=MIN_SCORE, score__lte=MAX_SCORE),
+                name="cat_expo_rating_score_range",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user} -> {self.cat}: {self.score}"
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def delete_user_ratings(sender, instance, using, **kwargs) -> None:
+    Rating.objects.db_manager(using).delete_for_user(instance.pk)
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent after a transaction that changed ratings commits, with ``cat_ids``:
+# the cats whose rating aggregates moved.
+ratings_changed = Signal()
@@ -0,0 +1,26 @@
+from factory import Faker
+from factory import Sequence
+from factory import SubFactory
+from factory.django import DjangoModelFactory
+
+from wm_test.cat_expo.models import Breed
+from wm_test.cat_expo.models import Cat
+from wm_test.users.tests.factories import UserFactory
+
+
+class BreedFactory(DjangoModelFactory[Breed]):
+    name = Sequence(lambda n: f"Breed {n}")
+
+    class Meta:
+        model = Breed
+        django_get_or_create = ["name"]
+
+
+class CatFactory(DjangoModelFactory[Cat]):
+    name = Faker("first_name")
+    breed = SubFactory(BreedFactory)
+    owner = SubFactory(UserFactory)
+    color = Faker("color_name")
+
+    class Meta:
+        model = Cat
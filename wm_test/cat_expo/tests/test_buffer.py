@@ -0,0 +1,116 @@
+import pytest
+from django.db import IntegrityError
+
+from wm_test.cat_expo.buffer import FAILED_KEY
+from wm_test.cat_expo.buffer import PENDING_KEY
+from wm_test.cat_expo.buffer import PROCESSING_KEY
+from wm_test.cat_expo.buffer import buffer_rating
+from wm_test.cat_expo.buffer import flush_ratings
+from wm_test.cat_expo.buffer import pending_ratings
+from wm_test.cat_expo.models import Cat
+from wm_test.cat_expo.models import Rating
+from wm_test.cat_expo.tests.factories import CatFactory
+from wm_test.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_repeated_vote_is_buffered_once(redis_client, user):
+    cat = CatFactory()
+    buffer_rating(user.pk, cat.pk, 2)
+    buffer_rating(user.pk, cat.pk, 4)
+
+    assert pending_ratings() == 1
+    assert flush_ratings() == 1
+
+    cat.refresh_from_db()
+    assert Rating.objects.get(user=user, cat=cat).score == 4  # noqa: PLR2004
+    assert (cat.rating_count, cat.rating_sum) == (1, 4)
+    assert pending_ratings() == 0
+
+
+def test_flush_in_batches(redis_client, make_users):
+    cats = CatFactory.create_batch(3)
+    users = make_users(5)
+    for user in users:
+        for cat in cats:
+            buffer_rating(user.pk, cat.pk, 5)
+
+    assert flush_ratings(batch_size=4) == len(users) * len(cats)
+    for cat in Cat.objects.all():
+        assert (cat.rating_count, cat.rating_sum) == (5, 25)
+
+
+def test_flush_updates_existing_ratings(redis_client, user):
+    cat = CatFactory()
+    Rating.objects.rate(user, cat, 1)
+    other = UserFactory()
+    buffer_rating(user.pk, cat.pk, 3)
+    buffer_rating(other.pk, cat.pk, 5)
+
+    flush_ratings()
+
+    cat.refresh_from_db()
+    assert (cat.rating_count, cat.rating_sum) == (2, 8)
+
+
+def test_flush_drops_unknown_cats(redis_client, user):
+    buffer_rating(user.pk, 999_999, 5)
+
+    assert flush_ratings() == 0
+    assert not Rating.objects.exists()
+
+
+def test_interrupted_flush_is_retried(redis_client, user):
+    cat = CatFactory()
+    buffer_rating(user.pk, cat.pk, 5)
+    # Simulate a worker that died after claiming the pending votes and
+    # after writing them, but before deleting the processing hash.
+    redis_client.rename(PENDING_KEY, PROCESSING_KEY)
+    Rating.objects.rate(user, cat, 5)
+    buffer_rating(user.pk, CatFactory().pk, 3)
+
+    assert flush_ratings() == 0
+    assert pending_ratings() == 1
+    assert flush_ratings() == 1
+
+    cat.refresh_from_db()
+    assert (cat.rating_count, cat.rating_sum) == (1, 5)
+
+
+def test_rejected_batch_is_retried(redis_client, user, monkeypatch):
+    cat = CatFactory()
+    buffer_rating(user.pk, cat.pk, 5)
+    rate_many = Rating.objects.rate_many
+    calls = []
+
+    def fail_once(votes):
+        calls.append(votes)
+        if len(calls) == 1:
+            raise IntegrityError
+        return rate_many(votes)
+
+    monkeypatch.setattr(Rating.objects, "rate_many", fail_once)
+
+    assert flush_ratings() == 1
+    assert len(calls) == 2  # noqa: PLR2004
+
+
+def test_rejected_batch_is_set_aside(redis_client, make_users, monkeypatch):
+    cats = CatFactory.create_batch(2)
+    good, bad = make_users(2)
+    buffer_rating(good.pk, cats[0].pk, 5)
+    buffer_rating(bad.pk, cats[1].pk, 3)
+    rate_many = Rating.objects.rate_many
+
+    def reject(votes):
+        if any(user_id == bad.pk for user_id, _, _ in votes):
+            raise IntegrityError
+        return rate_many(votes)
+
+    monkeypatch.setattr(Rating.objects, "rate_many", reject)
+
+    assert flush_ratings(batch_size=1) == 1
+    assert pending_ratings() == 0
+    assert redis_client.hgetall(FAILED_KEY) == {f"{bad.pk}:{cats[1].pk}".encode(): b"3"}
+    assert Rating.objects.get().user == good
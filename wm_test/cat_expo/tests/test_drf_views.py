@@ -0,0 +1,155 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from wm_test.cat_expo import leaderboard
+from wm_test.cat_expo.api.views import LeaderboardViewSet
+from wm_test.cat_expo.api.views import RatingViewSet
+from wm_test.cat_expo.buffer import pending_ratings
+from wm_test.cat_expo.models import Rating
+from wm_test.cat_expo.tests.factories import BreedFactory
+from wm_test.cat_expo.tests.factories import CatFactory
+from wm_test.users.models import User
+
+
+class TestCatViewSet:
+    @pytest.fixture
+    def client(self, user: User) -> APIClient:
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    @pytest.mark.query_budget(1)
+    @pytest.mark.parametrize("page_size", [1, 10, 50])
+    def test_list(self, client: APIClient, page_size: int):
+        cats = CatFactory.create_batch(12)
+
+        response = client.get(reverse("api:cat-list"), {"page_size": page_size})
+
+        assert response.status_code == HTTPStatus.OK
+        newest = max(cats, key=lambda cat: cat.pk)
+        assert len(response.data["results"]) == min(page_size, len(cats))
+        assert response.data["results"][0] == {
+            "id": newest.pk,
+            "url": f"http://testserver/api/cats/{newest.pk}/",
+            "name": newest.name,
+            "breed": {"id": newest.breed_id, "name": newest.breed.name},
+            "owner_name": newest.owner.name,
+            "color": newest.color,
+            "birth_date": None,
+            "photos": None,
+            "rating_count": 0,
+            "rating_average": 0.0,
+        }
+
+    @pytest.mark.query_budget(1)
+    def test_list_by_breed(self, client: APIClient):
+        breed = BreedFactory()
+        cats = CatFactory.create_batch(2, breed=breed)
+        CatFactory()
+
+        response = client.get(reverse("api:cat-list"), {"breed": breed.pk})
+
+        assert [cat["id"] for cat in response.data["results"]] == [
+            cats[1].pk,
+            cats[0].pk,
+        ]
+
+    def test_list_by_invalid_breed(self, client: APIClient):
+        CatFactory()
+
+        response = client.get(reverse("api:cat-list"), {"breed": "siamese"})
+
+        assert response.data["results"] == []
+
+    @pytest.mark.query_budget(1)
+    def test_retrieve(self, client: APIClient):
+        cat = CatFactory()
+
+        response = client.get(reverse("api:cat-detail", kwargs={"pk": cat.pk}))
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.data["breed"]["name"] == cat.breed.name
+
+
+class TestRatingViewSet:
+    @pytest.fixture
+    def api_rf(self) -> APIRequestFactory:
+        return APIRequestFactory()
+
+    def post(self, api_rf: APIRequestFactory, user: User, data: dict):
+        request = api_rf.post("/fake-url/", data, format="json")
+        force_authenticate(request, user=user)
+        return RatingViewSet.as_view({"post": "create"})(request)
+
+    def test_create_buffers_vote(
+        self,
+        user: User,
+        api_rf: APIRequestFactory,
+        redis_client,
+        django_assert_num_queries,
+    ):
+        with django_assert_num_queries(0):
+            response = self.post(api_rf, user, {"cat": 7, "score": 5})
+
+        assert response.status_code == HTTPStatus.ACCEPTED
+        assert response.data == {"cat": 7, "score": 5}
+        assert redis_client.hget("cat_expo:ratings:pending", f"{user.pk}:7") == b"5"
+        assert pending_ratings() == 1
+
+    def test_create_validates_score(
+        self,
+        user: User,
+        api_rf: APIRequestFactory,
+        redis_client,
+    ):
+        response = self.post(api_rf, user, {"cat": 7, "score": 6})
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert "score" in response.data
+        assert pending_ratings() == 0
+
+
+class TestLeaderboardViewSet:
+    def get(self, user: User, query: dict | None = None):
+        request = APIRequestFactory().get("/fake-url/", query)
+        force_authenticate(request, user=user)
+        return LeaderboardViewSet.as_view({"get": "list"})(request)
+
+    def test_list(self, user: User, django_assert_num_queries):
+        cats = CatFactory.create_batch(3)
+        for cat, score in zip(cats, [3, 4, 1], strict=True):
+            Rating.objects.rate(user, cat, score)
+        leaderboard.rebuild()
+
+        with django_assert_num_queries(0):
+            response = self.get(user, {"limit": 2})
+
+        assert response.status_code == HTTPStatus.OK
+        assert [entry["id"] for entry in response.data] == [cats[1].pk, cats[0].pk]
+        assert response.data[0] == {
+            "rank": 1,
+            "id": cats[1].pk,
+            "name": cats[1].name,
+            "breed": cats[1].breed.name,
+            "rating_count": 1,
+            "rating_average": 4.0,
+        }
+
+    def test_list_by_breed(self, user: User):
+        cat, _ = CatFactory.create_batch(2)
+
+        response = self.get(user, {"breed": cat.breed_id})
+
+        assert response.status_code == HTTPStatus.OK
+        assert [entry["id"] for entry in response.data] == [cat.pk]
+
+    def test_list_validates_limit(self, user: User):
+        response = self.get(user, {"limit": 101})
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert "limit" in response.data
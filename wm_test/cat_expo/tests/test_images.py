@@ -0,0 +1,137 @@
+import io
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+from django.core.files.base import ContentFile
+from django.test import Client
+from django.urls import reverse
+from PIL import Image
+from PIL.ExifTags import Base
+
+from wm_test.cat_expo import views
+from wm_test.cat_expo.api.serializers import CatSerializer
+from wm_test.cat_expo.images import generate_variant
+from wm_test.cat_expo.models import Cat
+from wm_test.cat_expo.tests.factories import CatFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def image_bytes(size: tuple[int, int], image_format: str = "JPEG") -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "orange").save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def cat() -> Cat:
+    cat = CatFactory()
+    cat.photo.save("tom.jpg", ContentFile(image_bytes((2000, 1000))))
+    return cat
+
+
+class TestGenerateVariant:
+    def test_fits_the_box_keeping_the_aspect_ratio(self, tmp_path: Path):
+        source = tmp_path / "tom.jpg"
+        source.write_bytes(image_bytes((2000, 1000)))
+        target = tmp_path / "variants" / "card" / "tom.jpg"
+
+        generate_variant(str(source), str(target), (480, 480))
+
+        with Image.open(target) as variant:
+            assert variant.format == "JPEG"
+            assert variant.size == (480, 240)
+        assert [path.name for path in target.parent.iterdir()] == ["tom.jpg"]
+
+    @pytest.mark.parametrize("mode", [0o644, 0o640])
+    def test_is_readable_as_an_upload(self, tmp_path: Path, settings, mode: int):
+        settings.FILE_UPLOAD_PERMISSIONS = mode
+        source = tmp_path / "tom.jpg"
+        source.write_bytes(image_bytes((100, 50)))
+        target = tmp_path / "thumbnail" / "tom.jpg"
+
+        generate_variant(str(source), str(target), (160, 160))
+
+        assert target.stat().st_mode & 0o777 == mode
+
+    def test_never_enlarges_and_keeps_the_format(self, tmp_path: Path):
+        source = tmp_path / "tom.png"
+        source.write_bytes(image_bytes((100, 50), "PNG"))
+        target = tmp_path / "full" / "tom.png"
+
+        generate_variant(str(source), str(target), (1600, 1600))
+
+        with Image.open(target) as variant:
+            assert variant.format == "PNG"
+            assert variant.size == (100, 50)
+
+    def test_applies_the_exif_orientation(self, tmp_path: Path):
+        exif = Image.Exif()
+        exif[Base.Orientation] = 6  # Rotated 90 degrees clockwise.
+        source = tmp_path / "tom.jpg"
+        Image.new("RGB", (400, 200)).save(source, exif=exif)
+        target = tmp_path / "thumbnail" / "tom.jpg"
+
+        generate_variant(str(source), str(target), (160, 160))
+
+        with Image.open(target) as variant:
+            assert variant.size == (80, 160)
+            assert Base.Orientation not in variant.getexif()
+
+
+class TestPhotoVariantView:
+    def test_generates_once(self, cat: Cat, settings, monkeypatch):
+        settings.MEDIA_ACCEL_REDIRECT_PREFIX = ""
+        url = reverse(
+            "cat-photo-variant",
+            kwargs={"variant": "thumbnail", "name": cat.photo.name},
+        )
+        assert url == f"/media/variants/thumbnail/{cat.photo.name}"
+
+        response = Client().get(url)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Type"] == "image/jpeg"
+        with Image.open(io.BytesIO(response.getvalue())) as image:
+            assert image.size == (160, 80)
+
+        monkeypatch.setattr(views, "generate_variant", pytest.fail)
+        assert Client().get(url).status_code == HTTPStatus.OK
+
+    def test_hands_the_file_to_nginx(self, cat: Cat, settings):
+        settings.MEDIA_ACCEL_REDIRECT_PREFIX = "/internal-media/"
+
+        response = Client().get(f"/media/variants/card/{cat.photo.name}")
+
+        assert response.status_code == HTTPStatus.OK
+        assert response["X-Accel-Redirect"] == (
+            f"/internal-media/variants/card/{cat.photo.name}"
+        )
+        assert response.content == b""
+        assert (Path(settings.MEDIA_ROOT) / "variants/card" / cat.photo.name).exists()
+
+    @pytest.mark.parametrize(
+        "path",
+        ["/media/variants/huge/{name}", "/media/variants/card/cats/other.jpg"],
+    )
+    def test_not_found(self, cat: Cat, path: str):
+        response = Client().get(path.format(name=cat.photo.name))
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_missing_photo_file(self, cat: Cat):
+        Path(cat.photo.path).unlink()
+
+        response = Client().get(f"/media/variants/card/{cat.photo.name}")
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_serializer_links_every_variant(cat: Cat):
+    data = CatSerializer(cat, context={"request": None}).data
+
+    assert data["photos"] == {
+        variant: f"/media/variants/{variant}/{cat.photo.name}"
+        for variant in ("thumbnail", "card", "full")
+    }
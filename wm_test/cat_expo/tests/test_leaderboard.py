@@ -0,0 +1,125 @@
+import pytest
+from django.core.management import call_command
+
+from wm_test.cat_expo import leaderboard
+from wm_test.cat_expo.models import Cat
+from wm_test.cat_expo.models import Rating
+from wm_test.cat_expo.tests.factories import BreedFactory
+from wm_test.cat_expo.tests.factories import CatFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def ids(entries):
+    return [entry["id"] for entry in entries]
+
+
+@pytest.fixture
+def rated_cats(django_capture_on_commit_callbacks, make_users):
+    """Three cats of two breeds, averaging 5, 2.5 and 1."""
+    breed, other_breed = BreedFactory.create_batch(2)
+    users = make_users(2)
+    with django_capture_on_commit_callbacks(execute=True):
+        best = CatFactory(breed=breed)
+        middle = CatFactory(breed=other_breed)
+        worst = CatFactory(breed=breed)
+        Rating.objects.rate_many(
+            [
+                (users[0].pk, best.pk, 5),
+                (users[1].pk, best.pk, 5),
+                (users[0].pk, middle.pk, 2),
+                (users[1].pk, middle.pk, 3),
+                (users[0].pk, worst.pk, 1),
+            ],
+        )
+    return best, middle, worst
+
+
+def test_first_read_rebuilds(rated_cats, django_assert_num_queries):
+    best, middle, worst = rated_cats
+
+    entries = leaderboard.top(10)
+
+    assert ids(entries) == [best.pk, middle.pk, worst.pk]
+    assert entries[0] == {
+        "id": best.pk,
+        "name": best.name,
+        "breed_id": best.breed_id,
+        "breed": best.breed.name,
+        "rating_count": 2,
+        "rating_average": 5.0,
+    }
+    with django_assert_num_queries(0):
+        assert ids(leaderboard.top(2)) == [best.pk, middle.pk]
+        assert ids(leaderboard.top(10, breed_id=best.breed_id)) == [best.pk, worst.pk]
+
+
+def test_ratings_update_leaderboard(
+    rated_cats,
+    user,
+    django_capture_on_commit_callbacks,
+):
+    best, middle, worst = rated_cats
+    leaderboard.top(10)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Rating.objects.rate(user, worst, 5)
+        Rating.objects.rate(user, best, 1)
+
+    entries = leaderboard.top(10)
+    assert ids(entries) == [best.pk, worst.pk, middle.pk]
+    assert [entry["rating_average"] for entry in entries] == pytest.approx(
+        [11 / 3, 3.0, 2.5],
+    )
+
+
+def test_cat_changes_update_leaderboard(
+    rated_cats,
+    django_capture_on_commit_callbacks,
+):
+    best, middle, worst = rated_cats
+    leaderboard.top(10)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        worst.breed = middle.breed
+        worst.name = "Renamed"
+        worst.save()
+        best.delete()
+
+    assert ids(leaderboard.top(10)) == [middle.pk, worst.pk]
+    assert ids(leaderboard.top(10, breed_id=middle.breed_id)) == [middle.pk, worst.pk]
+    assert leaderboard.top(10, breed_id=best.breed_id) == []
+    assert leaderboard.top(10)[1]["name"] == "Renamed"
+
+
+def test_rebuild_command_replaces_drifted_data(rated_cats, redis_client):
+    best, middle, worst = rated_cats
+    leaderboard.top(10)
+    redis_client.zadd(leaderboard.ALL_KEY, {999: 10})
+    redis_client.zadd(leaderboard.BREED_KEY.format(breed_id=999), {999: 10})
+
+    call_command("rebuild_leaderboard")
+
+    assert ids(leaderboard.top(10)) == [best.pk, middle.pk, worst.pk]
+    assert not redis_client.exists(leaderboard.BREED_KEY.format(breed_id=999))
+    assert not list(redis_client.scan_iter(f"{leaderboard.PREFIX}:staging:*"))
+
+
+def test_updates_during_a_rebuild_survive_it(rated_cats, redis_client, monkeypatch):
+    best, middle, worst = rated_cats
+    leaderboard.top(10)
+    scan_iter = redis_client.scan_iter
+
+    def rated_mid_rebuild(*args, **kwargs):
+        # After the rebuild read the cats, before its sets go live.
+        Cat.objects.filter(pk=worst.pk).update(rating_count=1, rating_sum=10)
+        leaderboard.update_cats([worst.pk])
+        return scan_iter(*args, **kwargs)
+
+    monkeypatch.setattr(redis_client, "scan_iter", rated_mid_rebuild)
+
+    leaderboard.rebuild()
+
+    assert ids(leaderboard.top(10)) == [worst.pk, best.pk, middle.pk]
+    assert not redis_client.zcard(leaderboard.REBUILDS_KEY)
+    assert not list(redis_client.scan_iter(f"{leaderboard.PREFIX}:staging:*"))
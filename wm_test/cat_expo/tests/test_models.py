@@ -0,0 +1,106 @@
+import pytest
+from django.db.models import Avg
+from django.db.models import Count
+from django.db.models import Sum
+
+from wm_test.cat_expo.models import Cat
+from wm_test.cat_expo.models import Rating
+from wm_test.cat_expo.tests.factories import BreedFactory
+from wm_test.cat_expo.tests.factories import CatFactory
+from wm_test.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestRatingManager:
+    def test_rate_updates_aggregates(self):
+        cat = CatFactory()
+        for score in (5, 4, 3):
+            Rating.objects.rate(UserFactory(), cat, score)
+
+        cat.refresh_from_db()
+        assert cat.rating_count == 3  # noqa: PLR2004
+        assert cat.rating_sum == 12  # noqa: PLR2004
+        assert cat.rating_average == pytest.approx(4.0)
+
+    def test_revote_replaces_score(self, user):
+        cat = CatFactory()
+        Rating.objects.rate(user, cat, 2)
+        Rating.objects.rate(user, cat, 5)
+
+        cat.refresh_from_db()
+        assert Rating.objects.get(user=user, cat=cat).score == 5  # noqa: PLR2004
+        assert (cat.rating_count, cat.rating_sum) == (1, 5)
+
+    def test_aggregates_match_ratings(self, make_users):
+        cats = CatFactory.create_batch(3)
+        users = make_users(4)
+        for index, user in enumerate(users):
+            for cat in cats:
+                Rating.objects.rate(user, cat, (index + cat.pk) % 5 + 1)
+
+        expected = Rating.objects.values("cat").annotate(
+            count=Count("id"),
+            total=Sum("score"),
+            average=Avg("score"),
+        )
+        for row in expected:
+            cat = Cat.objects.get(pk=row["cat"])
+            assert (cat.rating_count, cat.rating_sum) == (row["count"], row["total"])
+            assert cat.rating_average == pytest.approx(row["average"])
+
+    def test_rate_many(self, user):
+        cat, other = CatFactory.create_batch(2)
+        Rating.objects.rate(user, cat, 1)
+        voter = UserFactory()
+
+        written = Rating.objects.rate_many(
+            [
+                (user.pk, cat.pk, 4),
+                (voter.pk, cat.pk, 2),
+                (voter.pk, other.pk, 1),
+                (voter.pk, other.pk, 5),
+            ],
+        )
+
+        assert written == 3  # noqa: PLR2004
+        cat.refresh_from_db()
+        other.refresh_from_db()
+        assert (cat.rating_count, cat.rating_sum) == (2, 6)
+        assert (other.rating_count, other.rating_sum) == (1, 5)
+        assert Rating.objects.rate_many([(voter.pk, other.pk, 5)]) == 0
+
+    def test_deleted_user_leaves_the_aggregates(self, make_users):
+        cat, other = CatFactory.create_batch(2)
+        leaving, staying = make_users(2)
+        Rating.objects.rate_many(
+            [
+                (leaving.pk, cat.pk, 1),
+                (leaving.pk, other.pk, 2),
+                (staying.pk, cat.pk, 5),
+            ],
+        )
+
+        leaving.delete()
+
+        cat.refresh_from_db()
+        other.refresh_from_db()
+        assert (cat.rating_count, cat.rating_sum) == (1, 5)
+        assert (other.rating_count, other.rating_sum) == (0, 0)
+        assert Rating.objects.count() == 1
+
+
+class TestCatQuerySet:
+    def test_unrated_cat_average(self):
+        assert CatFactory().rating_average == 0
+
+    def test_leaderboard(self, user):
+        breed = BreedFactory()
+        best, worst = CatFactory(breed=breed), CatFactory(breed=breed)
+        other = CatFactory()
+        Rating.objects.rate(user, best, 5)
+        Rating.objects.rate(user, worst, 1)
+        Rating.objects.rate(user, other, 3)
+
+        assert list(Cat.objects.leaderboard()) == [best, other, worst]
+        assert list(Cat.objects.leaderboard(breed_id=breed.pk)) == [best, worst]
@@ -0,0 +1,87 @@
+import pytest
+from rest_framework import serializers
+
+from wm_test.cat_expo.api.serializers import BreedSerializer
+from wm_test.cat_expo.api.serializers import CatSerializer
+from wm_test.cat_expo.models import Breed
+from wm_test.cat_expo.models import Cat
+from wm_test.cat_expo.tests.factories import BreedFactory
+from wm_test.cat_expo.tests.factories import CatFactory
+from wm_test.utils.serializers import PlannedModelSerializer
+
+pytestmark = pytest.mark.django_db
+
+
+class CatNameSerializer(PlannedModelSerializer):
+    class Meta:
+        model = Cat
+        fields = ["id", "name"]
+
+
+class BreedWithCatsSerializer(PlannedModelSerializer):
+    cats = CatNameSerializer(many=True)
+
+    class Meta:
+        model = Breed
+        fields = ["name", "cats"]
+
+
+class CatWithPropertySerializer(PlannedModelSerializer):
+    owner: serializers.StringRelatedField = serializers.StringRelatedField()
+
+    class Meta:
+        model = Cat
+        fields = ["name", "owner"]
+
+
+def test_plan_joins_and_limits_columns(django_assert_num_queries):
+    CatFactory.create_batch(3)
+
+    queryset = CatSerializer.setup_queryset(Cat.objects.all())
+
+    assert queryset.query.select_related == {"breed": {}, "owner": {}}
+    assert queryset.query.deferred_loading == (
+        {
+            "birth_date",
+            "breed",
+            "breed__id",
+            "breed__name",
+            "color",
+            "id",
+            "name",
+            "owner",
+            "owner__name",
+            "photo",
+            "rating_average",
+            "rating_count",
+        },
+        False,
+    )
+    with django_assert_num_queries(1):
+        data = CatSerializer(queryset, many=True, context={"request": None}).data
+    assert len(data) == 3  # noqa: PLR2004
+
+
+def test_plan_prefetches_nested_lists(django_assert_num_queries):
+    breeds = BreedFactory.create_batch(2)
+    for breed in breeds:
+        CatFactory.create_batch(2, breed=breed)
+
+    queryset = BreedWithCatsSerializer.setup_queryset(Breed.objects.all())
+
+    with django_assert_num_queries(2):
+        data = BreedWithCatsSerializer(queryset, many=True).data
+    assert [len(breed["cats"]) for breed in data] == [2, 2]
+
+
+def test_plan_loads_all_columns_for_unknown_attributes():
+    queryset = CatWithPropertySerializer.setup_queryset(Cat.objects.all())
+
+    assert queryset.query.select_related == {"owner": {}}
+    assert queryset.query.deferred_loading == (frozenset(), True)
+
+
+def test_breed_serializer_plan():
+    queryset = BreedSerializer.setup_queryset(Breed.objects.all())
+
+    assert queryset.query.deferred_loading == ({"id", "name"}, False)
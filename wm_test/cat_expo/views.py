@@ -1 +1,39 @@
-# Create your views here.
+import mimetypes
+from pathlib import Path
+
+from django.conf import settings
+from django.http import FileResponse
+from django.http import Http404
+from django.http import HttpResponse
+from PIL import Image
+
+from .images import VARIANTS
+from .images import generate_variant
+from .images import variant_name
+from .models import Cat
+
+
+def photo_variant_view(request, variant: str, name: str):
+    """Serve the ``variant`` of the cat photo ``name``, generating it once."""
+    size = VARIANTS.get(variant)
+    # Only uploaded photos, never other files under MEDIA_ROOT.
+    if size is None or not Cat.objects.filter(photo=name).exists():
+        raise Http404
+
+    media_root = Path(settings.MEDIA_ROOT)
+    target = media_root / variant_name(name, variant)
+    if not target.exists():
+        try:
+            generate_variant(str(media_root / name), str(target), size)
+        except (OSError, Image.DecompressionBombError) as error:
+            # A missing photo file or one Pillow cannot read.
+            raise Http404 from error
+
+    content_type, _ = mimetypes.guess_type(name)
+    if settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = (
+            f"{settings.MEDIA_ACCEL_REDIRECT_PREFIX}{variant_name(name, variant)}"
+        )
+        return response
+    return FileResponse(target.open("rb"), content_type=content_type)
@@ -1,7 +1,43 @@
+import os
+import uuid
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import ExitStack
+
+import fakeredis
 import pytest
+from django.core.signals import request_finished
+from django.core.signals import request_started
+from django.db import connections
 
 from wm_test.users.models import User
 from wm_test.users.tests.factories import UserFactory
+from wm_test.utils import template_db
+from wm_test.utils.redis_client import get_redis
+
+
+@pytest.fixture(scope="session")
+def django_db_setup(  # noqa: PT004
+    django_test_environment,
+    django_db_blocker,
+    django_db_createdb,
+) -> Iterator[None]:
+    """
+    Clone the test database from a migrated template.
+
+    Replaces pytest-django's fixture, see ``wm_test.utils.template_db``.
+    Every pytest-xdist worker gets its own clone.
+    """
+    with django_db_blocker.unblock():
+        databases = template_db.setup_databases(
+            os.environ.get("PYTEST_XDIST_WORKER", ""),
+            rebuild=django_db_createdb,
+            # Shared by the workers of a pytest-xdist run.
+            run_id=os.environ.get("PYTEST_XDIST_TESTRUNUID") or uuid.uuid4().hex,
+        )
+    yield
+    with django_db_blocker.unblock():
+        template_db.teardown_databases(databases)
 
 
 @pytest.fixture(autouse=True)
@@ -12,3 +48,82 @@ def _media_storage(settings, tmpdir) -> None:
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
+
+
+@pytest.fixture
+def make_users(db) -> Callable[..., list[User]]:
+    """Create users with one INSERT, e.g. ``make_users(50, name="Ann")``."""
+    return UserFactory.create_bulk
+
+
+@pytest.fixture(autouse=True)
+def redis_client(monkeypatch) -> Iterator[fakeredis.FakeRedis]:
+    """
+    Point ``get_redis()`` at an in-memory fake for the test.
+
+    Autouse, since cat saves reach Redis through the leaderboard signals.
+    """
+    client = fakeredis.FakeRedis()
+    get_redis.cache_clear()
+    monkeypatch.setattr("redis.Redis.from_url", lambda *args, **kwargs: client)
+    yield client
+    get_redis.cache_clear()
+
+
+_SAVEPOINT_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+class _RequestQueryCounter:
+    """
+    Count queries per request made through the test client.
+
+    Savepoints are left out: ``ATOMIC_REQUESTS`` opens one per request
+    inside the test transaction, where production runs BEGIN/COMMIT.
+    """
+
+    def __init__(self) -> None:
+        self.counts: list[int] = []
+        self.active = False
+
+    def started(self, **kwargs) -> None:
+        self.counts.append(0)
+        self.active = True
+
+    def finished(self, **kwargs) -> None:
+        self.active = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.active and not sql.startswith(_SAVEPOINT_STATEMENTS):
+            self.counts[-1] += 1
+        return execute(sql, params, many, context)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item: pytest.Item):
+    """
+    Enforce ``@pytest.mark.query_budget(n)``.
+
+    The test fails when any request it makes runs more than ``n`` queries.
+    Queries run by the test itself, e.g. to create fixtures, are not counted,
+    so one budget holds for every page size a test is parametrized with.
+    """
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+
+    budget = marker.args[0]
+    counter = _RequestQueryCounter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+        request_started.connect(counter.started, weak=False)
+        stack.callback(request_started.disconnect, counter.started)
+        request_finished.connect(counter.finished, weak=False)
+        stack.callback(request_finished.disconnect, counter.finished)
+        result = yield
+
+    if over := [count for count in counter.counts if count > budget]:
+        pytest.fail(
+            f"Requests ran {over} queries, over the budget of {budget} per request.",
+        )
+    return result
@@ -0,0 +1,29 @@
+from django.contrib import admin
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from .models import OutboxEmail
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ["subject", "recipients", "created", "attempts", "send_after"]
+    list_filter = ["attempts"]
+    search_fields = ["subject"]
+    readonly_fields = [
+        "from_email",
+        "recipients",
+        "subject",
+        "created",
+        "send_after",
+        "attempts",
+        "last_error",
+    ]
+    actions = ["retry"]
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description=_("Retry now"))
+    def retry(self, request, queryset):
+        queryset.update(attempts=0, send_after=timezone.now(), last_error="")
@@ -0,0 +1,63 @@
+"""
+An email backend that queues instead of sending.
+
+``OutboxEmailBackend`` renders each message and inserts it into the
+``OutboxEmail`` table, in the caller's transaction: with
+``ATOMIC_REQUESTS`` a signup's verification email is committed with the
+new user, or not at all. Nothing talks to the mail server during the
+request. ``manage.py send_outbox`` sends the queue through
+``OUTBOX_EMAIL_BACKEND``, see ``wm_test.outbox.sender``.
+"""
+
+from email import message_from_bytes
+from email.generator import BytesGenerator
+from email.message import Message
+from io import BytesIO
+
+from django.core.mail import EmailMessage
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .models import OutboxEmail
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages) -> int:
+        emails = [
+            OutboxEmail(
+                from_email=message.from_email,
+                recipients=message.recipients(),
+                subject=message.subject,
+                message=message.message().as_bytes(),
+            )
+            for message in email_messages
+            if message.recipients()
+        ]
+        OutboxEmail.objects.bulk_create(emails)
+        return len(emails)
+
+
+class _RenderedMessage(Message):
+    # What Django's SMTP backend expects of EmailMessage.message().
+    def as_bytes(self, unixfrom=False, linesep="\n"):  # noqa: FBT002
+        fp = BytesIO()
+        generator = BytesGenerator(fp, mangle_from_=False)
+        generator.flatten(self, unixfrom=unixfrom, linesep=linesep)
+        return fp.getvalue()
+
+
+class StoredEmailMessage(EmailMessage):
+    """An ``OutboxEmail`` that any email backend can send."""
+
+    def __init__(self, email: OutboxEmail) -> None:
+        super().__init__(
+            subject=email.subject,
+            from_email=email.from_email,
+            to=email.recipients,
+        )
+        self.rendered = bytes(email.message)
+
+    def message(self):
+        return message_from_bytes(self.rendered, _class=_RenderedMessage)
+
+    def recipients(self) -> list[str]:
+        return self.to
@@ -0,0 +1,100 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.test import override_settings
+from django.urls import reverse
+
+from wm_test.outbox.sender import send_outbox
+from wm_test.utils.loadtest import smtp_server
+
+CONFIGURATIONS = {
+    "SMTP in request": "django.core.mail.backends.smtp.EmailBackend",
+    "outbox": "wm_test.outbox.backends.OutboxEmailBackend",
+}
+PASSWORD = "My_R@ndom-P@ssw0rd"  # noqa: S105
+
+
+class Command(BaseCommand):
+    help = (
+        "Sign up users through the allauth form, with the verification email "
+        "sent over SMTP inside the request and queued in the outbox, against "
+        "a local aiosmtpd server that takes --smtp-delay-ms to accept each "
+        "message. Reports signup latency, then drains the outbox with the "
+        "batched sender. Seeded users are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--signups", type=int, default=200)
+        parser.add_argument("--smtp-delay-ms", type=float, default=50.0)
+
+    # The test client sends "testserver". A cheap hasher and no rate limit,
+    # so the email is what differs.
+    @override_settings(
+        ALLOWED_HOSTS=["testserver"],
+        DEBUG=False,
+        PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+        ACCOUNT_RATE_LIMITS=False,
+    )
+    def handle(self, *args, **options):
+        with smtp_server(options["smtp_delay_ms"] / 1000) as (port, recorder):
+            self.stdout.write(
+                f"{'email backend':<16} {'p50 ms':>7} {'p95 ms':>7} "
+                f"{'max ms':>7} {'SMTP connections':>16}",
+            )
+            with override_settings(
+                EMAIL_HOST="127.0.0.1",
+                EMAIL_PORT=port,
+                EMAIL_USE_TLS=False,
+                EMAIL_USE_SSL=False,
+                OUTBOX_EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            ):
+                for name, backend in CONFIGURATIONS.items():
+                    with (
+                        override_settings(EMAIL_BACKEND=backend),
+                        transaction.atomic(),
+                    ):
+                        recorder.connections = 0
+                        self.run(name, recorder, options["signups"])
+                        if name == "outbox":
+                            self.drain(recorder)
+                        transaction.set_rollback(True)
+
+    def run(self, name, recorder, signups):
+        url = reverse("account_signup")
+        samples = []
+        for index in range(signups):
+            data = {
+                "email": f"signup-{index}@example.com",
+                "password1": PASSWORD,
+                "password2": PASSWORD,
+            }
+            client = Client()
+            started = time.perf_counter()
+            client.post(url, data)
+            samples.append((time.perf_counter() - started) * 1000)
+        percentiles = statistics.quantiles(samples, n=100)
+        self.stdout.write(
+            f"{name:<16} {percentiles[49]:>7.1f} {percentiles[94]:>7.1f} "
+            f"{max(samples):>7.1f} {recorder.connections:>16}",
+        )
+
+    def drain(self, recorder):
+        recorder.connections = 0
+        received = len(recorder.envelopes)
+        connection = get_connection(settings.OUTBOX_EMAIL_BACKEND)
+        started = time.perf_counter()
+        sent = 0
+        while batch := send_outbox(connection)[0]:
+            sent += batch
+        connection.close()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"send_outbox sent {sent} emails ({len(recorder.envelopes) - received} "
+            f"received) over {recorder.connections} connection(s) in "
+            f"{elapsed:.2f}s, {sent / elapsed:.0f} emails/s.",
+        )
@@ -0,0 +1,51 @@
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from wm_test.outbox.sender import send_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Send the emails queued by OutboxEmailBackend through "
+        "OUTBOX_EMAIL_BACKEND, reusing one connection while there is work."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait once the outbox is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Send until the outbox is empty and exit instead of running "
+            "as a worker.",
+        )
+
+    def handle(self, *args, **options):
+        connection = get_connection(settings.OUTBOX_EMAIL_BACKEND)
+        batch_size = options["batch_size"]
+        try:
+            while True:
+                started = time.perf_counter()
+                sent, failed = send_outbox(connection, batch_size=batch_size)
+                if sent or failed or options["verbosity"] > 1:
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(
+                        f"Sent {sent} emails, {failed} failed, in {elapsed:.3f}s",
+                    )
+                if sent + failed < batch_size:
+                    # Drained, or the server is unreachable. Do not hold an
+                    # idle connection the server would time out anyway.
+                    connection.close()
+                    if options["once"]:
+                        return
+                    time.sleep(options["interval"])
+        finally:
+            connection.close()
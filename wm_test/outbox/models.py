@@ -0,0 +1,31 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class OutboxEmail(models.Model):
+    """
+    An email written by ``OutboxEmailBackend``, waiting to be sent.
+
+    ``message`` is the rendered MIME message. ``recipients`` holds the
+    envelope, Bcc included. Sent emails are deleted. Failed ones are retried
+    from ``send_after`` until ``OUTBOX_MAX_ATTEMPTS`` attempts have failed.
+    """
+
+    from_email = models.TextField(_("From"))
+    recipients = models.JSONField(_("Recipients"))
+    subject = models.TextField(_("Subject"), blank=True)
+    message = models.BinaryField(_("Message"))
+    created = models.DateTimeField(_("Created"), auto_now_add=True)
+    send_after = models.DateTimeField(_("Send after"), default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(_("Failed attempts"), default=0)
+    last_error = models.TextField(_("Last error"), blank=True)
+
+    class Meta:
+        indexes = [
+            # The sender's scan for due emails.
+            models.Index(fields=["send_after", "id"], name="outbox_due_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return self.subject
@@ -0,0 +1,75 @@
+"""
+Sending the outbox.
+
+``send_outbox`` locks a batch of due emails with ``SKIP LOCKED``, so
+several workers can drain the table side by side, and sends them over one
+connection that the caller keeps open between batches. An email the server
+refuses is retried ``OUTBOX_RETRY_DELAY`` seconds later, the delay doubling
+with every failed attempt, until ``OUTBOX_MAX_ATTEMPTS`` attempts have
+failed. When the server cannot be reached the rest of the batch is left
+untouched for the next call.
+
+Delivery is at least once: a worker that dies after the server accepted
+an email but before its batch commits sends that email again.
+"""
+
+import logging
+import smtplib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+from django.utils import timezone
+
+from .backends import StoredEmailMessage
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+def send_outbox(connection: BaseEmailBackend, batch_size: int = 100) -> tuple[int, int]:
+    """Send a batch of due emails over ``connection``, return (sent, failed)."""
+    now = timezone.now()
+    sent, failed = [], []
+    with transaction.atomic():
+        emails = (
+            OutboxEmail.objects.filter(
+                send_after__lte=now,
+                attempts__lt=settings.OUTBOX_MAX_ATTEMPTS,
+            )
+            .order_by("send_after", "id")
+            .select_for_update(skip_locked=True)[:batch_size]
+        )
+        for email in emails:
+            try:
+                # A no-op while the connection is open.
+                connection.open()
+            except (smtplib.SMTPException, OSError):
+                logger.exception("Cannot connect to the mail server.")
+                break
+            try:
+                connection.send_messages([StoredEmailMessage(email)])
+            except (smtplib.SMTPException, OSError) as error:
+                # The server may have dropped the connection, the next
+                # email reconnects.
+                connection.close()
+                email.attempts += 1
+                delay = settings.OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+                email.send_after = now + timedelta(seconds=delay)
+                email.last_error = f"{type(error).__name__}: {error}"
+                failed.append(email)
+                if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                    logger.exception(
+                        "Giving up on outbox email %s to %s.",
+                        email.pk,
+                        ", ".join(email.recipients),
+                    )
+            else:
+                sent.append(email.pk)
+        OutboxEmail.objects.filter(pk__in=sent).delete()
+        OutboxEmail.objects.bulk_update(
+            failed,
+            ["attempts", "send_after", "last_error"],
+        )
+    return len(sent), len(failed)
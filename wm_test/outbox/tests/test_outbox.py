@@ -0,0 +1,135 @@
+import contextlib
+from email import message_from_bytes
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail import send_mail
+from django.core.management import call_command
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from wm_test.outbox.models import OutboxEmail
+from wm_test.outbox.sender import send_outbox
+from wm_test.utils.loadtest import free_port
+from wm_test.utils.loadtest import smtp_server
+
+pytestmark = pytest.mark.django_db
+
+
+class RollbackError(Exception):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def _outbox_backend(settings):
+    settings.EMAIL_BACKEND = "wm_test.outbox.backends.OutboxEmailBackend"
+    settings.OUTBOX_EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+    settings.EMAIL_HOST = "127.0.0.1"
+
+
+@pytest.fixture
+def smtp(settings):
+    with smtp_server() as (port, recorder):
+        settings.EMAIL_PORT = port
+        yield recorder
+
+
+def queue(count: int) -> None:
+    for index in range(count):
+        send_mail(
+            f"Hello {index}",
+            "Body",
+            "from@example.com",
+            [f"{index}@example.com"],
+        )
+
+
+def test_backend_queues_in_the_transaction(smtp):
+    queue(1)
+    with contextlib.suppress(RollbackError), transaction.atomic():
+        queue(1)
+        raise RollbackError
+
+    assert OutboxEmail.objects.count() == 1
+    assert smtp.connections == 0
+
+
+def test_signup_queues_the_verification_email(client, smtp):
+    response = client.post(
+        reverse("account_signup"),
+        {
+            "email": "new@example.com",
+            "password1": "My_R@ndom-P@ssw0rd",
+            "password2": "My_R@ndom-P@ssw0rd",
+        },
+    )
+
+    assert response.status_code == HTTPStatus.FOUND
+    (email,) = OutboxEmail.objects.all()
+    assert email.recipients == ["new@example.com"]
+    assert smtp.connections == 0
+
+
+def test_outbox_is_sent_over_one_connection(smtp):
+    queue(3)
+    EmailMessage("Hidden", "Body", "from@example.com", bcc=["bcc@example.com"]).send()
+
+    call_command("send_outbox", "--once", "--batch-size=2")
+
+    assert smtp.connections == 1
+    assert [envelope.rcpt_tos for envelope in smtp.envelopes] == [
+        ["0@example.com"],
+        ["1@example.com"],
+        ["2@example.com"],
+        ["bcc@example.com"],
+    ]
+    message = message_from_bytes(smtp.envelopes[0].original_content)
+    assert message["Subject"] == "Hello 0"
+    assert "Bcc" not in message_from_bytes(smtp.envelopes[3].original_content)
+    assert not OutboxEmail.objects.exists()
+
+
+def test_refused_email_is_retried_later(smtp, settings):
+    queue(2)
+    smtp.refused.add("0@example.com")
+    connection = mail.get_connection(settings.OUTBOX_EMAIL_BACKEND)
+
+    assert send_outbox(connection) == (1, 1)
+
+    email = OutboxEmail.objects.get()
+    assert email.attempts == 1
+    assert email.send_after > timezone.now()
+    assert "550" in email.last_error
+    assert send_outbox(connection) == (0, 0)
+
+    smtp.refused.clear()
+    OutboxEmail.objects.update(send_after=timezone.now())
+
+    assert send_outbox(connection) == (1, 0)
+    assert not OutboxEmail.objects.exists()
+    connection.close()
+
+
+def test_failed_email_is_given_up(smtp, settings):
+    settings.OUTBOX_MAX_ATTEMPTS = 1
+    queue(1)
+    smtp.refused.add("0@example.com")
+    connection = mail.get_connection(settings.OUTBOX_EMAIL_BACKEND)
+
+    assert send_outbox(connection) == (0, 1)
+    OutboxEmail.objects.update(send_after=timezone.now())
+
+    assert send_outbox(connection) == (0, 0)
+    assert OutboxEmail.objects.get().attempts == 1
+    connection.close()
+
+
+def test_unreachable_server_leaves_the_outbox(settings):
+    settings.EMAIL_PORT = free_port()
+    queue(2)
+
+    assert send_outbox(mail.get_connection(settings.OUTBOX_EMAIL_BACKEND)) == (0, 0)
+    assert list(OutboxEmail.objects.values_list("attempts", flat=True)) == [0, 0]
@@ -4,6 +4,8 @@ from django.contrib import admin
 from django.contrib.auth import admin as auth_admin
 from django.utils.translation import gettext_lazy as _
 
+from wm_test.utils.paginator import EstimatedCountPaginator
+
 from .forms import UserAdminChangeForm
 from .forms import UserAdminCreationForm
 from .models import User
@@ -37,8 +39,13 @@ class UserAdmin(auth_admin.UserAdmin):
         (_("Important dates"), {"fields": ("last_login", "date_joined")}),
     )
     list_display = ["email", "name", "is_superuser"]
-    search_fields = ["name"]
+    # icontains on both, served by the users_user_search_trgm_idx index.
+    search_fields = ["name", "email"]
     ordering = ["id"]
+    # No COUNT(*) over the whole table, neither for the page links nor for
+    # the "(N total)" next to search results.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     add_fieldsets = (
         (
             None,
@@ -0,0 +1,66 @@
+"""
+Per-user cache of the ``/api/users/me/`` payload.
+
+Each user gets a single cache entry mapping the request origin (the
+hyperlinked ``url`` field depends on scheme and host) to the serialized data
+and its ETag, so invalidation is one ``delete`` regardless of how many hosts
+the API is served from.
+"""
+
+import hashlib
+import json
+from collections import Counter
+
+from django.core.cache import cache
+from django.utils.http import quote_etag
+
+ME_CACHE_KEY = "users:me:{user_id}"
+# Signals drop the entry on every save, the timeout only bounds the window
+# in which a save racing a cache fill could leave a stale payload behind.
+ME_CACHE_TIMEOUT = 60 * 5
+
+# Per-process hit/miss counters.
+me_cache_stats: Counter[str] = Counter()
+
+
+def get_me_payload(user_id: int, origin: str) -> tuple[dict, str] | None:
+    """Return the cached ``(data, etag)`` for ``user_id`` or ``None``."""
+    entry = cache.get(ME_CACHE_KEY.format(user_id=user_id)) or {}
+    return _count(entry.get(origin))
+
+
+async def aget_me_payload(user_id: int, origin: str) -> tuple[dict, str] | None:
+    entry = await cache.aget(ME_CACHE_KEY.format(user_id=user_id)) or {}
+    return _count(entry.get(origin))
+
+
+def set_me_payload(user_id: int, origin: str, data: dict) -> tuple[dict, str]:
+    """Store ``data`` for ``user_id`` and return it with its ETag."""
+    key = ME_CACHE_KEY.format(user_id=user_id)
+    entry = _add_payload(cache.get(key), origin, data)
+    cache.set(key, entry, ME_CACHE_TIMEOUT)
+    return entry[origin]
+
+
+async def aset_me_payload(user_id: int, origin: str, data: dict) -> tuple[dict, str]:
+    key = ME_CACHE_KEY.format(user_id=user_id)
+    entry = _add_payload(await cache.aget(key), origin, data)
+    await cache.aset(key, entry, ME_CACHE_TIMEOUT)
+    return entry[origin]
+
+
+def _count(payload: tuple[dict, str] | None) -> tuple[dict, str] | None:
+    me_cache_stats["hit" if payload is not None else "miss"] += 1
+    return payload
+
+
+def _add_payload(entry: dict | None, origin: str, data: dict) -> dict:
+    rendered = json.dumps(data, sort_keys=True, default=str).encode()
+    etag = quote_etag(hashlib.md5(rendered, usedforsecurity=False).hexdigest())
+    entry = entry or {}
+    entry[origin] = (dict(data), etag)
+    return entry
+
+
+def invalidate_me_payload(user_id: int) -> None:
+    cache.delete(ME_CACHE_KEY.format(user_id=user_id))
@@ -0,0 +1,171 @@
+from base64 import b64decode
+from urllib import parse
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor
+from rest_framework.pagination import CursorPagination
+from rest_framework.pagination import _reverse_ordering
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination over a composite, unique ordering.
+
+    DRF's ``CursorPagination`` keys the cursor on the first ordering field only
+    and falls back to an offset when several rows share that value. Here the
+    cursor carries every ordering field, so the position is unique and each
+    page is a single index range scan no matter how deep the client pages.
+
+    All ordering fields must sort in the same direction and the last one must
+    be unique (usually the primary key).
+    """
+
+    page_size: int | None = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Like ``paginate_queryset`` but fetch the page with the async ORM."""
+        queryset = self.page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([instance async for instance in queryset])
+
+    def page_queryset(self, queryset, request, view=None):
+        """Return the unevaluated queryset of one page plus the next row."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            self.reverse, self.current_position = False, None
+        else:
+            self.reverse = self.cursor.reverse
+            self.current_position = self.cursor.position
+
+        if self.reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if self.current_position is not None:
+            queryset = self.filter_after_position(
+                queryset,
+                self.current_position,
+                reverse=self.reverse,
+            )
+
+        # Fetch one extra row to find out if there is a page after this one.
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        """Keep the page out of the rows fetched by ``page_queryset``."""
+        # DRF's stubs type a position as one value, here it is a tuple of
+        # every ordering field.
+        reverse, current_position = self.reverse, self.current_position
+        self.page = page = results[: self.page_size]
+
+        if len(results) > len(page):
+            following_position = self._get_position_from_instance(
+                results[-1],
+                self.ordering,
+            )
+        else:
+            following_position = None
+
+        if reverse:
+            page.reverse()
+            self.has_next = current_position is not None
+            self.has_previous = following_position is not None
+            self.next_position = current_position  # type: ignore[assignment]
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None
+            self.next_position = following_position
+            self.previous_position = current_position  # type: ignore[assignment]
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return page
+
+    def filter_after_position(self, queryset, position, *, reverse=False):
+        """
+        Restrict ``queryset`` to the rows strictly after ``position``.
+
+        For an ordering ``(a, b)`` this builds ``a < x OR (a = x AND b < y)``
+        plus a redundant ``a <= x`` bound, which lets the planner turn the
+        composite index on ``(a, b)`` into a single range scan.
+        """
+        fields = [order.lstrip("-") for order in self.ordering]
+        descending = self.ordering[0].startswith("-")
+        lookup = "lt" if descending != reverse else "gt"
+        bound = "lte" if lookup == "lt" else "gte"
+
+        opts = queryset.model._meta  # noqa: SLF001
+        try:
+            values = [
+                opts.get_field(field).to_python(value)
+                for field, value in zip(fields, position, strict=True)
+            ]
+        except (ValidationError, ValueError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+        condition = Q()
+        for index, field in enumerate(fields):
+            equal = dict(zip(fields[:index], values[:index], strict=True))
+            condition |= Q(**equal, **{f"{field}__{lookup}": values[index]})
+        return queryset.filter(
+            condition,
+            **{f"{fields[0]}__{bound}": values[0]},
+        )
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None:
+            return None
+
+        # The parent only keeps the first ``p`` token, read all of them.
+        encoded = request.query_params[self.cursor_query_param]
+        querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+        position = parse.parse_qs(querystring).get("p")
+        if position is not None and len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(
+            offset=0,
+            reverse=cursor.reverse,
+            position=tuple(position) if position is not None else None,  # type: ignore[arg-type]
+        )
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for order in ordering:
+            field_name = order.lstrip("-")
+            if isinstance(instance, dict):
+                value = instance[field_name]
+            else:
+                value = getattr(instance, field_name)
+            if hasattr(value, "isoformat"):
+                value = value.isoformat()
+            position.append(str(value))
+        return tuple(position)
+
+
+class UserCursorPagination(KeysetCursorPagination):
+    """Newest users first, served from the ``(date_joined, id)`` index."""
+
+    ordering = ("-date_joined", "-id")
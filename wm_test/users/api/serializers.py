@@ -1,6 +1,8 @@
 from rest_framework import serializers
+from rest_framework_simplejwt import serializers as jwt_serializers
 
 from wm_test.users.models import User
+from wm_test.users.tokens import RefreshToken
 
 
 class UserSerializer(serializers.ModelSerializer[User]):
@@ -11,3 +13,9 @@ class UserSerializer(serializers.ModelSerializer[User]):
         extra_kwargs = {
             "url": {"view_name": "api:user-detail", "lookup_field": "pk"},
         }
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """Rotate refresh tokens through the Redis blacklist."""
+
+    token_class = RefreshToken
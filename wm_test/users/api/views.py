@@ -1,26 +1,64 @@
+from adrf.viewsets import GenericViewSet
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.http import parse_etags
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.mixins import ListModelMixin
 from rest_framework.mixins import RetrieveModelMixin
 from rest_framework.mixins import UpdateModelMixin
 from rest_framework.response import Response
-from rest_framework.viewsets import GenericViewSet
 
 from wm_test.users.models import User
+from wm_test.utils.db import read_only_requests
 
+from .cache import aget_me_payload
+from .cache import aset_me_payload
+from .pagination import UserCursorPagination
 from .serializers import UserSerializer
 
 
+# The read-only actions are async: under ASGI (config.asgi) a worker keeps
+# serving other connections while they wait on the database or the cache.
+# Under WSGI Django runs them in a per-request event loop.
 class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericViewSet):
     serializer_class = UserSerializer
     queryset = User.objects.all()
     lookup_field = "pk"
+    pagination_class = UserCursorPagination
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        # ATOMIC_REQUESTS cannot wrap async views. The only write, update,
+        # is a single UPDATE statement. The reads may go to the replica.
+        return read_only_requests(super().as_view(actions, **initkwargs))
 
     def get_queryset(self, *args, **kwargs):
         assert isinstance(self.request.user.id, int)
         return self.queryset.filter(id=self.request.user.id)
 
+    async def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    async def retrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
     @action(detail=False)
-    def me(self, request):
-        serializer = UserSerializer(request.user, context={"request": request})
-        return Response(status=status.HTTP_200_OK, data=serializer.data)
+    async def me(self, request):
+        origin = f"{request.scheme}://{request.get_host()}"
+        payload = await aget_me_payload(request.user.pk, origin)
+        if payload is None:
+            # Not from a replica: a stale row cached right after the update
+            # invalidated it would be served for ME_CACHE_TIMEOUT.
+            user = await User.objects.using(DEFAULT_DB_ALIAS).aget(pk=request.user.pk)
+            serializer = UserSerializer(user, context={"request": request})
+            payload = await aset_me_payload(request.user.pk, origin, serializer.data)
+        data, etag = payload
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(status=status.HTTP_200_OK, data=data, headers=headers)
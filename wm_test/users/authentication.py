@@ -0,0 +1,98 @@
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from wm_test.users.models import User
+
+USER_ACTIVE_CACHE_KEY = "users:active:{user_id}"
+# How long a deactivation may take to reach API requests when the cache entry
+# cannot be dropped (e.g. the flag was flipped with a queryset ``update()``).
+USER_ACTIVE_CACHE_TIMEOUT = 60
+
+
+def get_user_is_active(user_id: int) -> bool | None:
+    """
+    Return the user's ``is_active`` flag, or ``None`` if the user is gone.
+
+    The flag is cached for ``USER_ACTIVE_CACHE_TIMEOUT`` seconds, user saves
+    and deletes drop it through ``invalidate_user_is_active``.
+    """
+    key = USER_ACTIVE_CACHE_KEY.format(user_id=user_id)
+    is_active = cache.get(key)
+    if is_active is None:
+        is_active = (
+            User.objects.filter(pk=user_id).values_list("is_active", flat=True).first()
+        )
+        if is_active is not None:
+            cache.set(key, is_active, USER_ACTIVE_CACHE_TIMEOUT)
+    return is_active
+
+
+def invalidate_user_is_active(user_id: int) -> None:
+    cache.delete(USER_ACTIVE_CACHE_KEY.format(user_id=user_id))
+
+
+class LazyTokenUser(SimpleLazyObject):
+    """
+    A ``User`` that is only fetched from the database when it is needed.
+
+    ``pk``/``id`` come from the token claims and the authentication flags
+    are constant, so views that only filter by the current user's id never
+    load the row. Any other attribute loads the full model once.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+    _user_id: int
+
+    def __init__(self, user_id: int):
+        # LazyObject forwards attribute assignment to the wrapped object.
+        self.__dict__["_user_id"] = user_id
+        super().__init__(self._load)
+
+    @property
+    def pk(self) -> int:
+        return self._user_id
+
+    id = pk
+
+    def __bool__(self) -> bool:
+        return True
+
+    def _load(self) -> User:
+        try:
+            return User.objects.get(pk=self._user_id)
+        except User.DoesNotExist as exc:
+            msg = _("User not found")
+            raise AuthenticationFailed(msg, code="user_not_found") from exc
+
+
+class LazyJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` without the per-request ``User`` query.
+
+    The active flag is checked through a short-lived cache and the request
+    user is a ``LazyTokenUser``. With ``CHECK_REVOKE_TOKEN`` enabled the
+    password hash is needed on every request, so the stock lookup is used.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError) as exc:
+            msg = _("Token contained no recognizable user identification")
+            raise InvalidToken(msg) from exc  # type: ignore[arg-type]
+
+        is_active = get_user_is_active(user_id)
+        if is_active is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return LazyTokenUser(user_id)
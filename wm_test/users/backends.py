@@ -0,0 +1,62 @@
+"""
+The one authentication backend, for Django's logins and allauth's.
+
+With ``ModelBackend`` and allauth's ``AuthenticationBackend`` both listed, a
+failed login ran through both: three user lookups and, for a known email,
+two Argon2 hashes. ``EmailBackend`` finds the candidate users in one query
+and hashes once, against ``dummy_password_hash`` when the email is unknown,
+so failures cost what a success does.
+"""
+
+from collections.abc import Sequence
+
+from allauth.account.auth_backends import AuthenticationBackend
+from allauth.account.models import EmailAddress
+from django.contrib.auth.hashers import check_password
+from django.db.models import Exists
+from django.db.models import OuterRef
+from django.db.models import Q
+
+from wm_test.users.hashers import dummy_password_hash
+from wm_test.users.models import User
+
+
+class EmailBackend(AuthenticationBackend):
+    """
+    Authenticate by email and password.
+
+    Users are matched like allauth does, by their email or any of their
+    ``EmailAddress`` rows, preferring users who verified the address.
+    Inactive users whose password matches are stashed for allauth's
+    account-inactive page, see ``AuthenticationBackend._stash_user``.
+    Permissions come from ``ModelBackend``.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        # allauth and simplejwt pass ``email``, the admin login ``username``.
+        email = kwargs.get(User.USERNAME_FIELD, username)
+        if not email or password is None:
+            return None
+        users = self.get_users(email)
+        if not users:
+            check_password(password, dummy_password_hash())
+            return None
+        for user in users:
+            if self._check_password(user, password):
+                return user
+        return None
+
+    def get_users(self, email: str) -> Sequence[User]:
+        # allauth stores addresses lowercased, users keep the case typed at
+        # signup.
+        lowered = email.lower()
+        addresses = EmailAddress.objects.filter(email=lowered)
+        users = list(
+            User.objects.filter(
+                Q(email__in={email, lowered}) | Q(pk__in=addresses.values("user_id")),
+            ).annotate(
+                verified=Exists(addresses.filter(user=OuterRef("pk"), verified=True)),
+            ),
+        )
+        verified = [user for user in users if user.verified]
+        return verified or users
@@ -0,0 +1,48 @@
+"""
+Argon2 with its cost taken from settings.
+
+``ARGON2_TIME_COST``, ``ARGON2_MEMORY_COST`` (KiB) and
+``ARGON2_PARALLELISM`` are picked for a latency target on the production
+hardware with ``manage.py calibrate_argon2``. Hashes made with other
+parameters still verify, and Django rehashes them with the current ones on
+the user's next successful login.
+"""
+
+import dataclasses
+from functools import cache
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.crypto import get_random_string
+
+COST_SETTINGS = {"ARGON2_TIME_COST", "ARGON2_MEMORY_COST", "ARGON2_PARALLELISM"}
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    def params(self):
+        # Read on every call, so overridden settings apply.
+        return dataclasses.replace(
+            super().params(),  # type: ignore[misc]
+            time_cost=settings.ARGON2_TIME_COST,
+            memory_cost=settings.ARGON2_MEMORY_COST,
+            parallelism=settings.ARGON2_PARALLELISM,
+        )
+
+
+@cache
+def dummy_password_hash() -> str:
+    """
+    A hash of a random password made by the preferred hasher.
+
+    Checking a password against it costs what checking a user's does, for
+    logins with an unknown email.
+    """
+    return hashers.make_password(get_random_string(32))
+
+
+@receiver(setting_changed)
+def reset_dummy_password_hash(*, setting, **kwargs):
+    if setting == "PASSWORD_HASHERS" or setting in COST_SETTINGS:
+        dummy_password_hash.cache_clear()
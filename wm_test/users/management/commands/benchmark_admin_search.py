@@ -0,0 +1,125 @@
+import statistics
+import time
+from contextlib import ExitStack
+from unittest import mock
+
+from django.contrib import admin
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db import transaction
+from django.test import override_settings
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from wm_test.users.models import User
+
+FIRST_NAMES = ["Ann", "Boris", "Chen", "Dana", "Emil", "Fatima", "Gustav", "Hana"]
+LAST_NAMES = ["Smith", "Ivanova", "Okafor", "Nguyen", "Schmidt", "Rossi", "Kowalski"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed --users users and time the user admin changelist, unfiltered and "
+        "searched by a rare name, a common name and an email, before (no "
+        "trigram index, COUNT(*) for the page links and the total) and after. "
+        "Seeded rows are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1_000_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    @override_settings(DEBUG=False)
+    def handle(self, *args, **options):
+        self.repeat = options["repeat"]
+        model_admin = admin.site._registry[User]  # noqa: SLF001
+        with transaction.atomic():
+            started = time.perf_counter()
+            self.seed(options["users"])
+            self.stdout.write(
+                f"Seeded {options['users']} users in "
+                f"{time.perf_counter() - started:.0f} s.",
+            )
+            superuser = User(email="bench-admin@example.com", is_superuser=True)
+            superuser.is_staff = True
+            superuser.save()
+            searches = {
+                "changelist": {},
+                "rare name": {"q": self.rare_name()},
+                "common name": {"q": "smith"},
+                "email": {"q": "user123456@"},
+            }
+            self.stdout.write(
+                f"{'configuration':<13} {'page':<12} {'ms':>8} {'queries':>7} "
+                f"{'COUNT(*)':>8}",
+            )
+            for name in ("before", "after"):
+                with ExitStack() as stack, transaction.atomic():
+                    if name == "before":
+                        for attribute, value in (
+                            ("paginator", Paginator),
+                            ("show_full_result_count", True),
+                        ):
+                            stack.enter_context(
+                                mock.patch.object(model_admin, attribute, value),
+                            )
+                        with connection.cursor() as cursor:
+                            cursor.execute("DROP INDEX users_user_search_trgm_idx")
+                    for page, params in searches.items():
+                        self.run(name, page, model_admin, superuser, params)
+                    transaction.set_rollback(True)
+            transaction.set_rollback(True)
+
+    def seed(self, size):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO users_user (
+                    password, is_superuser, is_staff, is_active, date_joined,
+                    name, email
+                )
+                SELECT
+                    '!', false, false, true, now() - i * interval '1 minute',
+                    (%s::text[])[1 + i %% %s] || ' '
+                    || (%s::text[])[1 + i / %s %% %s] || ' '
+                    || substr(md5(i::text), 1, 8),
+                    'user' || i || '@example.com'
+                FROM generate_series(1, %s) AS i
+                """,
+                [
+                    FIRST_NAMES,
+                    len(FIRST_NAMES),
+                    LAST_NAMES,
+                    len(FIRST_NAMES),
+                    len(LAST_NAMES),
+                    size,
+                ],
+            )
+            cursor.execute("ANALYZE users_user")
+
+    def rare_name(self):
+        name = (
+            User.objects.filter(email="user4242@example.com")
+            .values_list("name", flat=True)
+            .first()
+        )
+        return name.split()[-1] if name else "unknown"
+
+    def run(self, name, page, model_admin, superuser, params):
+        samples = []
+        for _ in range(self.repeat):
+            request = RequestFactory().get("/admin/users/user/", params)
+            request.user = superuser
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                model_admin.changelist_view(request).render()
+                samples.append((time.perf_counter() - started) * 1000)
+        counts = sum(
+            "COUNT(*)" in query["sql"] and "LIMIT" not in query["sql"]
+            for query in queries
+        )
+        self.stdout.write(
+            f"{name:<13} {page:<12} {statistics.median(samples):>8.1f} "
+            f"{len(queries):>7} {counts:>8}",
+        )
@@ -0,0 +1,79 @@
+import statistics
+import time
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from wm_test.users.api.views import UserViewSet
+from wm_test.users.authentication import LazyJWTAuthentication
+from wm_test.users.tests.factories import UserFactory
+
+AUTHENTICATION_CLASSES = {
+    "JWTAuthentication": JWTAuthentication,
+    "LazyJWTAuthentication": LazyJWTAuthentication,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay authenticated GET /api/users/ requests through UserViewSet with "
+        "each JWT authentication class and report queries per request and "
+        "latency percentiles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+
+    @override_settings(
+        ALLOWED_HOSTS=["testserver"],
+        PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    )
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = UserFactory()
+            token = AccessToken.for_user(user)
+            self.stdout.write(
+                f"{'authentication':<24} {'queries/req':>11} "
+                f"{'p50 ms':>8} {'p99 ms':>8}",
+            )
+            for name, authentication_class in AUTHENTICATION_CLASSES.items():
+                queries, samples = self.run(
+                    authentication_class,
+                    token,
+                    options["requests"],
+                )
+                percentiles = statistics.quantiles(samples, n=100)
+                self.stdout.write(
+                    f"{name:<24} {queries:>11.2f} "
+                    f"{percentiles[49]:>8.3f} {percentiles[98]:>8.3f}",
+                )
+            transaction.set_rollback(True)
+
+    def run(self, authentication_class, token, count):
+        cache.clear()
+        view = async_to_sync(
+            UserViewSet.as_view(
+                {"get": "list"},
+                authentication_classes=[authentication_class],
+            ),
+        )
+        factory = APIRequestFactory()
+        samples = []
+        with CaptureQueriesContext(connection) as context:
+            for _ in range(count):
+                request = factory.get(
+                    "/api/users/",
+                    HTTP_AUTHORIZATION=f"Bearer {token}",
+                )
+                started = time.perf_counter()
+                view(request).render()
+                samples.append((time.perf_counter() - started) * 1000)
+        return len(context.captured_queries) / count, samples
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from wm_test.users.models import User
+from wm_test.utils.loadtest import Load
+from wm_test.utils.loadtest import serve
+
+SERVERS = {
+    "wsgi": ["config.wsgi"],
+    "asgi": ["config.asgi", "--worker-class", "uvicorn_worker.UvicornWorker"],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Start gunicorn with sync workers on config.wsgi and with uvicorn "
+        "workers on config.asgi, then load GET /api/users/me/ over real "
+        "sockets. Reports throughput and latency, and whether a request is "
+        "still served while --idle connections sit half sent, the way slow "
+        "clients and long polls hold them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument("--idle", type=int, default=50)
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=5.0,
+            help="Seconds a request may take before it counts as not served.",
+        )
+        parser.add_argument(
+            "--servers",
+            nargs="+",
+            choices=list(SERVERS),
+            default=list(SERVERS),
+        )
+
+    def handle(self, *args, **options):
+        # The servers run in their own processes, the user must be committed.
+        user = User.objects.create_user(
+            email=f"bench-asgi-{os.getpid()}@example.com",
+            password=None,
+        )
+        try:
+            token = str(AccessToken.for_user(user))
+            self.stdout.write(
+                f"{'server':<6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+                f"{'errors':>6}  with {options['idle']} idle connections",
+            )
+            for name in options["servers"]:
+                self.compare(name, token, options)
+        finally:
+            user.delete()
+
+    def compare(self, name, token, options):
+        def command(port):
+            return [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                *SERVERS[name],
+                f"--bind=127.0.0.1:{port}",
+                f"--workers={options['workers']}",
+                "--timeout=120",
+            ]
+
+        with serve(command) as (port, _):
+            load = Load(port, reverse("api:user-me"), token, options["timeout"])
+            probe = asyncio.run(self.run(load, options))
+
+        p50, p95 = load.percentiles
+        probe = (
+            f"served in {probe:.1f} ms"
+            if probe is not None
+            else f"not served within {options['timeout']:.0f}s"
+        )
+        self.stdout.write(
+            f"{name:<6} {load.requests_per_second:>8.0f} {p50:>8.2f} {p95:>8.2f} "
+            f"{load.errors:>6}  {probe}",
+        )
+
+    async def run(self, load, options):
+        # Imports, connections and the cached payload.
+        await load.warm_up(options["workers"] * 2)
+        await load.run(options["requests"], options["concurrency"])
+
+        idle = [await load.open_idle() for _ in range(options["idle"])]
+        # Give the server time to accept them before probing.
+        await asyncio.sleep(0.5)
+        started = time.perf_counter()
+        served = await load.fetch()
+        elapsed = (time.perf_counter() - started) * 1000
+        for writer in idle:
+            writer.close()
+        return elapsed if served else None
@@ -0,0 +1,107 @@
+import statistics
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.templatetags.static import static
+from django.test import override_settings
+
+from wm_test.utils.loadtest import serve
+
+CONFIG = str(Path(settings.BASE_DIR) / "config" / "gunicorn.conf.py")
+
+STORAGE_BACKENDS = {
+    # What config/settings/production.py used before.
+    "serial": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    "parallel": "wm_test.utils.storage.ParallelCompressedManifestStaticFilesStorage",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Time collectstatic with the production storage into an empty "
+        "STATIC_ROOT, compressing serially and in parallel, and the time from "
+        "starting gunicorn to its first response, then compare the cold start "
+        "of a container running collectstatic in its start script with one "
+        "whose image already holds the collected files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=3)
+
+    def handle(self, *args, **options):
+        collect = {
+            name: self.collectstatic(backend, options["runs"])
+            for name, backend in STORAGE_BACKENDS.items()
+        }
+        boot = self.boot(options["runs"])
+
+        self.stdout.write(
+            f"{'configuration':<34} {'collectstatic s':>15} {'boot s':>7} "
+            f"{'cold start s':>12}",
+        )
+        rows = [
+            (f"collectstatic in start ({name})", seconds)
+            for name, seconds in collect.items()
+        ]
+        rows.append(("collectstatic in image build", 0.0))
+        for name, seconds in rows:
+            self.stdout.write(
+                f"{name:<34} {seconds:>15.2f} {boot:>7.2f} {seconds + boot:>12.2f}",
+            )
+
+    def collectstatic(self, backend, runs):
+        """Return the median time to collect, hash and compress every file."""
+        timings = []
+        for _ in range(runs):
+            with (
+                tempfile.TemporaryDirectory() as root,
+                override_settings(
+                    STATIC_ROOT=root,
+                    STORAGES={
+                        **settings.STORAGES,
+                        "staticfiles": {"BACKEND": backend},
+                    },
+                    WHITENOISE_KEEP_ONLY_HASHED_FILES=True,
+                ),
+            ):
+                started = time.perf_counter()
+                call_command("collectstatic", interactive=False, verbosity=0)
+                timings.append(time.perf_counter() - started)
+                files = sum(1 for path in Path(root).rglob("*") if path.is_file())
+        self.stdout.write(
+            f"{backend}: {files} files, runs {', '.join(f'{t:.2f}' for t in timings)}",
+        )
+        return statistics.median(timings)
+
+    def boot(self, runs):
+        """Return the median time from exec'ing gunicorn to a served file."""
+        path = static("css/project.css")
+
+        def command(port):
+            return [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                "config.wsgi",
+                "--config",
+                CONFIG,
+                f"--bind=127.0.0.1:{port}",
+                "--access-logfile=/dev/null",
+            ]
+
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            with serve(command) as (port, _process):
+                with urllib.request.urlopen(
+                    f"http://127.0.0.1:{port}{path}",
+                ) as response:
+                    response.read()
+                timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
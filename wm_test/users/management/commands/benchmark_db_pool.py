@@ -0,0 +1,124 @@
+import asyncio
+import os
+import statistics
+import sys
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from wm_test.users.models import User
+from wm_test.utils.loadtest import Load
+from wm_test.utils.loadtest import serve
+
+CONFIG = str(Path(settings.BASE_DIR) / "config" / "gunicorn.conf.py")
+
+CONFIGURATIONS = {
+    "connect per request": {"CONN_MAX_AGE": "0"},
+    "persistent": {"CONN_MAX_AGE": "60"},
+    "pool": {"DJANGO_DB_POOL": "true", "DJANGO_DB_POOL_MIN_SIZE": "1"},
+}
+
+
+class ConnectionSampler(threading.Thread):
+    """Count the client connections to the database while the load runs."""
+
+    def __init__(self, interval: float = 0.05):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.counts: list[int] = []
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            with connection.cursor() as cursor:
+                while not self.stopped.wait(self.interval):
+                    cursor.execute(
+                        "SELECT count(*) FROM pg_stat_activity "
+                        "WHERE datname = current_database() "
+                        "AND backend_type = 'client backend' "
+                        "AND pid <> pg_backend_pid()",
+                    )
+                    self.counts.append(cursor.fetchone()[0])
+        finally:
+            connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Start gunicorn with 8, 16 and 32 workers connecting per request, "
+        "keeping persistent connections and drawing from a connection pool, "
+        "load GET /api/cats/ over real sockets, and report the Postgres "
+        "connections held and the latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, nargs="+", default=[8, 16, 32])
+        parser.add_argument("--threads", type=int, default=2)
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, default=32)
+
+    def handle(self, *args, **options):
+        # The servers run in their own processes, the user must be committed.
+        user = User.objects.create_user(
+            email=f"bench-db-pool-{os.getpid()}@example.com",
+            password=None,
+        )
+        try:
+            token = str(AccessToken.for_user(user))
+            self.stdout.write(
+                f"{'configuration':<20} {'workers':>7} {'req/s':>7} "
+                f"{'p50 ms':>8} {'p95 ms':>8} {'errors':>6} "
+                f"{'conns avg':>9} {'conns max':>9}",
+            )
+            for workers in options["workers"]:
+                for name, env in CONFIGURATIONS.items():
+                    self.run(name, workers, env, token, options)
+        finally:
+            user.delete()
+
+    def run(self, name, workers, env, token, options):
+        def command(port):
+            return [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                "config.wsgi",
+                "--config",
+                CONFIG,
+                f"--bind=127.0.0.1:{port}",
+                "--access-logfile=/dev/null",
+            ]
+
+        env = {
+            **env,
+            "WEB_CONCURRENCY": str(workers),
+            "GUNICORN_THREADS": str(options["threads"]),
+            "DJANGO_DB_POOL_MAX_SIZE": str(options["threads"]),
+        }
+        with serve(command, env=env, timeout=120) as (port, _):
+            load = Load(port, reverse("api:cat-list"), token)
+            sampler = ConnectionSampler()
+            sampler.start()
+            try:
+                asyncio.run(self.load(load, workers, options))
+            finally:
+                sampler.stopped.set()
+                sampler.join()
+
+        p50, p95 = load.percentiles
+        counts = sampler.counts or [0]
+        self.stdout.write(
+            f"{name:<20} {workers:>7} {load.requests_per_second:>7.0f} "
+            f"{p50:>8.2f} {p95:>8.2f} {load.errors:>6} "
+            f"{statistics.mean(counts):>9.1f} {max(counts):>9}",
+        )
+
+    async def load(self, load, workers, options):
+        # Enough to reach every worker before measuring.
+        await load.warm_up(workers * 2)
+        await load.run(options["requests"], options["concurrency"])
@@ -0,0 +1,100 @@
+import logging
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.http import HttpResponseServerError
+from django.test import Client
+from django.test import override_settings
+from django.urls import path
+from django.utils.log import AdminEmailHandler
+
+from wm_test.utils.error_reports import ErrorReportHandler
+from wm_test.utils.loadtest import smtp_server
+
+SMTP_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+
+
+def failing_view(request, site):
+    # Three different tracebacks, so three fingerprints.
+    if site == 0:
+        raise ValueError(site)
+    if site == 1:
+        raise KeyError(site)
+    msg = f"Failure {site}"
+    raise RuntimeError(msg)
+
+
+def server_error(request):
+    return HttpResponseServerError()
+
+
+# The command serves itself as the URLconf, without the site's 500 page that
+# links to views not routed here.
+urlpatterns = [path("fail/<int:site>/", failing_view)]
+handler500 = server_error
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve a burst of 500s through the test client with the errors "
+        "mailed by Django's AdminEmailHandler inside the request and by the "
+        "queued, deduplicated ErrorReportHandler, against a local aiosmtpd "
+        "server that takes --smtp-delay-ms to accept each message. Reports "
+        "request latency and the mails the burst sent."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=300)
+        parser.add_argument("--smtp-delay-ms", type=float, default=50.0)
+
+    @override_settings(
+        ALLOWED_HOSTS=["testserver"],
+        DEBUG=False,
+        ROOT_URLCONF=__name__,
+        ADMINS=[("Admin", "admin@example.com")],
+        EMAIL_BACKEND=SMTP_BACKEND,
+    )
+    def handle(self, *args, **options):
+        logger = logging.getLogger("django.request")
+        handlers, propagate = logger.handlers, logger.propagate
+        logger.propagate = False
+        with smtp_server(options["smtp_delay_ms"] / 1000) as (port, recorder):
+            self.stdout.write(
+                f"{'handler':<20} {'p50 ms':>7} {'p95 ms':>7} {'max ms':>7} "
+                f"{'mails':>6} {'drain s':>8}",
+            )
+            with override_settings(
+                EMAIL_HOST="127.0.0.1",
+                EMAIL_PORT=port,
+                EMAIL_USE_TLS=False,
+                EMAIL_USE_SSL=False,
+            ):
+                try:
+                    for name, handler in [
+                        ("AdminEmailHandler", AdminEmailHandler()),
+                        ("ErrorReportHandler", ErrorReportHandler(interval=0.1)),
+                    ]:
+                        logger.handlers = [handler]
+                        self.run(name, handler, recorder, options["requests"])
+                finally:
+                    logger.handlers, logger.propagate = handlers, propagate
+
+    def run(self, name, handler, recorder, requests):
+        received = len(recorder.envelopes)
+        client = Client(raise_request_exception=False)
+        samples = []
+        for index in range(requests):
+            started = time.perf_counter()
+            client.get(f"/fail/{index % 3}/")
+            samples.append((time.perf_counter() - started) * 1000)
+        # Closing waits for the queued reports and sends the digests.
+        started = time.perf_counter()
+        handler.close()
+        drain = time.perf_counter() - started
+        percentiles = statistics.quantiles(samples, n=100)
+        self.stdout.write(
+            f"{name:<20} {percentiles[49]:>7.1f} {percentiles[94]:>7.1f} "
+            f"{max(samples):>7.1f} {len(recorder.envelopes) - received:>6} "
+            f"{drain:>8.2f}",
+        )
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from wm_test.users.models import User
+from wm_test.utils.loadtest import Load
+from wm_test.utils.loadtest import child_pids
+from wm_test.utils.loadtest import memory_kib
+from wm_test.utils.loadtest import serve
+
+CONFIG = str(Path(settings.BASE_DIR) / "config" / "gunicorn.conf.py")
+
+CONFIGURATIONS = {
+    # What compose/production/django/start ran before config/gunicorn.conf.py.
+    "bind only": ([], {}),
+    "gunicorn.conf.py": (["--config", CONFIG], {}),
+    "without preload": (["--config", CONFIG], {"GUNICORN_PRELOAD": "false"}),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Start gunicorn on config.wsgi with the old bind-only command line and "
+        "with config/gunicorn.conf.py, load GET /api/users/me/ over real "
+        "sockets, and report requests/sec, latency and memory per worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, default=20)
+
+    def handle(self, *args, **options):
+        # The servers run in their own processes, the user must be committed.
+        user = User.objects.create_user(
+            email=f"bench-gunicorn-{os.getpid()}@example.com",
+            password=None,
+        )
+        try:
+            token = str(AccessToken.for_user(user))
+            self.stdout.write(
+                f"{'configuration':<18} {'workers':>7} {'req/s':>7} "
+                f"{'p50 ms':>8} {'p95 ms':>8} {'RSS/worker':>11} "
+                f"{'PSS/worker':>11} {'PSS total':>10}",
+            )
+            for name, (arguments, env) in CONFIGURATIONS.items():
+                self.run(name, arguments, env, token, options)
+        finally:
+            user.delete()
+
+    def run(self, name, arguments, env, token, options):
+        def command(port):
+            return [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                "config.wsgi",
+                *arguments,
+                f"--bind=127.0.0.1:{port}",
+                "--access-logfile=/dev/null",
+            ]
+
+        with (
+            tempfile.TemporaryDirectory() as stats_dir,
+            serve(command, env={**env, "GUNICORN_STATS_DIR": stats_dir}) as (
+                port,
+                process,
+            ),
+        ):
+            load = Load(port, reverse("api:user-me"), token)
+            asyncio.run(self.load(load, options))
+            workers = child_pids(process.pid)
+            memory = [memory_kib(pid) for pid in workers]
+            stats = [
+                json.loads(path.read_text())
+                for path in Path(stats_dir).glob("worker-*.json")
+            ]
+
+        p50, p95 = load.percentiles
+        rss = statistics.mean(item["rss"] for item in memory) / 1024
+        pss = [item["pss"] / 1024 for item in memory]
+        self.stdout.write(
+            f"{name:<18} {len(workers):>7} {load.requests_per_second:>7.0f} "
+            f"{p50:>8.2f} {p95:>8.2f} {rss:>8.1f} MiB "
+            f"{statistics.mean(pss):>8.1f} MiB {sum(pss):>7.1f} MiB",
+        )
+        if stats:
+            handled = ", ".join(
+                f"{item['pid']}: {item['requests']}/{item['max_requests']}"
+                for item in sorted(stats, key=lambda item: item["pid"])
+            )
+            self.stdout.write(f"{'':<18} worker stats, requests/max: {handled}")
+
+    async def load(self, load, options):
+        await load.warm_up(10)
+        await load.run(options["requests"], options["concurrency"])
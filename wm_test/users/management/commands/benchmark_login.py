@@ -0,0 +1,87 @@
+import time
+from contextlib import ExitStack
+from unittest import mock
+
+from django.contrib.auth import authenticate
+from django.contrib.auth import hashers
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.test import override_settings
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from wm_test.users.hashers import dummy_password_hash
+from wm_test.users.tests.factories import UserFactory
+
+CONFIGURATIONS = {
+    "ModelBackend + allauth": [
+        "django.contrib.auth.backends.ModelBackend",
+        "allauth.account.auth_backends.AuthenticationBackend",
+    ],
+    "EmailBackend": ["wm_test.users.backends.EmailBackend"],
+}
+PASSWORD = "correct horse battery staple"  # noqa: S105
+
+
+class Command(BaseCommand):
+    help = (
+        "Log in with django.contrib.auth.authenticate() through the former "
+        "ModelBackend + allauth backends and through EmailBackend, with the "
+        "right password, a wrong one, an unknown email and the email typed "
+        "in another case. Reports CPU per login (Argon2 threads included), "
+        "logins/sec per core, queries and Argon2 hashes per login."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=20)
+
+    def handle(self, *args, **options):
+        hashes = [0]
+        argon2 = hashers.Argon2PasswordHasher
+
+        def counted(method):
+            def wrapper(*args, **kwargs):
+                hashes[0] += 1
+                return method(*args, **kwargs)
+
+            return wrapper
+
+        with ExitStack() as stack, transaction.atomic():
+            for name in ("encode", "verify"):
+                stack.enter_context(
+                    mock.patch.object(argon2, name, counted(getattr(argon2, name))),
+                )
+            user = UserFactory(email="login@example.com", password=PASSWORD)
+            scenarios = {
+                "right password": (user.email, PASSWORD),
+                "wrong password": (user.email, "wrong"),
+                "unknown email": ("nobody@example.com", PASSWORD),
+                "email in capitals": (user.email.upper(), PASSWORD),
+            }
+            # Made once per process, not per login.
+            dummy_password_hash()
+            self.stdout.write(
+                f"{'backends':<22} {'login':<17} {'CPU ms':>7} "
+                f"{'logins/s/core':>13} {'queries':>7} {'hashes':>6}",
+            )
+            for name, backends in CONFIGURATIONS.items():
+                with override_settings(AUTHENTICATION_BACKENDS=backends):
+                    for scenario, credentials in scenarios.items():
+                        self.run(name, scenario, credentials, hashes, options)
+            transaction.set_rollback(True)
+
+    def run(self, name, scenario, credentials, hashes, options):
+        email, password = credentials
+        request = RequestFactory().post("/accounts/login/")
+        logins = options["logins"]
+        hashes[0] = 0
+        with CaptureQueriesContext(connection) as queries:
+            started = time.process_time()
+            for _ in range(logins):
+                authenticate(request, email=email, password=password)
+            cpu = (time.process_time() - started) / logins
+        self.stdout.write(
+            f"{name:<22} {scenario:<17} {cpu * 1000:>7.1f} {1 / cpu:>13.1f} "
+            f"{len(queries) / logins:>7.1f} {hashes[0] / logins:>6.1f}",
+        )
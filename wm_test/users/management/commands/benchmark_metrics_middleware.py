@@ -0,0 +1,99 @@
+import statistics
+import time
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve
+from django.urls import reverse
+
+from wm_test.utils import cache
+from wm_test.utils.metrics import MetricsMiddleware
+from wm_test.utils.metrics import RequestMetrics
+from wm_test.utils.metrics import count_query
+from wm_test.utils.metrics import current_request
+from wm_test.utils.metrics import registry
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure what the metrics middleware adds to a request: the "
+        "middleware itself around a no-op view, the query execute wrapper "
+        "and the instrumented cache lookups, each against the bare call."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20_000)
+        parser.add_argument("--repeat", type=int, default=7)
+        parser.add_argument(
+            "--queries",
+            type=int,
+            default=5,
+            help="Queries in the typical request the total is reported for.",
+        )
+        parser.add_argument(
+            "--cache-lookups",
+            type=int,
+            default=3,
+            help="Cache lookups in the typical request the total is reported for.",
+        )
+
+    def handle(self, *args, **options):
+        self.iterations = options["iterations"]
+        self.repeat = options["repeat"]
+        request = RequestFactory().get(reverse("api:user-me"))
+        request.resolver_match = resolve(request.path)
+        response = HttpResponse(b'{"name": "benchmark"}')
+
+        def view(request):
+            return response
+
+        middleware = MetricsMiddleware(view)
+        middleware_cost = self.compare(
+            lambda: view(request), lambda: middleware(request)
+        )
+
+        def execute(sql, params, many, context):
+            return None
+
+        token = current_request.set(RequestMetrics())
+        query_cost = self.compare(
+            lambda: execute("SELECT 1", (), False, {}),  # noqa: FBT003
+            lambda: count_query(execute, "SELECT 1", (), False, {}),  # noqa: FBT003
+        )
+        plain = LocMemCache("benchmark-plain", {})
+        instrumented = cache.LocMemCache("benchmark-instrumented", {})
+        plain.set("key", 1)
+        instrumented.set("key", 1)
+        cache_cost = self.compare(
+            lambda: plain.get("key"),
+            lambda: instrumented.get("key"),
+        )
+        current_request.reset(token)
+        registry.clear()
+
+        total = (
+            middleware_cost
+            + options["queries"] * query_cost
+            + options["cache_lookups"] * cache_cost
+        )
+        self.stdout.write(f"middleware per request    {middleware_cost:>7.2f} µs")
+        self.stdout.write(f"execute wrapper per query {query_cost:>7.2f} µs")
+        self.stdout.write(f"cache per lookup          {cache_cost:>7.2f} µs")
+        self.stdout.write(
+            f"request with {options['queries']} queries and "
+            f"{options['cache_lookups']} cache lookups: {total:.2f} µs",
+        )
+
+    def compare(self, bare, instrumented) -> float:
+        """Return the median extra µs per call of ``instrumented``."""
+        return statistics.median(
+            self.time(instrumented) - self.time(bare) for _ in range(self.repeat)
+        )
+
+    def time(self, function) -> float:
+        started = time.perf_counter()
+        for _ in range(self.iterations):
+            function()
+        return (time.perf_counter() - started) / self.iterations * 1e6
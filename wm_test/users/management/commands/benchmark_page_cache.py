@@ -0,0 +1,83 @@
+import statistics
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test import override_settings
+from django.urls import reverse
+
+UNCACHED_LOADERS = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+CACHED_LOADERS = [("django.template.loaders.cached.Loader", UNCACHED_LOADERS)]
+DUMMY_CACHE = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+LOCMEM_CACHE = {
+    "default": {"BACKEND": "wm_test.utils.cache.LocMemCache", "LOCATION": "pages"},
+}
+
+# Each step adds one layer: (loaders, caches, page cache timeout).
+CONFIGURATIONS = {
+    "no caching": (UNCACHED_LOADERS, DUMMY_CACHE, 0),
+    "cached loaders": (CACHED_LOADERS, DUMMY_CACHE, 0),
+    "+ navbar fragment": (CACHED_LOADERS, LOCMEM_CACHE, 0),
+    "+ full page": (CACHED_LOADERS, LOCMEM_CACHE, 600),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Request the home and about pages as an anonymous visitor through "
+        "the whole middleware stack, adding cached template loaders, the "
+        "navbar fragment cache and the full-page cache one at a time, and "
+        "report the time per request and requests/sec."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+
+    # The test client sends "testserver". Without DEBUG, the debug toolbar
+    # stays off, its Docker host lookup alone can take seconds.
+    @override_settings(ALLOWED_HOSTS=["testserver"], DEBUG=False)
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'configuration':<18} {'page':<6} {'p50 ms':>7} {'p95 ms':>7} "
+            f"{'req/s':>7}",
+        )
+        template: dict[str, Any] = settings.TEMPLATES[0]
+        for name, (loaders, caches, timeout) in CONFIGURATIONS.items():
+            templates = [
+                {
+                    **template,
+                    "APP_DIRS": False,
+                    "OPTIONS": {**template["OPTIONS"], "loaders": loaders},
+                },
+            ]
+            with override_settings(
+                TEMPLATES=templates,
+                CACHES=caches,
+                PAGE_CACHE_TIMEOUT=timeout,
+            ):
+                cache.clear()
+                for page in ("home", "about"):
+                    self.measure(name, page, options["requests"])
+
+    def measure(self, name, page, requests):
+        client = Client()
+        url = reverse(page)
+        client.get(url)
+        samples = []
+        started = time.perf_counter()
+        for _ in range(requests):
+            request_started = time.perf_counter()
+            client.get(url)
+            samples.append((time.perf_counter() - request_started) * 1000)
+        elapsed = time.perf_counter() - started
+        quantiles = statistics.quantiles(samples, n=20)
+        self.stdout.write(
+            f"{name:<18} {page:<6} {quantiles[9]:>7.3f} {quantiles[18]:>7.3f} "
+            f"{requests / elapsed:>7.0f}",
+        )
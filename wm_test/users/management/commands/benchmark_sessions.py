@@ -0,0 +1,76 @@
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.test import Client
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from wm_test.users.tests.factories import UserFactory
+
+ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "wm_test.utils.sessions",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Count the database queries and session reads and writes of "
+        "authenticated page views with the database and the cached session "
+        "engines. The seeded user is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=50)
+
+    # The test client sends "testserver", and no debug toolbar on its pages.
+    @override_settings(ALLOWED_HOSTS=["testserver"], INTERNAL_IPS=[])
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'engine':<10} {'page':<22} {'queries':>7} {'session':>7} "
+            f"{'saves':>5} {'ms':>6}",
+        )
+        for name, engine in ENGINES.items():
+            with transaction.atomic(), override_settings(SESSION_ENGINE=engine):
+                cache.clear()
+                user = UserFactory()
+                client = Client()
+                client.force_login(user)
+                pages = {
+                    "home": reverse("home"),
+                    "about": reverse("about"),
+                    "users:detail": reverse("users:detail", kwargs={"pk": user.pk}),
+                    "users:update": reverse("users:update"),
+                    "account_email": reverse("account_email"),
+                }
+                for page, url in pages.items():
+                    self.measure(name, page, client, url, options["repeat"])
+                transaction.set_rollback(True)
+        cache.clear()
+
+    def measure(self, name, page, client, url, repeat):
+        queries, session, saves, samples = [], [], [], []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                client.get(url)
+                samples.append((time.perf_counter() - started) * 1000)
+            statements = [
+                query["sql"]
+                for query in captured
+                if not query["sql"].startswith(("SAVEPOINT", "RELEASE SAVEPOINT"))
+            ]
+            touching = [sql for sql in statements if '"django_session"' in sql]
+            queries.append(len(statements))
+            session.append(len(touching))
+            saves.append(sum(sql.startswith(("INSERT", "UPDATE")) for sql in touching))
+        self.stdout.write(
+            f"{name:<10} {page:<22} {statistics.mean(queries):>7.2f} "
+            f"{statistics.mean(session):>7.2f} {sum(saves):>5} "
+            f"{statistics.median(samples):>6.2f}",
+        )
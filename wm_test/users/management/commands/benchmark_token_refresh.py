@@ -0,0 +1,135 @@
+import statistics
+import time
+from contextlib import ExitStack
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.views import TokenRefreshView
+
+from wm_test.users import tokens
+from wm_test.users.api.serializers import TokenRefreshSerializer as RedisSerializer
+from wm_test.users.tests.factories import UserFactory
+from wm_test.utils.redis_client import get_redis
+
+# name -> (serializer, the Bloom filter answers "maybe" for every token)
+CONFIGURATIONS = {
+    "no blacklist": (TokenRefreshSerializer, False),
+    "Redis, no filter": (RedisSerializer, True),
+    "Redis + Bloom filter": (RedisSerializer, False),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Rotate refresh tokens through POST /api/token/refresh/ without a "
+        "blacklist, with the Redis blacklist checked on every refresh and "
+        "with the Bloom filter in front of it. Reports refreshes/sec, "
+        "latency and Redis round trips per refresh. Uses fakeredis unless "
+        "--redis-url is given, --rtt-ms adds a simulated network round trip."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--refreshes", type=int, default=2000)
+        parser.add_argument("--rtt-ms", type=float, default=0.0)
+        parser.add_argument(
+            "--redis-url",
+            help="Benchmark against a real Redis, blacklist keys are left to expire.",
+        )
+
+    @override_settings(
+        PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    )
+    def handle(self, *args, **options):
+        with ExitStack() as stack:
+            if options["redis_url"]:
+                stack.enter_context(override_settings(REDIS_URL=options["redis_url"]))
+            else:
+                import fakeredis
+
+                client = fakeredis.FakeRedis()
+                stack.enter_context(
+                    mock.patch("redis.Redis.from_url", return_value=client),
+                )
+            get_redis.cache_clear()
+            stack.callback(get_redis.cache_clear)
+
+            round_trips = self.count_round_trips(stack, options["rtt_ms"] / 1000)
+            with transaction.atomic():
+                user = UserFactory()
+                self.stdout.write(
+                    f"{'configuration':<22} {'refreshes/s':>11} {'p50 ms':>7} "
+                    f"{'p95 ms':>7} {'Redis trips':>11}",
+                )
+                for name, (serializer_class, always_maybe) in CONFIGURATIONS.items():
+                    with ExitStack() as configuration:
+                        if always_maybe:
+                            configuration.enter_context(
+                                mock.patch.object(
+                                    tokens.BlacklistFilter,
+                                    "__contains__",
+                                    return_value=True,
+                                ),
+                            )
+                        self.run(name, serializer_class, user, round_trips, options)
+                transaction.set_rollback(True)
+
+    def count_round_trips(self, stack, rtt):
+        """Count, and delay by ``rtt``, every command or pipeline sent."""
+        round_trips = [0]
+        client = get_redis()
+
+        def sent(method):
+            def wrapper(*args, **kwargs):
+                round_trips[0] += 1
+                if rtt:
+                    time.sleep(rtt)
+                return method(*args, **kwargs)
+
+            return wrapper
+
+        stack.enter_context(
+            mock.patch.object(
+                client,
+                "execute_command",
+                sent(client.execute_command),
+            ),
+        )
+        pipeline_class = type(client.pipeline())
+        stack.enter_context(
+            mock.patch.object(
+                pipeline_class,
+                "execute",
+                sent(pipeline_class.execute),
+            ),
+        )
+        return round_trips
+
+    def run(self, name, serializer_class, user, round_trips, options):
+        tokens._filters.clear()  # noqa: SLF001
+        view = TokenRefreshView.as_view(serializer_class=serializer_class)
+        factory = APIRequestFactory()
+        refresh = str(tokens.RefreshToken.for_user(user))
+        samples = []
+        round_trips[0] = 0
+        started = time.perf_counter()
+        for _ in range(options["refreshes"]):
+            request = factory.post(
+                "/api/token/refresh/",
+                {"refresh": refresh},
+                format="json",
+            )
+            began = time.perf_counter()
+            response = view(request)
+            samples.append((time.perf_counter() - began) * 1000)
+            refresh = response.data["refresh"]
+        elapsed = time.perf_counter() - started
+        percentiles = statistics.quantiles(samples, n=100)
+        self.stdout.write(
+            f"{name:<22} {options['refreshes'] / elapsed:>11.0f} "
+            f"{percentiles[49]:>7.3f} {percentiles[94]:>7.3f} "
+            f"{round_trips[0] / options['refreshes']:>11.2f}",
+        )
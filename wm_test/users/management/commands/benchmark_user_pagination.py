@@ -0,0 +1,124 @@
+import statistics
+import time
+from datetime import timedelta
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.pagination import Cursor
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from wm_test.users.api.pagination import UserCursorPagination
+from wm_test.users.models import User
+from wm_test.users.tests.factories import UserFactory
+
+# Synthetic users only need *a* password, skip the expensive hasher.
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare offset and keyset (cursor) pagination latency for the users "
+        "list at several table sizes. Seeded rows are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[10_000, 100_000, 1_000_000],
+            help="Table sizes to benchmark.",
+        )
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    # Requests are built with APIRequestFactory and carry its "testserver" host.
+    @override_settings(ALLOWED_HOSTS=["testserver"])
+    def handle(self, *args, **options):
+        self.page_size = options["page_size"]
+        self.repeat = options["repeat"]
+        self.stdout.write(
+            f"{'users':>10} {'depth':>7} {'offset ms':>10} {'cursor ms':>10}",
+        )
+        for size in options["sizes"]:
+            with transaction.atomic():
+                self.seed(size, options["batch_size"])
+                self.measure(size)
+                transaction.set_rollback(True)
+
+    @override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+    def seed(self, size, batch_size):
+        now = timezone.now()
+        for start in range(0, size, batch_size):
+            users = [
+                UserFactory.build(
+                    email=f"bench-{index}@example.com",
+                    # Every 10 users share a timestamp so the id tie-breaker
+                    # is exercised as well.
+                    date_joined=now - timedelta(seconds=index // 10),
+                )
+                for index in range(start, min(start + batch_size, size))
+            ]
+            User.objects.bulk_create(users, batch_size=batch_size)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {User._meta.db_table}")  # noqa: SLF001
+
+    def measure(self, size):
+        total = User.objects.count()
+        for fraction in (0, 0.1, 0.5, 0.99):
+            offset = int(total * fraction)
+            offset_ms = self.time(lambda offset=offset: self.offset_page(offset))
+            cursor = self.cursor_for(offset)
+            cursor_ms = self.time(lambda cursor=cursor: self.cursor_page(cursor))
+            self.stdout.write(
+                f"{size:>10} {fraction:>7.0%} {offset_ms:>10.2f} {cursor_ms:>10.2f}",
+            )
+
+    def time(self, func):
+        samples = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples)
+
+    def request(self, **params):
+        return Request(APIRequestFactory().get("/api/users/", params))
+
+    def offset_page(self, offset):
+        paginator = LimitOffsetPagination()
+        return paginator.paginate_queryset(
+            User.objects.order_by("-date_joined", "-id"),
+            self.request(limit=self.page_size, offset=offset),
+        )
+
+    def cursor_page(self, cursor):
+        paginator = UserCursorPagination()
+        params = {"page_size": self.page_size}
+        if cursor:
+            params["cursor"] = cursor
+        return paginator.paginate_queryset(
+            User.objects.all(),
+            self.request(**params),
+        )
+
+    def cursor_for(self, offset):
+        """Encode the cursor a client would hold after paging to ``offset``."""
+        if offset == 0:
+            return None
+        paginator = UserCursorPagination()
+        paginator.base_url = "/api/users/"
+        last = User.objects.order_by(*paginator.ordering)[offset - 1]
+        position = paginator._get_position_from_instance(last, paginator.ordering)  # noqa: SLF001
+        link = paginator.encode_cursor(
+            Cursor(offset=0, reverse=False, position=position),
+        )
+        return parse_qs(urlsplit(link).query)["cursor"][0]
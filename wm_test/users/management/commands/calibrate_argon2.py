@@ -0,0 +1,82 @@
+import statistics
+import time
+
+import argon2
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+# OWASP's smallest recommended memory cost, in KiB.
+MIN_MEMORY_COST = 19 * 1024
+
+
+def hash_time(time_cost: int, memory_cost: int, parallelism: int, rounds: int):
+    """Median seconds to hash a password with these parameters."""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        argon2.low_level.hash_secret(
+            b"correct horse battery staple",
+            b"calibration salt",
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+            hash_len=argon2.DEFAULT_HASH_LENGTH,
+            type=argon2.low_level.Type.ID,
+        )
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+class Command(BaseCommand):
+    help = (
+        "Find the Argon2 cost that hashes a password in about --target-ms "
+        "on this machine. Starting from --memory-kib, the time cost grows "
+        "while the hash stays within the target. Memory is halved, down to "
+        "19 MiB, when one pass is already too slow. Prints the settings to "
+        "deploy, run it on the production hardware."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target-ms", type=float, default=100.0)
+        parser.add_argument(
+            "--memory-kib",
+            type=int,
+            default=settings.ARGON2_MEMORY_COST,
+        )
+        parser.add_argument(
+            "--parallelism",
+            type=int,
+            default=settings.ARGON2_PARALLELISM,
+            help="Lanes, and threads per hash. Logins cost CPU time on that "
+            "many cores at once.",
+        )
+        parser.add_argument("--rounds", type=int, default=5)
+
+    def handle(self, *args, **options):
+        target = options["target_ms"] / 1000
+        memory_cost = options["memory_kib"]
+        parallelism = options["parallelism"]
+        if memory_cost < 8 * parallelism:
+            msg = "Argon2 needs at least 8 KiB of memory per lane."
+            raise CommandError(msg)
+
+        def measure(time_cost, memory_cost):
+            seconds = hash_time(time_cost, memory_cost, parallelism, options["rounds"])
+            self.stdout.write(
+                f"time cost {time_cost:>3}  memory {memory_cost:>7} KiB  "
+                f"{seconds * 1000:>8.1f} ms",
+            )
+            return seconds
+
+        while measure(1, memory_cost) > target and memory_cost > MIN_MEMORY_COST:
+            memory_cost = max(MIN_MEMORY_COST, memory_cost // 2)
+        time_cost = 1
+        while measure(time_cost + 1, memory_cost) <= target:
+            time_cost += 1
+
+        self.stdout.write(
+            f"DJANGO_ARGON2_TIME_COST={time_cost}\n"
+            f"DJANGO_ARGON2_MEMORY_COST={memory_cost}\n"
+            f"DJANGO_ARGON2_PARALLELISM={parallelism}",
+        )
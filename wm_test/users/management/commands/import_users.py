@@ -0,0 +1,83 @@
+import csv
+import json
+import resource
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from wm_test.users.models import User
+
+# Columns accepted from the import file, anything else is ignored.
+IMPORT_FIELDS = ("email", "password", "name")
+
+
+class Command(BaseCommand):
+    help = (
+        "Create users from a CSV (with a header row) or JSON Lines file. "
+        "Existing and repeated emails are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path)
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="Input format, guessed from the file extension by default.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help="Password hashing workers, defaults to one per CPU.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or path.suffix.lstrip(".").lower()
+        if file_format not in ("csv", "jsonl"):
+            msg = f"Cannot guess the format of {path}, pass --format."
+            raise CommandError(msg)
+
+        started = time.perf_counter()
+        with path.open(newline="", encoding="utf-8") as stream:
+            rows = (
+                self.read_csv(stream)
+                if file_format == "csv"
+                else self.read_jsonl(stream)
+            )
+            result = User.objects.bulk_create_users(
+                rows,
+                batch_size=options["batch_size"],
+                processes=options["processes"],
+            )
+        elapsed = time.perf_counter() - started
+
+        # ru_maxrss is reported in kilobytes on Linux.
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        workers_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result.created} users, skipped {result.skipped} "
+                f"in {elapsed:.1f}s ({result.created / elapsed:.0f} users/sec). "
+                f"Peak memory: {peak_kb / 1024:.0f} MiB, "
+                f"largest hashing worker: {workers_kb / 1024:.0f} MiB.",
+            ),
+        )
+
+    def read_csv(self, stream):
+        for row in csv.DictReader(stream):
+            yield {field: row[field] for field in IMPORT_FIELDS if row.get(field)}
+
+    def read_jsonl(self, stream):
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as exc:
+                msg = f"Line {line_number}: {exc}"
+                raise CommandError(msg) from exc
+            yield {field: row[field] for field in IMPORT_FIELDS if row.get(field)}
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from wm_test.utils.profiler import TOKEN_HEADER
+from wm_test.utils.profiler import make_token
+
+
+class Command(BaseCommand):
+    help = (
+        "Print a signed token that makes the sampling profiler profile the "
+        "requests sending it, while it is valid."
+    )
+
+    def handle(self, *args, **options):
+        minutes = settings.PROFILER_TOKEN_MAX_AGE // 60
+        self.stderr.write(f"Send it as {TOKEN_HEADER}, valid for {minutes} minutes:")
+        self.stdout.write(make_token())
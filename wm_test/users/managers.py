@@ -1,4 +1,11 @@
+import os
+from collections.abc import Iterable
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from typing import TYPE_CHECKING
+from typing import Any
+from typing import NamedTuple
 
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import UserManager as DjangoUserManager
@@ -7,6 +14,26 @@ if TYPE_CHECKING:
     from .models import User  # noqa: F401
 
 
+class BulkCreateResult(NamedTuple):
+    created: int
+    skipped: int
+
+
+def _init_hash_worker() -> None:
+    """Make sure spawned pool workers can read the password hasher settings."""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def _chunks(iterable: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
 class UserManager(DjangoUserManager["User"]):
     """Custom manager for the User model."""
 
@@ -40,3 +67,89 @@ class UserManager(DjangoUserManager["User"]):
             raise ValueError(msg)
 
         return self._create_user(email, password, **extra_fields)
+
+    def bulk_create_users(
+        self,
+        rows: Iterable[dict[str, Any]],
+        batch_size: int = 5000,
+        processes: int | None = None,
+    ) -> BulkCreateResult:
+        """
+        Create regular users from an iterable of field dicts.
+
+        Every row needs an ``email`` and may carry a raw ``password`` plus any
+        other model field. Rows are consumed lazily, ``batch_size`` at a time:
+        emails are normalized, duplicates (within the input or already in the
+        table) are skipped, passwords are hashed across ``processes`` worker
+        processes and each batch is written with a single ``bulk_create``.
+
+        ``processes=1`` hashes in the calling process, ``None`` uses one
+        worker per CPU. ``bulk_create`` does not send ``post_save``, so
+        nothing hooked on user creation runs for these rows.
+        """
+        workers = processes or os.cpu_count() or 1
+        pool = None
+        if workers > 1:
+            pool = ProcessPoolExecutor(workers, initializer=_init_hash_worker)
+        created = skipped = 0
+        seen: set[str] = set()
+        try:
+            for chunk in _chunks(rows, batch_size):
+                pending: dict[str, dict[str, Any]] = {}
+                for row in chunk:
+                    fields = dict(row)
+                    email = self.normalize_email(fields.pop("email", None))
+                    if not email:
+                        msg = "The given email must be set"
+                        raise ValueError(msg)
+                    if email in seen:
+                        skipped += 1
+                        continue
+                    seen.add(email)
+                    pending[email] = fields
+
+                existing = self.using(self._db).filter(email__in=pending.keys())
+                for email in existing.values_list("email", flat=True):
+                    del pending[email]
+                    skipped += 1
+
+                passwords = [
+                    fields.pop("password", None) for fields in pending.values()
+                ]
+                users = [
+                    self.model(email=email, password=password, **fields)
+                    for (email, fields), password in zip(
+                        pending.items(),
+                        self._hash_passwords(passwords, pool, workers),
+                        strict=True,
+                    )
+                ]
+                # ignore_conflicts covers rows inserted concurrently since the
+                # lookup above, the unique email index has the last word. Its
+                # rows come back without pks, the salted hashes tell the rows
+                # written here from the concurrent ones.
+                self.using(self._db).bulk_create(users, ignore_conflicts=True)
+                hashes = {user.email: user.password for user in users}
+                stored = self.using(self._db).filter(email__in=hashes)
+                inserted = sum(
+                    hashes[email] == password
+                    for email, password in stored.values_list("email", "password")
+                )
+                created += inserted
+                skipped += len(users) - inserted
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return BulkCreateResult(created=created, skipped=skipped)
+
+    @staticmethod
+    def _hash_passwords(
+        passwords: list[str | None],
+        pool: ProcessPoolExecutor | None,
+        workers: int,
+    ) -> Iterable[str]:
+        if pool is None:
+            return map(make_password, passwords)
+        # A few chunks per worker keeps them busy without per-item IPC.
+        chunksize = max(1, len(passwords) // (workers * 4))
+        return pool.map(make_password, passwords, chunksize=chunksize)
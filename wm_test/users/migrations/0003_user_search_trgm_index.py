@@ -0,0 +1,34 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, and a plain
+    # CREATE INDEX would lock the users table for the whole build.
+    atomic = False
+
+    dependencies = [
+        ("users", "0002_user_joined_id_index"),
+    ]
+
+    operations = [
+        # pg_trgm is a trusted extension, the database owner may create it.
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="gin_trgm_ops",
+                ),
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("email"),
+                    name="gin_trgm_ops",
+                ),
+                name="users_user_search_trgm_idx",
+            ),
+        ),
+    ]
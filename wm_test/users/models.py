@@ -1,9 +1,12 @@
-
 from typing import ClassVar
 
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.indexes import OpClass
 from django.db.models import CharField
 from django.db.models import EmailField
+from django.db.models import Index
+from django.db.models.functions import Upper
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
@@ -29,6 +32,20 @@ class User(AbstractUser):
 
     objects: ClassVar[UserManager] = UserManager()
 
+    class Meta(AbstractUser.Meta):  # type: ignore[name-defined]
+        indexes = [
+            # Keyset pagination in ``UserCursorPagination`` walks this index,
+            # Postgres scans it backwards for the newest-first ordering.
+            Index(fields=["date_joined", "id"], name="users_user_joined_id_idx"),
+            # Trigrams of the expressions ``icontains`` compares, so the admin
+            # search (``UPPER(name::text) LIKE UPPER('%...%')``) can use it.
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                OpClass(Upper("email"), name="gin_trgm_ops"),
+                name="users_user_search_trgm_idx",
+            ),
+        ]
+
     def get_absolute_url(self) -> str:
         """Get URL for user's detail view.
 
@@ -0,0 +1,20 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from wm_test.users.api.cache import invalidate_me_payload
+from wm_test.users.authentication import invalidate_user_is_active
+from wm_test.users.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_caches(sender, instance: User, **kwargs) -> None:
+    for invalidate in (invalidate_me_payload, invalidate_user_is_active):
+        invalidate(instance.pk)
+        # Requests are atomic: a concurrent reader may refill the cache from
+        # the old row before this transaction commits, so drop it again then.
+        transaction.on_commit(partial(invalidate, instance.pk))
@@ -5,6 +5,8 @@ from importlib import reload
 import pytest
 from django.contrib import admin
 from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from pytest_django.asserts import assertRedirects
 
@@ -22,6 +24,19 @@ class TestUserAdmin:
         response = admin_client.get(url, data={"q": "test"})
         assert response.status_code == HTTPStatus.OK
 
+    def test_changelist_shows_estimated_count(self, admin_client, settings):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {User._meta.db_table}")  # noqa: SLF001
+        settings.PAGINATOR_ESTIMATE_THRESHOLD = 1
+        url = reverse("admin:users_user_changelist")
+
+        with CaptureQueriesContext(connection) as captured:
+            response = admin_client.get(url)
+
+        assert response.status_code == HTTPStatus.OK
+        assert b"~1 user" in response.content
+        assert not [q for q in captured if "COUNT(*)" in q["sql"]]
+
     def test_add(self, admin_client):
         url = reverse("admin:users_user_add")
         response = admin_client.get(url)
@@ -63,3 +78,30 @@ class TestUserAdmin:
         # The `admin` login view should redirect to the `allauth` login view
         target_url = reverse(settings.LOGIN_URL) + "?next=" + request.path
         assertRedirects(response, target_url, fetch_redirect_response=False)
+
+
+@pytest.mark.django_db
+class TestUserSearchIndex:
+    @pytest.fixture(autouse=True)
+    def _no_sequential_scans(self):
+        # The test table is too small for the planner to prefer the index.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    @pytest.mark.parametrize("field", ["name", "email"])
+    def test_icontains_uses_trigram_index(self, field):
+        queryset = User.objects.filter(**{f"{field}__icontains": "smith"})
+
+        assert "users_user_search_trgm_idx" in queryset.explain()
+
+    def test_admin_search_uses_trigram_index(self, rf):
+        model_admin = admin.site._registry[User]  # noqa: SLF001
+        queryset, _ = model_admin.get_search_results(
+            rf.get("/"),
+            User.objects.all(),
+            "ann smith",
+        )
+
+        plan = queryset.explain()
+        assert "users_user_search_trgm_idx" in plan
+        assert "Seq Scan" not in plan
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+from typing import cast
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from wm_test.users.api.views import UserViewSet
+from wm_test.users.authentication import LazyJWTAuthentication
+from wm_test.users.authentication import LazyTokenUser
+from wm_test.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+class TestLazyJWTAuthentication:
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        cache.clear()
+
+    def get(self, view, user: User):
+        token = AccessToken.for_user(user)
+        request = APIRequestFactory().get(
+            "/fake-url/",
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+        return async_to_sync(view)(request)
+
+    def test_list_does_not_load_user(self, user: User, django_assert_num_queries):
+        view = UserViewSet.as_view({"get": "list"})
+        self.get(view, user)  # warm the is_active cache
+
+        # Only the page query itself, no users lookup for authentication.
+        with django_assert_num_queries(1):
+            response = self.get(view, user)
+
+        assert response.status_code == HTTPStatus.OK
+        assert [item["name"] for item in response.data["results"]] == [user.name]
+
+    def test_user_loaded_on_demand(self, user: User, django_assert_num_queries):
+        # Stands in for the User it loads.
+        lazy_user = cast(User, LazyTokenUser(user.pk))
+
+        with django_assert_num_queries(0):
+            assert lazy_user.pk == user.pk
+            assert lazy_user.id == user.pk
+            assert lazy_user.is_authenticated
+        with django_assert_num_queries(1):
+            assert lazy_user.name == user.name
+            assert lazy_user.email == user.email
+
+    def test_inactive_user_rejected(self, user: User):
+        token = AccessToken.for_user(user)
+        authentication = LazyJWTAuthentication()
+        assert authentication.get_user(token).pk == user.pk
+
+        user.is_active = False
+        user.save()
+
+        with pytest.raises(AuthenticationFailed, match="inactive"):
+            authentication.get_user(token)
+
+    def test_deleted_user_rejected(self, user: User):
+        token = AccessToken.for_user(user)
+        user.delete()
+
+        with pytest.raises(AuthenticationFailed, match="not found"):
+            LazyJWTAuthentication().get_user(token)
@@ -0,0 +1,109 @@
+import pytest
+from allauth.account.auth_backends import AuthenticationBackend
+from allauth.account.models import EmailAddress
+from django.contrib.auth import authenticate
+from django.contrib.auth import hashers
+
+from wm_test.users.hashers import dummy_password_hash
+from wm_test.users.models import User
+from wm_test.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+PASSWORD = "correct horse battery staple"  # noqa: S105
+
+
+@pytest.fixture
+def login_user() -> User:
+    return UserFactory(email="ann@example.com", password=PASSWORD)
+
+
+@pytest.fixture
+def hashes(monkeypatch) -> list[str]:
+    """The encoded passwords checked, one per hash computed."""
+    checked = []
+    verify = hashers.MD5PasswordHasher.verify
+
+    def counted(self, password, encoded):
+        checked.append(encoded)
+        return verify(self, password, encoded)
+
+    monkeypatch.setattr(hashers.MD5PasswordHasher, "verify", counted)
+    return checked
+
+
+@pytest.mark.parametrize(
+    "credentials",
+    [
+        {"email": "ann@example.com"},
+        {"email": "Ann@Example.COM"},
+        # The admin login form.
+        {"username": "ann@example.com"},
+    ],
+)
+def test_login(login_user: User, credentials, django_assert_num_queries, hashes):
+    with django_assert_num_queries(1):
+        assert authenticate(None, password=PASSWORD, **credentials) == login_user
+    assert hashes == [login_user.password]
+
+
+def test_wrong_password_hashes_once(
+    login_user: User,
+    django_assert_num_queries,
+    hashes,
+):
+    with django_assert_num_queries(1):
+        assert authenticate(None, email=login_user.email, password="x") is None  # noqa: S106
+    assert hashes == [login_user.password]
+
+
+def test_unknown_email_hashes_once(db, django_assert_num_queries, hashes):
+    dummy = dummy_password_hash()
+
+    with django_assert_num_queries(1):
+        assert authenticate(None, email="bob@example.com", password=PASSWORD) is None
+    assert hashes == [dummy]
+
+
+def test_verified_address_is_preferred(login_user: User):
+    other = UserFactory(email="other@example.com", password=PASSWORD)
+    EmailAddress.objects.create(user=login_user, email="ann@example.com")
+    EmailAddress.objects.create(user=other, email="ann@example.com", verified=True)
+
+    assert authenticate(None, email="ann@example.com", password=PASSWORD) == other
+
+
+def test_inactive_user_is_stashed_for_allauth(login_user: User):
+    login_user.is_active = False
+    login_user.save()
+
+    assert authenticate(None, email=login_user.email, password=PASSWORD) is None
+    assert AuthenticationBackend.unstash_authenticated_user() == login_user
+
+
+def test_password_is_rehashed_with_the_current_cost(login_user: User, settings):
+    settings.PASSWORD_HASHERS = ["wm_test.users.hashers.Argon2PasswordHasher"]
+    settings.ARGON2_TIME_COST = 1
+    settings.ARGON2_MEMORY_COST = 64
+    settings.ARGON2_PARALLELISM = 1
+    login_user.set_password(PASSWORD)
+    login_user.save()
+    settings.ARGON2_TIME_COST = 2
+
+    assert authenticate(None, email=login_user.email, password=PASSWORD)
+
+    login_user.refresh_from_db()
+    assert "$m=64,t=2,p=1$" in login_user.password
+    assert hashers.check_password(PASSWORD, login_user.password)
+
+
+def test_dummy_hash_follows_the_cost(settings):
+    settings.PASSWORD_HASHERS = ["wm_test.users.hashers.Argon2PasswordHasher"]
+    settings.ARGON2_TIME_COST = 1
+    settings.ARGON2_MEMORY_COST = 64
+    settings.ARGON2_PARALLELISM = 1
+    assert "$m=64,t=1,p=1$" in dummy_password_hash()
+
+    settings.ARGON2_MEMORY_COST = 128
+
+    assert "$m=128,t=1,p=1$" in dummy_password_hash()
@@ -0,0 +1,76 @@
+from datetime import timedelta
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+import pytest
+from django.utils import timezone
+from factory import Iterator
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from wm_test.users.api.pagination import UserCursorPagination
+from wm_test.users.models import User
+from wm_test.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestUserCursorPagination:
+    @pytest.fixture
+    def users(self) -> list[User]:
+        now = timezone.now()
+        # Pairs of users share a timestamp so the id tie-breaker matters.
+        return UserFactory.create_bulk(
+            7,
+            date_joined=Iterator(
+                now - timedelta(minutes=index // 2) for index in range(7)
+            ),
+        )
+
+    def paginate(self, cursor: str | None = None, page_size: int = 3):
+        params: dict[str, str | int] = {"page_size": page_size}
+        if cursor:
+            params["cursor"] = cursor
+        request = Request(APIRequestFactory().get("/api/users/", params))
+        paginator = UserCursorPagination()
+        page = paginator.paginate_queryset(User.objects.all(), request)
+        return paginator, page
+
+    def cursor_from(self, link: str | None) -> str | None:
+        if link is None:
+            return None
+        return parse_qs(urlsplit(link).query)["cursor"][0]
+
+    def test_walks_forward_and_back(self, users: list[User]):
+        expected = list(User.objects.order_by("-date_joined", "-id"))
+
+        seen: list[User] = []
+        paginator, page = self.paginate()
+        seen += page
+        while paginator.has_next:
+            paginator, page = self.paginate(self.cursor_from(paginator.get_next_link()))
+            seen += page
+        assert seen == expected
+
+        seen = list(page)
+        while paginator.has_previous:
+            cursor = self.cursor_from(paginator.get_previous_link())
+            paginator, page = self.paginate(cursor)
+            seen = page + seen
+        assert seen == expected
+
+    def test_cursor_carries_every_ordering_field(self, users: list[User]):
+        paginator, page = self.paginate()
+        cursor = self.cursor_from(paginator.get_next_link())
+        assert cursor is not None
+        request = Request(APIRequestFactory().get("/api/users/", {"cursor": cursor}))
+
+        decoded = paginator.decode_cursor(request)
+
+        assert decoded is not None
+        assert decoded.position == (page[-1].date_joined.isoformat(), str(page[-1].pk))
+
+    def test_invalid_cursor(self, users: list[User]):
+        with pytest.raises(NotFound):
+            self.paginate("not-a-cursor")
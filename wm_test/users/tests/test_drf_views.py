@@ -1,6 +1,17 @@
+from http import HTTPStatus
+
 import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncClient
+from django.test import Client
+from django.urls import reverse
+from rest_framework.test import APIClient
 from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
 
+from wm_test.users.api.cache import me_cache_stats
 from wm_test.users.api.views import UserViewSet
 from wm_test.users.models import User
 
@@ -10,6 +21,10 @@ class TestUserViewSet:
     def api_rf(self) -> APIRequestFactory:
         return APIRequestFactory()
 
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        cache.clear()
+
     def test_get_queryset(self, user: User, api_rf: APIRequestFactory):
         view = UserViewSet()
         request = api_rf.get("/fake-url/")
@@ -26,9 +41,66 @@ class TestUserViewSet:
 
         view.request = request
 
-        response = view.me(request)  # type: ignore[call-arg, arg-type, misc]
+        response = async_to_sync(view.me)(request)  # type: ignore[call-arg, arg-type]
 
         assert response.data == {
             "url": f"http://testserver/api/users/{user.pk}/",
             "name": user.name,
         }
+
+    def test_me_is_cached(self, user: User, api_rf: APIRequestFactory):
+        view = UserViewSet.as_view({"get": "me"})
+        request = api_rf.get("/fake-url/")
+        force_authenticate(request, user=user)
+        me_cache_stats.clear()
+
+        first = async_to_sync(view)(request)
+        second = async_to_sync(view)(request)
+
+        assert first.data == second.data
+        assert first["ETag"] == second["ETag"]
+        assert me_cache_stats == {"miss": 1, "hit": 1}
+
+    def test_me_not_modified(self, user: User, api_rf: APIRequestFactory):
+        view = UserViewSet.as_view({"get": "me"})
+        request = api_rf.get("/fake-url/")
+        force_authenticate(request, user=user)
+        etag = async_to_sync(view)(request)["ETag"]
+
+        request = api_rf.get("/fake-url/", HTTP_IF_NONE_MATCH=etag)
+        force_authenticate(request, user=user)
+        response = async_to_sync(view)(request)
+
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response["ETag"] == etag
+
+    def test_me_invalidated_by_update_view(self, user: User, client: Client):
+        api_client = APIClient()
+        api_client.force_authenticate(user=user)
+        before = api_client.get(reverse("api:user-me"))
+
+        client.force_login(user)
+        client.post(reverse("users:update"), {"name": "Renamed User"})
+        user.refresh_from_db()
+        api_client.force_authenticate(user=user)
+        after = api_client.get(
+            reverse("api:user-me"), HTTP_IF_NONE_MATCH=before["ETag"]
+        )
+
+        assert after.status_code == HTTPStatus.OK
+        assert after.data["name"] == "Renamed User"
+        assert after["ETag"] != before["ETag"]
+
+    def test_actions_over_asgi(self, user: User):
+        client = AsyncClient()
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+        def get(url):
+            return async_to_sync(client.get)(url, headers=headers)
+
+        me = get(reverse("api:user-me"))
+        detail = get(reverse("api:user-detail", kwargs={"pk": user.pk}))
+        listing = get(reverse("api:user-list"))
+
+        assert me.status_code == HTTPStatus.OK
+        assert me.json() == detail.json() == listing.json()["results"][0]
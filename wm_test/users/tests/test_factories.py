@@ -0,0 +1,25 @@
+import pytest
+
+from wm_test.users.models import User
+from wm_test.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_create_bulk_inserts_once(django_assert_num_queries):
+    with django_assert_num_queries(1):
+        users = UserFactory.create_bulk(20, name="Ann")
+
+    assert all(user.pk for user in users)
+    assert User.objects.filter(name="Ann").count() == 20  # noqa: PLR2004
+    assert users[0].has_usable_password()
+
+
+def test_create_bulk_makes_emails_unique():
+    users = UserFactory.create_bulk(3, email="cat@example.com")
+
+    assert sorted(user.email for user in users) == [
+        "1.cat@example.com",
+        "2.cat@example.com",
+        "cat@example.com",
+    ]
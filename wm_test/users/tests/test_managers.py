@@ -53,3 +53,92 @@ def test_createsuperuser_command():
     assert out.getvalue() == "Superuser created successfully.\n"
     user = User.objects.get(email="henry@example.com")
     assert not user.has_usable_password()
+
+
+@pytest.mark.django_db
+class TestBulkCreateUsers:
+    def test_creates_and_hashes(self):
+        result = User.objects.bulk_create_users(
+            [
+                {"email": "ann@EXAMPLE.com", "password": "s3cret-Pass", "name": "Ann"},
+                {"email": "bob@example.com"},
+            ],
+            processes=1,
+        )
+
+        assert result == (2, 0)
+        ann = User.objects.get(email="ann@example.com")
+        assert ann.name == "Ann"
+        assert ann.check_password("s3cret-Pass")
+        assert not User.objects.get(email="bob@example.com").has_usable_password()
+
+    def test_skips_duplicates(self, user: User):
+        result = User.objects.bulk_create_users(
+            [
+                {"email": user.email},
+                {"email": "new@example.com"},
+                {"email": "new@example.com"},
+            ],
+            batch_size=2,
+            processes=1,
+        )
+
+        assert result == (1, 2)
+        assert User.objects.filter(email="new@example.com").count() == 1
+
+    def test_counts_rows_inserted_concurrently_as_skipped(self, monkeypatch):
+        hash_passwords = User.objects._hash_passwords  # noqa: SLF001
+
+        def racing(passwords, pool, workers):
+            # Another import writes the row between the lookup and the insert.
+            User.objects.create_user(email="ann@example.com")
+            return hash_passwords(passwords, pool, workers)
+
+        monkeypatch.setattr(User.objects, "_hash_passwords", racing)
+        result = User.objects.bulk_create_users(
+            [{"email": "ann@example.com"}, {"email": "bob@example.com"}],
+            processes=1,
+        )
+
+        assert result == (1, 1)
+        assert User.objects.filter(email="ann@example.com").count() == 1
+
+    def test_hashes_in_worker_processes(self):
+        User.objects.bulk_create_users(
+            (
+                {"email": f"user{i}@example.com", "password": f"pw-{i}"}
+                for i in range(4)
+            ),
+            processes=2,
+        )
+
+        assert User.objects.get(email="user3@example.com").check_password("pw-3")
+
+    def test_requires_email(self):
+        with pytest.raises(ValueError, match="email must be set"):
+            User.objects.bulk_create_users([{"name": "Nobody"}], processes=1)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("filename", "content"),
+    [
+        ("users.csv", "email,name,password\njoe@example.com,Joe,pw-joe\n"),
+        (
+            "users.jsonl",
+            '{"email": "joe@example.com", "name": "Joe", "password": "pw-joe"}\n',
+        ),
+    ],
+)
+def test_import_users_command(tmp_path, filename, content):
+    path = tmp_path / filename
+    path.write_text(content)
+    out = StringIO()
+
+    call_command("import_users", str(path), "--processes", "1", stdout=out)
+
+    assert "Created 1 users, skipped 0" in out.getvalue()
+    assert "users/sec" in out.getvalue()
+    user = User.objects.get(email="joe@example.com")
+    assert user.name == "Joe"
+    assert user.check_password("pw-joe")
@@ -0,0 +1,128 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from wm_test.users import tokens
+from wm_test.users.models import User
+from wm_test.users.tokens import BLACKLIST_KEY
+from wm_test.users.tokens import RefreshToken
+from wm_test.users.tokens import add_to_blacklist
+from wm_test.users.tokens import blacklist_filter
+from wm_test.users.tokens import is_blacklisted
+from wm_test.utils.bloom import BloomFilter
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _fresh_filters():
+    tokens._filters.clear()  # noqa: SLF001
+    yield
+    tokens._filters.clear()  # noqa: SLF001
+
+
+def refresh(token: str):
+    return APIClient().post(reverse("token_refresh"), {"refresh": token})
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    for index in range(1000):
+        bloom.add(f"in-{index}")
+
+    assert all(f"in-{index}" in bloom for index in range(1000))
+    false_positives = sum(f"out-{index}" in bloom for index in range(10_000))
+    assert false_positives < 300  # noqa: PLR2004
+
+
+def test_rotation_blacklists_the_old_token(user: User, redis_client, settings):
+    token = RefreshToken.for_user(user)
+
+    response = refresh(str(token))
+
+    assert response.status_code == HTTPStatus.OK
+    assert set(response.data) == {"access", "refresh"}
+    lifetime = settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds()
+    ttl = redis_client.ttl(BLACKLIST_KEY.format(jti=token["jti"]))
+    assert lifetime - 5 < ttl <= lifetime
+
+    assert refresh(str(token)).status_code == HTTPStatus.UNAUTHORIZED
+    assert refresh(response.data["refresh"]).status_code == HTTPStatus.OK
+
+
+def test_ttl_is_the_remaining_lifetime(user: User, redis_client):
+    token = RefreshToken.for_user(user)
+    token.set_exp(lifetime=timedelta(minutes=10))
+
+    add_to_blacklist(token["jti"], token["exp"])
+
+    assert 595 < redis_client.ttl(BLACKLIST_KEY.format(jti=token["jti"])) <= 600  # noqa: PLR2004
+
+
+def test_not_blacklisted_skips_redis(user: User, redis_client, monkeypatch):
+    token = RefreshToken.for_user(user)
+    blacklist_filter().sync()
+    monkeypatch.setattr(redis_client, "exists", pytest.fail)
+
+    assert not is_blacklisted(token["jti"])
+
+
+def test_false_positive_falls_back_to_redis(user: User, redis_client, monkeypatch):
+    token = RefreshToken.for_user(user)
+    monkeypatch.setattr(tokens.BlacklistFilter, "__contains__", lambda self, jti: True)
+    lookups = []
+    exists = redis_client.exists
+
+    def counted_exists(*keys):
+        lookups.append(keys)
+        return exists(*keys)
+
+    monkeypatch.setattr(redis_client, "exists", counted_exists)
+
+    assert not is_blacklisted(token["jti"])
+    assert lookups == [(BLACKLIST_KEY.format(jti=token["jti"]),)]
+    assert refresh(str(token)).status_code == HTTPStatus.OK
+
+
+def test_rotation_catches_tokens_the_filter_has_not_seen(user: User, redis_client):
+    token = RefreshToken.for_user(user)
+    blacklist_filter().sync()
+    # Another process rotated it after this one's last sync.
+    redis_client.set(BLACKLIST_KEY.format(jti=token["jti"]), 1)
+
+    assert not is_blacklisted(token["jti"])
+    assert refresh(str(token)).status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_sync_pulls_other_processes_entries(user: User, settings):
+    settings.JWT_BLACKLIST_SYNC_INTERVAL = 0
+    token = RefreshToken.for_user(user)
+    add_to_blacklist(token["jti"], token["exp"])
+    # Another process, whose filter starts empty.
+    tokens._filters.clear()  # noqa: SLF001
+
+    assert is_blacklisted(token["jti"])
+    assert token["jti"] in blacklist_filter()
+
+
+def test_full_filter_is_rebuilt_from_the_log(user: User, settings):
+    settings.JWT_BLACKLIST_SYNC_INTERVAL = 0
+    settings.JWT_BLACKLIST_BLOOM_CAPACITY = 2
+    jtis = []
+    for _ in range(3):
+        token = RefreshToken.for_user(user)
+        add_to_blacklist(token["jti"], token["exp"])
+        jtis.append(token["jti"])
+
+    blacklist = blacklist_filter()
+    blacklist.sync()
+
+    assert blacklist.bloom.count == len(jtis)
+    assert blacklist.bloom.capacity == 2 * len(jtis)
+    assert all(jti in blacklist for jti in jtis)
+    blacklist.sync()
+    # Sized from the log, the next pull reads only the recent entries.
+    assert blacklist.bloom.count == len(jtis)
@@ -0,0 +1,141 @@
+"""
+Refresh-token blacklist in Redis, with a Bloom filter per process in front.
+
+Rotating a refresh token blacklists it with ``SET jwt:blacklist:<jti> NX``.
+The key expires with the token, at most ``REFRESH_TOKEN_LIFETIME`` later.
+Because of NX the write is also the authoritative check. Of two requests
+rotating the same token, only the first succeeds, even on a process whose
+filter has not heard of the token yet.
+
+Other checks ask the process's Bloom filter first. A "not blacklisted" is
+answered without a round trip to Redis. A "maybe", false positives
+included, is settled with an ``EXISTS``. Each filter pulls the jtis that
+other processes blacklisted from the ``jwt:blacklist:log`` sorted set. It
+does so at most every ``JWT_BLACKLIST_SYNC_INTERVAL`` seconds, which bounds
+how long such a token can pass a check outside rotation. The filter starts
+with room for ``JWT_BLACKLIST_BLOOM_CAPACITY`` entries. Once full, it is
+rebuilt from the log with room for twice the entries logged, so a log that
+outgrew the setting is read whole once rather than on every pull.
+"""
+
+import math
+import os
+import threading
+import time
+from typing import cast
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from wm_test.utils.bloom import BloomFilter
+from wm_test.utils.redis_client import get_redis
+
+BLACKLIST_KEY = "jwt:blacklist:{jti}"
+LOG_KEY = "jwt:blacklist:log"
+# Pulls start this many seconds before the last entry seen, so entries
+# stamped by a process with a clock behind ours are not missed.
+SYNC_OVERLAP = 5.0
+
+
+class BlacklistFilter:
+    """The blacklisted jtis known to this process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self, capacity: int = 0) -> None:
+        self.bloom = BloomFilter(
+            max(capacity, settings.JWT_BLACKLIST_BLOOM_CAPACITY),
+            settings.JWT_BLACKLIST_BLOOM_ERROR_RATE,
+        )
+        self.synced_at: float | None = None
+        self.last_score = -math.inf
+
+    def add(self, jti: str) -> None:
+        with self._lock:
+            self.bloom.add(jti)
+
+    def __contains__(self, jti: str) -> bool:
+        return jti in self.bloom
+
+    def sync(self) -> None:
+        """Pull the entries logged since the last pull, if it is due."""
+        now = time.monotonic()
+        with self._lock:
+            if (
+                self.synced_at is not None
+                and now - self.synced_at < settings.JWT_BLACKLIST_SYNC_INTERVAL
+            ):
+                return
+            self.synced_at = now
+            if self.bloom.count >= self.bloom.capacity:
+                # The log only holds unexpired tokens, start over from it.
+                self._reset(2 * cast(int, get_redis().zcard(LOG_KEY)))
+                self.synced_at = now
+            since = self.last_score - SYNC_OVERLAP
+        entries = cast(
+            list[tuple[bytes, float]],
+            get_redis().zrangebyscore(LOG_KEY, since, "+inf", withscores=True),
+        )
+        with self._lock:
+            for jti, score in entries:
+                member = jti.decode()
+                if member not in self.bloom:
+                    self.bloom.add(member)
+                self.last_score = max(self.last_score, score)
+
+
+# Per process, forked workers must not share the parent's.
+_filters: dict[int, BlacklistFilter] = {}
+
+
+def blacklist_filter() -> BlacklistFilter:
+    pid = os.getpid()
+    blacklist = _filters.get(pid)
+    if blacklist is None:
+        blacklist = _filters[pid] = BlacklistFilter()
+    return blacklist
+
+
+def add_to_blacklist(jti: str, exp: int) -> bool:
+    """Blacklist ``jti`` until ``exp``, return whether it was not already."""
+    now = time.time()
+    lifetime = api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+    ttl = max(1, math.ceil(min(exp - now, lifetime)))
+    pipeline = get_redis().pipeline(transaction=False)
+    pipeline.set(BLACKLIST_KEY.format(jti=jti), 1, ex=ttl, nx=True)
+    pipeline.zadd(LOG_KEY, {jti: now}, nx=True)
+    pipeline.zremrangebyscore(LOG_KEY, "-inf", now - lifetime)
+    added, *_ = pipeline.execute()
+    blacklist_filter().add(jti)
+    return bool(added)
+
+
+def is_blacklisted(jti: str) -> bool:
+    blacklist = blacklist_filter()
+    blacklist.sync()
+    if jti not in blacklist:
+        return False
+    # Blacklisted or a false positive, only Redis knows.
+    return bool(get_redis().exists(BLACKLIST_KEY.format(jti=jti)))
+
+
+class RefreshToken(tokens.RefreshToken):
+    """A refresh token checked against and added to the Redis blacklist."""
+
+    def verify(self, *args, **kwargs) -> None:
+        super().verify(*args, **kwargs)
+        self.check_blacklist()
+
+    def check_blacklist(self) -> None:
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    # Adds no ``BlacklistedToken`` row to return.
+    def blacklist(self) -> None:  # type: ignore[override]
+        if not add_to_blacklist(self.payload[api_settings.JTI_CLAIM], self["exp"]):
+            raise TokenError(_("Token is blacklisted"))
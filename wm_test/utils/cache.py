@@ -0,0 +1,37 @@
+"""
+Cache backends that report hits and misses to ``wm_test.utils.metrics``.
+
+They only extend the lookups, so they are drop-in replacements for the
+Django and django-redis backends they subclass.
+"""
+
+from django.core.cache.backends.locmem import LocMemCache as BaseLocMemCache
+from django_redis.cache import RedisCache as BaseRedisCache
+
+from .metrics import record_cache_lookup
+
+_MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    def get(self, key, default=None, *args, **kwargs):
+        value = super().get(key, _MISSING, *args, **kwargs)  # type: ignore[misc]
+        if value is _MISSING:
+            record_cache_lookup(hits=0, misses=1)
+            return default
+        record_cache_lookup(hits=1, misses=0)
+        return value
+
+    def get_many(self, keys, *args, **kwargs):
+        keys = list(keys)
+        values = super().get_many(keys, *args, **kwargs)  # type: ignore[misc]
+        record_cache_lookup(hits=len(values), misses=len(keys) - len(values))
+        return values
+
+
+class LocMemCache(InstrumentedCacheMixin, BaseLocMemCache):
+    pass
+
+
+class RedisCache(InstrumentedCacheMixin, BaseRedisCache):
+    pass
@@ -0,0 +1,286 @@
+"""
+Read-only requests and the replica router.
+
+``ATOMIC_REQUESTS`` opens a transaction for every request, so a page that
+only reads pays a BEGIN and a COMMIT round trip and holds a snapshot for the
+whole request. Views wrapped in ``read_only_requests`` opt out for the safe
+methods: their queries run in autocommit and ``ReplicaRouter`` sends their
+reads to one of the ``replica_<n>`` databases when some are configured.
+Other methods on the same view keep the atomic request, writes are never
+routed.
+
+Replicas lag behind the primary. ``ReplicaRouter`` skips a replica further
+behind than ``REPLICA_MAX_LAG`` seconds, measured at most every
+``REPLICA_LAG_CHECK_INTERVAL`` seconds per process, and reads from the
+primary when none is left. A request picks its replica on its first read
+and keeps it, so its pages never mix rows of replicas at different points.
+``ReplicaPinningMiddleware`` sends the reads of a client that just wrote to
+the primary for ``REPLICA_PIN_SECONDS``, so a user sees their own changes on
+the next page.
+"""
+
+import random
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+from django.db import DatabaseError
+from django.db import connections
+from django.db import transaction
+
+REPLICA_PREFIX = "replica_"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+PIN_COOKIE = "db_primary"
+# Sessions load lazily inside the views. A replica that is behind the login
+# would log the user out.
+PRIMARY_APPS = frozenset({"sessions"})
+
+
+class ReadState:
+    """The replica a read-only request reads from, chosen on its first read."""
+
+    __slots__ = ("alias", "chosen")
+
+    def __init__(self) -> None:
+        self.alias: str | None = None
+        self.chosen = False
+
+    def replica(self) -> str | None:
+        if not self.chosen:
+            usable = usable_replicas()
+            self.alias = random.choice(usable) if usable else None  # noqa: S311
+            self.chosen = True
+        return self.alias
+
+
+_reading: ContextVar[ReadState | None] = ContextVar("reading", default=None)
+
+
+class PinState:
+    __slots__ = ("pinned", "wrote")
+
+    def __init__(self, *, pinned: bool) -> None:
+        self.pinned = pinned
+        self.wrote = False
+
+
+_pin_state: ContextVar[PinState | None] = ContextVar("pin_state", default=None)
+# Per process: alias -> (checked at, usable).
+_replica_checks: dict[str, tuple[float, bool]] = {}
+# One thread checks the lag, the others go on with the last results.
+_check_lock = threading.Lock()
+
+
+def in_read_only_request() -> bool:
+    return _reading.get() is not None
+
+
+def read_only_requests(view=None, *, snapshot: bool = False):
+    """
+    Run the safe methods of ``view`` outside of a transaction.
+
+    With ``snapshot=True`` they run in one ``READ ONLY`` transaction at
+    ``REPEATABLE READ`` instead, for views that need all their queries to
+    see the same data. Async views are never wrapped in a transaction.
+    """
+    if view is None:
+        return lambda view: read_only_requests(view, snapshot=snapshot)
+
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            token = _reading.set(
+                ReadState() if request.method in SAFE_METHODS else None,
+            )
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _reading.reset(token)
+
+    else:
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in SAFE_METHODS:
+                return _atomic_request(view)(request, *args, **kwargs)
+            token = _reading.set(ReadState())
+            try:
+                if snapshot:
+                    return _snapshot(view)(request, *args, **kwargs)
+                return view(request, *args, **kwargs)
+            finally:
+                _reading.reset(token)
+
+    return transaction.non_atomic_requests(wrapper)
+
+
+def _atomic_request(view):
+    """Wrap ``view`` like ``ATOMIC_REQUESTS`` would have."""
+    for alias, settings_dict in connections.settings.items():
+        if settings_dict["ATOMIC_REQUESTS"]:
+            view = transaction.atomic(using=alias)(view)
+    return view
+
+
+def _snapshot(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        # The request's replica, where its queries go too.
+        using = ReplicaRouter().db_for_read(None) or DEFAULT_DB_ALIAS
+        with transaction.atomic(using=using):
+            with connections[using].cursor() as cursor:
+                cursor.execute(
+                    "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY",
+                )
+            return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+def replicas() -> list[str]:
+    return [alias for alias in settings.DATABASES if alias.startswith(REPLICA_PREFIX)]
+
+
+def replica_lag(alias: str) -> float | None:
+    """
+    Return how many seconds ``alias`` is behind, ``None`` if unknown.
+
+    A standby that streams from the primary and replayed all it received is
+    up to date, even if the primary has been idle since its last
+    transaction. Otherwise, e.g. when its WAL receiver has disconnected, it
+    is as far behind as its last replayed transaction. Seeing the receiver's
+    status takes ``pg_read_all_stats``, without it only the second measure
+    is used. A server that is not a standby is never behind.
+    """
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                "SELECT CASE"
+                " WHEN NOT pg_is_in_recovery() THEN 0"
+                " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()"
+                " AND EXISTS (SELECT FROM pg_stat_wal_receiver"
+                " WHERE status = 'streaming') THEN 0"
+                " ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())"
+                " END",
+            )
+            lag = cursor.fetchone()[0]
+    except DatabaseError:
+        return None
+    return None if lag is None else float(lag)
+
+
+def usable_replicas() -> list[str]:
+    """
+    Return the replicas that were up to date at their last check.
+
+    Checks that are due run in the calling thread, one thread at a time.
+    The aliases set a ``connect_timeout``, so an unreachable replica holds
+    up only that thread, and only for that long.
+    """
+    now = time.monotonic()
+    aliases = replicas()
+    due = [
+        alias
+        for alias in aliases
+        if alias not in _replica_checks
+        or now - _replica_checks[alias][0] > settings.REPLICA_LAG_CHECK_INTERVAL
+    ]
+    if due and _check_lock.acquire(blocking=False):
+        try:
+            for alias in due:
+                lag = replica_lag(alias)
+                ok = lag is not None and lag <= settings.REPLICA_MAX_LAG
+                _replica_checks[alias] = (time.monotonic(), ok)
+        finally:
+            _check_lock.release()
+    # Not checked yet, while another thread checks: read from the primary.
+    return [alias for alias in aliases if _replica_checks.get(alias, (0, False))[1]]
+
+
+class ReplicaRouter:
+    """Send the reads of read-only requests to an up to date replica."""
+
+    def db_for_read(self, model, **hints):
+        reading = _reading.get()
+        if reading is None:
+            return None
+        if model is not None and model._meta.app_label in PRIMARY_APPS:  # noqa: SLF001
+            return None
+        state = _pin_state.get()
+        if state is not None and (state.pinned or state.wrote):
+            return None
+        return reading.replica()
+
+    def db_for_write(self, model, **hints):
+        state = _pin_state.get()
+        if state is not None:
+            state.wrote = True
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas mirror the primary, their rows may be related.
+        databases = {obj1._state.db, obj2._state.db}  # noqa: SLF001
+        if all(db == DEFAULT_DB_ALIAS or db in replicas() for db in databases):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db.startswith(REPLICA_PREFIX) else None
+
+
+class ReplicaPinningMiddleware:
+    """
+    Read from the primary for ``REPLICA_PIN_SECONDS`` after a write.
+
+    A cookie carries the pin, so it follows the client that wrote. Keep it
+    before ``SessionMiddleware``, whose saves count as writes too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replicas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state = PinState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _pin_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _pin_state.reset(token)
+        return self.pin(request, response, state)
+
+    async def __acall__(self, request):
+        state = PinState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _pin_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _pin_state.reset(token)
+        return self.pin(request, response, state)
+
+    def pin(self, request, response, state: PinState):
+        if state.wrote:
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                secure=request.is_secure(),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
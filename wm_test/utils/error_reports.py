@@ -0,0 +1,221 @@
+"""
+Error mails to the ADMINS that never hold up a request.
+
+Django's ``AdminEmailHandler`` sends its mail from inside the failing
+request, so a burst of 500s keeps every worker waiting on the mail server.
+``ErrorReportHandler`` is a ``QueueHandler``. The failing request only
+renders the report, the one ``AdminEmailHandler`` would send, and queues it.
+A ``QueueListener`` thread in each process mails it.
+
+Errors are fingerprinted by exception type and by the file, function and
+line of each traceback frame. Records without an exception use their logger
+and call site instead. Only the first error of a fingerprint is reported
+within ``window`` seconds. Its repeats are not rendered at all, only
+counted, and are mailed as one digest when the window closes. Digests still
+pending at exit are sent when logging shuts down.
+"""
+
+import hashlib
+import logging
+import os
+import queue
+import threading
+import time
+import traceback
+from copy import copy
+from dataclasses import dataclass
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+
+from django.conf import settings
+from django.utils.log import AdminEmailHandler
+
+
+def fingerprint(record: logging.LogRecord) -> str:
+    if record.exc_info and record.exc_info[0] is not None:
+        exc_type, _, tb = record.exc_info
+        parts = [f"{exc_type.__module__}.{exc_type.__qualname__}"]
+        parts += [
+            f"{frame.f_code.co_filename}:{frame.f_code.co_name}:{lineno}"
+            for frame, lineno in traceback.walk_tb(tb)
+        ]
+    else:
+        parts = [record.name, f"{record.pathname}:{record.lineno}", str(record.msg)]
+    digest = hashlib.sha1("\n".join(parts).encode(), usedforsecurity=False)
+    return digest.hexdigest()[:12]
+
+
+@dataclass
+class Window:
+    """The reported error of a fingerprint and its repeats since."""
+
+    subject: str
+    started: float
+    ends: float
+    repeats: int = 0
+    last_message: str = ""
+
+
+class ReportMailer(AdminEmailHandler):
+    """Renders reports as ``AdminEmailHandler`` does and mails them."""
+
+    def subject(self, record: logging.LogRecord) -> str:
+        # AdminEmailHandler.emit, without the sending, here and in render.
+        try:
+            request = record.request  # type: ignore[attr-defined]
+            ip = (
+                "internal"
+                if request.META.get("REMOTE_ADDR") in settings.INTERNAL_IPS
+                else "EXTERNAL"
+            )
+            subject = f"{record.levelname} ({ip} IP): {record.getMessage()}"
+        except Exception:  # noqa: BLE001
+            subject = f"{record.levelname}: {record.getMessage()}"
+        return self.format_subject(subject)
+
+    def render(self, record: logging.LogRecord) -> tuple[str, str | None]:
+        """Return the text and HTML of the report of ``record``."""
+        request = getattr(record, "request", None)
+        no_exc_record = copy(record)
+        no_exc_record.exc_info = None
+        no_exc_record.exc_text = None
+        exc_info = record.exc_info or (None, record.getMessage(), None)
+        reporter = self.reporter_class(request, *exc_info, is_email=True)  # type: ignore[attr-defined]
+        message = f"{self.format(no_exc_record)}\n\n{reporter.get_traceback_text()}"
+        html_message = reporter.get_traceback_html() if self.include_html else None
+        return message, html_message
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # ``subject`` and ``html_message`` are set by the handler's prepare.
+        self.send_mail(
+            record.subject,  # type: ignore[attr-defined]
+            record.msg,
+            fail_silently=True,
+            html_message=record.html_message,  # type: ignore[attr-defined]
+        )
+
+
+_IDLE = object()
+
+
+class _Listener(QueueListener):
+    """Also wakes up every ``interval`` seconds to call ``tick``."""
+
+    def __init__(self, queue, handler, tick, interval: float) -> None:
+        super().__init__(queue, handler)
+        self.tick = tick
+        self.interval = interval
+
+    def dequeue(self, block):
+        try:
+            return self.queue.get(block, timeout=self.interval)  # type: ignore[call-arg]
+        except queue.Empty:
+            # Not None, that is the sentinel stopping the thread.
+            return _IDLE
+
+    def handle(self, record):
+        if record is not _IDLE:
+            super().handle(record)
+        self.tick()
+
+
+class ErrorReportHandler(QueueHandler):
+    """Queues a report per fingerprint and window, mailed by a listener thread."""
+
+    def __init__(
+        self,
+        window: float = 300.0,
+        interval: float = 1.0,
+        include_html=False,  # noqa: FBT002
+        email_backend=None,
+        reporter_class=None,
+    ) -> None:
+        super().__init__(queue.SimpleQueue())
+        self.window = window
+        self.interval = interval
+        self.mailer = ReportMailer(include_html, email_backend, reporter_class)
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        # A forked child gets a copy of the queue, not the thread reading it.
+        self.queue = queue.SimpleQueue()
+        self.listener: _Listener | None = None
+        self.windows: dict[str, Window] = {}
+        self._lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            key = fingerprint(record)
+            now = time.monotonic()
+            with self._lock:
+                window = self.windows.get(key)
+                if window is not None:
+                    window.repeats += 1
+                    window.last_message = record.getMessage()
+                    return
+                # With its subject: the listener may mail the digest as soon
+                # as the window is in.
+                self.windows[key] = Window(
+                    self.mailer.subject(record),
+                    now,
+                    now + self.window,
+                )
+                if self.listener is None:
+                    self.listener = _Listener(
+                        self.queue,
+                        self.mailer,
+                        self.send_digests,
+                        self.interval,
+                    )
+                    self.listener.start()
+            report = self.prepare(record)
+            report.msg = f"{report.msg}\n\nFingerprint: {key}\n"
+            self.enqueue(report)
+        except Exception:  # noqa: BLE001
+            self.handleError(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Rendered here, the request may not be readable once it is over.
+        message, html_message = self.mailer.render(record)
+        return logging.makeLogRecord(
+            {
+                "name": record.name,
+                "levelno": record.levelno,
+                "levelname": record.levelname,
+                "msg": message,
+                "subject": self.mailer.subject(record),
+                "html_message": html_message,
+            },
+        )
+
+    def send_digests(self, *, everything: bool = False) -> None:
+        """Close the windows that are over and mail their repeats."""
+        now = time.monotonic()
+        with self._lock:
+            ended = {
+                key: window
+                for key, window in self.windows.items()
+                if everything or window.ends <= now
+            }
+            for key in ended:
+                del self.windows[key]
+        for key, window in ended.items():
+            if not window.repeats:
+                continue
+            self.mailer.send_mail(
+                self.mailer.format_subject(
+                    f"[{window.repeats} more] {window.subject}",
+                ),
+                f"The error {key} was reported {window.repeats} more times in "
+                f"the {now - window.started:.0f} seconds after its report.\n\n"
+                f"Last message: {window.last_message}",
+                fail_silently=True,
+            )
+
+    def close(self) -> None:
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        self.send_digests(everything=True)
+        super().close()
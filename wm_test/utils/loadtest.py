@@ -0,0 +1,225 @@
+"""
+Helpers for the benchmarks that load a real server over sockets.
+
+``serve()`` runs a server command in a subprocess on a free local port and
+``Load`` drives it with raw HTTP/1.1 requests from asyncio, so the numbers
+include connection handling, which the test client skips. ``smtp_server()``
+stands in for the mail server, with ``aiosmtpd``.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import time
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.management.base import CommandError
+
+if TYPE_CHECKING:
+    from aiosmtpd.smtp import Envelope
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+@contextmanager
+def serve(
+    command: Callable[[int], list[str]],
+    env: dict[str, str] | None = None,
+    timeout: float = 30.0,
+) -> Iterator[tuple[int, subprocess.Popen]]:
+    """Run ``command(port)`` until the block exits, yield the port and process."""
+    port = free_port()
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+        **(env or {}),
+    }
+    process = subprocess.Popen(  # noqa: S603
+        command(port),
+        env=env,
+        cwd=settings.BASE_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for(port, process, timeout)
+        yield port, process
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def _wait_for(port: int, process: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            msg = f"{process.args!r} exited with {process.returncode}"
+            raise CommandError(msg)
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+        except OSError:
+            time.sleep(0.1)
+        else:
+            return
+    msg = f"Nothing listened on port {port} within {timeout}s"
+    raise CommandError(msg)
+
+
+class SMTPRecorder:
+    """An ``aiosmtpd`` handler that keeps the envelopes it accepts."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        # Seconds to wait before answering each message, like a remote
+        # server would.
+        self.delay = delay
+        self.envelopes: list[Envelope] = []
+        self.connections = 0
+        # Recipients answered with a 550.
+        self.refused: set[str] = set()
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):  # noqa: N802
+        self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):  # noqa: N802
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.refused.intersection(envelope.rcpt_tos):
+            return "550 Mailbox unavailable"
+        self.envelopes.append(envelope)
+        return "250 OK"
+
+
+@contextmanager
+def smtp_server(delay: float = 0.0) -> Iterator[tuple[int, SMTPRecorder]]:
+    """Run an SMTP server in a thread, yield its port and handler."""
+    from aiosmtpd.controller import Controller
+
+    handler = SMTPRecorder(delay)
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    # aiosmtpd logs every command at INFO.
+    logger = logging.getLogger("mail.log")
+    level = logger.level
+    logger.setLevel(logging.WARNING)
+    controller.start()
+    try:
+        yield controller.port, handler
+    finally:
+        controller.stop()
+        logger.setLevel(level)
+
+
+def child_pids(pid: int) -> list[int]:
+    """Return the pids of the direct children of ``pid`` (Linux only)."""
+    children = []
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            # The command name in parentheses may contain spaces.
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(stat.parent.name))
+    return sorted(children)
+
+
+def memory_kib(pid: int) -> dict[str, int]:
+    """
+    Return the ``rss`` and ``pss`` of ``pid`` in KiB (Linux only).
+
+    PSS splits shared pages between the processes sharing them, so unlike
+    RSS it shows what copy-on-write sharing after a fork saves.
+    """
+    memory = {}
+    for name, path in (("rss", "status"), ("pss", "smaps_rollup")):
+        for line in (Path("/proc") / str(pid) / path).read_text().splitlines():
+            if line.startswith(("VmRSS:", "Pss:")):
+                memory[name] = int(line.split()[1])
+                break
+    return memory
+
+
+class Load:
+    """Concurrent GET requests against one path, with latency samples."""
+
+    def __init__(self, port: int, path: str, token: str, timeout: float = 5.0):
+        self.port = port
+        self.timeout = timeout
+        self.request = (
+            f"GET {path} HTTP/1.1\r\n"
+            "Host: localhost\r\n"
+            f"Authorization: Bearer {token}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode()
+        self.samples: list[float] = []
+        self.errors = 0
+        self.elapsed = 0.0
+
+    @property
+    def requests_per_second(self) -> float:
+        return len(self.samples) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def percentiles(self) -> tuple[float, float]:
+        """The p50 and p95 latency in milliseconds."""
+        if len(self.samples) < 2:  # noqa: PLR2004
+            return (0.0, 0.0)
+        quantiles = statistics.quantiles(self.samples, n=20)
+        return quantiles[9], quantiles[18]
+
+    async def warm_up(self, count: int) -> None:
+        for _ in range(count):
+            await self.fetch()
+
+    async def run(self, requests: int, concurrency: int) -> None:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                started = time.perf_counter()
+                if await self.fetch():
+                    self.samples.append((time.perf_counter() - started) * 1000)
+                else:
+                    self.errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        self.elapsed = time.perf_counter() - started
+
+    async def open_idle(self) -> asyncio.StreamWriter:
+        """Open a connection that sends half a request and then waits."""
+        _, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(self.request[: self.request.index(b"\r\n\r\n")])
+        await writer.drain()
+        return writer
+
+    async def fetch(self) -> bool:
+        """Make one request, return whether it was answered with a 200."""
+        try:
+            return await asyncio.wait_for(self._fetch(), self.timeout)
+        except (TimeoutError, OSError):
+            return False
+
+    async def _fetch(self) -> bool:
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        try:
+            writer.write(self.request)
+            await writer.drain()
+            status_line = await reader.readline()
+            await reader.read()
+        finally:
+            writer.close()
+        return status_line.split()[1:2] == [b"200"]
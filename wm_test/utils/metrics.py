@@ -0,0 +1,320 @@
+"""
+In-process request metrics, rendered in the Prometheus text format.
+
+``MetricsMiddleware`` records, per resolved URL name, the wall time, the
+number and total time of database queries, cache hits and misses and the
+response size. Histograms live in the worker process, so every gunicorn
+worker reports its own requests.
+
+Queries are counted by an execute wrapper installed once per database
+connection, cache lookups by the backends in ``wm_test.utils.cache``. Both
+report to the request being served through a context variable, which also
+follows the request into ``sync_to_async`` threads. The connection pools of
+``wm_test.utils.postgresql_pool`` report their wait times per database.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+if TYPE_CHECKING:
+    from psycopg_pool import ConnectionPool
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+# psycopg_pool.ConnectionPool.get_stats() keys served as gauges.
+POOL_GAUGES = {
+    "pool_size": "Connections managed by the pool.",
+    "pool_available": "Idle connections in the pool.",
+    "requests_waiting": "Requests waiting for a connection.",
+}
+UNRESOLVED = "<unresolved>"
+
+
+class RequestMetrics:
+    __slots__ = ("cache_hits", "cache_misses", "queries", "query_ns")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.query_ns = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+current_request: ContextVar[RequestMetrics | None] = ContextVar(
+    "current_request",
+    default=None,
+)
+
+
+class Histogram:
+    __slots__ = ("bounds", "count", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        # One slot per bound plus +Inf, cumulated when rendered.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self.bounds, "+Inf"), self.counts, strict=True):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class ViewMetrics:
+    __slots__ = (
+        "cache_hits",
+        "cache_misses",
+        "duration",
+        "queries",
+        "query_duration",
+        "response_size",
+        "statuses",
+    )
+
+    def __init__(self) -> None:
+        self.statuses: dict[int, int] = {}
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.query_duration = Histogram(DURATION_BUCKETS)
+        self.response_size = Histogram(SIZE_BUCKETS)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+HISTOGRAMS = {
+    "duration": (
+        "django_http_request_duration_seconds",
+        "Wall time from the first middleware to the response.",
+    ),
+    "queries": (
+        "django_http_request_db_queries",
+        "Database queries per request.",
+    ),
+    "query_duration": (
+        "django_http_request_db_duration_seconds",
+        "Time spent in database queries per request.",
+    ),
+    "response_size": (
+        "django_http_response_size_bytes",
+        "Size of non-streaming response bodies.",
+    ),
+}
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._views: dict[str, ViewMetrics] = {}
+        self._pool_waits: dict[str, Histogram] = {}
+        # Connection pools by database alias, their stats are read on render.
+        self._pools: dict[str, ConnectionPool] = {}
+
+    def record(
+        self,
+        view: str,
+        status: int,
+        duration: float,
+        metrics: RequestMetrics,
+        size: int | None,
+    ) -> None:
+        with self._lock:
+            entry = self._views.get(view)
+            if entry is None:
+                entry = self._views[view] = ViewMetrics()
+            entry.statuses[status] = entry.statuses.get(status, 0) + 1
+            entry.duration.observe(duration)
+            entry.queries.observe(metrics.queries)
+            entry.query_duration.observe(metrics.query_ns / 1e9)
+            if size is not None:
+                entry.response_size.observe(size)
+            entry.cache_hits += metrics.cache_hits
+            entry.cache_misses += metrics.cache_misses
+
+    def register_pool(self, alias: str, pool: "ConnectionPool") -> None:
+        with self._lock:
+            self._pools[alias] = pool
+
+    def record_pool_wait(self, alias: str, duration: float) -> None:
+        with self._lock:
+            histogram = self._pool_waits.get(alias)
+            if histogram is None:
+                histogram = self._pool_waits[alias] = Histogram(POOL_WAIT_BUCKETS)
+            histogram.observe(duration)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._views.clear()
+            self._pool_waits.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            views = sorted(self._views.items())
+            lines = [
+                "# HELP django_http_requests_total Responses by view and status.",
+                "# TYPE django_http_requests_total counter",
+            ]
+            for view, entry in views:
+                for status, count in sorted(entry.statuses.items()):
+                    lines.append(
+                        f'django_http_requests_total{{view="{_escape(view)}",'
+                        f'status="{status}"}} {count}',
+                    )
+            for attribute, (name, help_text) in HISTOGRAMS.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for view, entry in views:
+                    histogram = getattr(entry, attribute)
+                    if histogram.count:
+                        lines += histogram.render(name, f'view="{_escape(view)}"')
+            for attribute in ("cache_hits", "cache_misses"):
+                name = f"django_{attribute}_total"
+                lines += [
+                    f"# HELP {name} Cache {attribute.removeprefix('cache_')} by view.",
+                    f"# TYPE {name} counter",
+                ]
+                lines += [
+                    f'{name}{{view="{_escape(view)}"}} {getattr(entry, attribute)}'
+                    for view, entry in views
+                ]
+            lines += self._render_pool_waits()
+            pools = sorted(self._pools.items())
+        lines += _render_pools(pools)
+        return "\n".join(lines) + "\n"
+
+    def _render_pool_waits(self) -> list[str]:
+        if not self._pool_waits:
+            return []
+        name = "django_db_pool_wait_seconds"
+        lines = [
+            f"# HELP {name} Time spent waiting for a pooled connection.",
+            f"# TYPE {name} histogram",
+        ]
+        for alias, histogram in sorted(self._pool_waits.items()):
+            lines += histogram.render(name, f'alias="{_escape(alias)}"')
+        return lines
+
+
+registry = Registry()
+
+
+def _render_pools(pools) -> list[str]:
+    """Render the state of ``(alias, pool)`` pairs, read outside the lock."""
+    if not pools:
+        return []
+    stats = [(alias, pool.get_stats()) for alias, pool in pools]
+    lines = []
+    for key, help_text in POOL_GAUGES.items():
+        name = f"django_db_{key}"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        lines += [
+            f'{name}{{alias="{_escape(alias)}"}} {values.get(key, 0)}'
+            for alias, values in stats
+        ]
+    return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def count_query(execute, sql, params, many, context):
+    metrics = current_request.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter_ns()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.query_ns += time.perf_counter_ns() - started
+
+
+def record_cache_lookup(*, hits: int, misses: int) -> None:
+    metrics = current_request.get()
+    if metrics is not None:
+        metrics.cache_hits += hits
+        metrics.cache_misses += misses
+
+
+def install_query_counter(sender=None, connection=None, **kwargs) -> None:
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+class MetricsMiddleware:
+    """
+    Record per-view request metrics, keep it first in ``MIDDLEWARE``.
+
+    Sync and async, so under ASGI it never moves a request to a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        connection_created.connect(
+            install_query_counter,
+            dispatch_uid="wm_test.utils.metrics",
+        )
+        # Connections opened before the receiver was connected.
+        for connection in connections.all(initialized_only=True):
+            install_query_counter(connection=connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_request.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        self.record(request, response, metrics, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_request.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request.reset(token)
+        self.record(request, response, metrics, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, metrics: RequestMetrics, duration: float):
+        match = request.resolver_match
+        registry.record(
+            match.view_name if match is not None else UNRESOLVED,
+            response.status_code,
+            duration,
+            metrics,
+            None if response.streaming else len(response.content),
+        )
@@ -0,0 +1,80 @@
+"""
+Full-page caching for anonymous visitors.
+
+``cache_anonymous_page`` serves the GET and HEAD requests of visitors who
+are not logged in from the cache, one entry per host, path and language,
+for ``PAGE_CACHE_TIMEOUT`` seconds. Logged in users, requests with a query
+string and requests carrying flash messages always get a fresh render.
+
+A response is only stored when it is a 200 that leaves no per-visitor state
+behind: no cookies, no CSRF token and no modified session. The middleware
+still runs for cached hits, so ``Vary`` and security headers are added as
+usual.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.http import HttpResponse
+
+CACHEABLE_METHODS = frozenset({"GET", "HEAD"})
+
+
+def page_key(request) -> str:
+    location = f"{request.get_host()}{request.path}"
+    digest = hashlib.md5(location.encode(), usedforsecurity=False).hexdigest()
+    return f"page:{request.LANGUAGE_CODE}:{digest}"
+
+
+def cache_anonymous_page(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not _cacheable_request(request):
+            return view(request, *args, **kwargs)
+        key = page_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = view(request, *args, **kwargs)
+        if hasattr(response, "render"):
+            response.render()
+        if _cacheable_response(request, response):
+            cache.set(
+                key,
+                (response.content, response["Content-Type"]),
+                settings.PAGE_CACHE_TIMEOUT,
+            )
+        return response
+
+    return wrapper
+
+
+def _cacheable_request(request) -> bool:
+    if (
+        not settings.PAGE_CACHE_TIMEOUT
+        or request.method not in CACHEABLE_METHODS
+        or request.GET
+        or CookieStorage.cookie_name in request.COOKIES
+    ):
+        return False
+    # Without a session cookie the visitor can't be logged in, skip the lookup.
+    return (
+        settings.SESSION_COOKIE_NAME not in request.COOKIES
+        or not request.user.is_authenticated
+    )
+
+
+def _cacheable_response(request, response) -> bool:
+    session = getattr(request, "session", None)
+    return (
+        response.status_code == 200  # noqa: PLR2004
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        and not (session is not None and session.modified)
+    )
@@ -0,0 +1,54 @@
+"""
+Pagination without ``COUNT(*)`` over large tables.
+
+Counting a table is a scan of all of it, which the admin changelist runs on
+every page load. ``EstimatedCountPaginator`` takes the row count of an
+unfiltered queryset from ``pg_class.reltuples`` instead, the estimate that
+(auto)vacuum and ANALYZE keep for the planner, once it passes
+``PAGINATOR_ESTIMATE_THRESHOLD``. Smaller tables and filtered querysets,
+e.g. admin searches, are counted as usual.
+
+The estimate can be off by the rows changed since the last ANALYZE, so the
+last page may come out short or empty.
+"""
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+def table_estimate(queryset: QuerySet) -> int | None:
+    """The planner's row count of the queryset's table, if it was analyzed."""
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(queryset.model._meta.db_table)],  # noqa: SLF001
+        )
+        (reltuples,) = cursor.fetchone()
+    # -1 until the table is first vacuumed or analyzed.
+    return int(reltuples) if reltuples >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def estimated_count(self) -> int | None:
+        """The estimated count, when it stands in for ``COUNT(*)``."""
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return None
+        query = queryset.query
+        if query.where or query.distinct or query.combinator or query.is_sliced:
+            return None
+        estimate = table_estimate(queryset)
+        if estimate is None or estimate < settings.PAGINATOR_ESTIMATE_THRESHOLD:
+            return None
+        return estimate
+
+    @cached_property
+    def count(self) -> int:
+        if self.estimated_count is not None:
+            return self.estimated_count
+        return super().count
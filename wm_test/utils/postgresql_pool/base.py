@@ -0,0 +1,102 @@
+"""
+PostgreSQL backend drawing its connections from a psycopg connection pool.
+
+Django 5.0 has no ``OPTIONS["pool"]`` yet, this backend adds it on top of
+``django.db.backends.postgresql``. ``OPTIONS["pool"]`` holds the
+``psycopg_pool.ConnectionPool`` arguments, ``True`` the defaults. Each
+process gets its own pool, opened on first use so that gunicorn's preloading
+master never opens one for its workers. A connection goes back to the pool
+when Django closes it at the end of the request, so ``CONN_MAX_AGE`` must be
+0. ``CONN_HEALTH_CHECKS`` checks a connection before handing it out.
+
+The time spent waiting for a connection and the pool's size are reported
+to ``wm_test.utils.metrics``.
+"""
+
+import os
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from django.utils.asyncio import async_unsafe
+from psycopg_pool import ConnectionPool
+
+from wm_test.utils.metrics import registry
+
+# Pools by alias and process, a forked process starts without any.
+_pools: dict[tuple[str, int], ConnectionPool] = {}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # The pool self.connection came from, the one it goes back to.
+    connection_pool: ConnectionPool | None = None
+
+    @property
+    def pool(self) -> ConnectionPool | None:
+        options = self.settings_dict["OPTIONS"].get("pool")
+        if self.alias == NO_DB_ALIAS or not options:
+            return None
+        key = (self.alias, os.getpid())
+        if key not in _pools:
+            if self.settings_dict["CONN_MAX_AGE"] != 0:
+                msg = "Pooled connections can't be persistent, set CONN_MAX_AGE=0."
+                raise ImproperlyConfigured(msg)
+            kwargs = self.get_connection_params()
+            # Django sets the autocommit mode again on every checkout.
+            kwargs["autocommit"] = True
+            pool = ConnectionPool(
+                kwargs=kwargs,
+                open=False,
+                check=(
+                    ConnectionPool.check_connection
+                    if self.settings_dict["CONN_HEALTH_CHECKS"]
+                    else None
+                ),
+                name=self.alias,
+                **({} if options is True else options),
+            )
+            # Threads racing here build a pool each, the first one wins.
+            if _pools.setdefault(key, pool) is pool:
+                registry.register_pool(self.alias, pool)
+        return _pools[key]
+
+    def close_pool(self) -> None:
+        pool = _pools.pop((self.alias, os.getpid()), None)
+        if pool is not None:
+            pool.close()
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("pool", None)
+        return params
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        pool.open()
+        started = time.perf_counter()
+        connection = pool.getconn()
+        self.connection_pool = pool
+        registry.record_pool_wait(self.alias, time.perf_counter() - started)
+
+        isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+        if isolation_level is None:
+            self.isolation_level = IsolationLevel.READ_COMMITTED
+        else:
+            self.isolation_level = IsolationLevel(isolation_level)
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        pool, self.connection_pool = self.connection_pool, None
+        if self.connection is None or pool is None:
+            return super()._close()  # type: ignore[misc]
+        with self.wrap_database_errors:
+            # The pool rolls back whatever transaction is left open.
+            pool.putconn(self.connection)
+        self.connection = None
+        return None
@@ -0,0 +1,201 @@
+"""
+Opt-in sampling profiler for live requests.
+
+``SamplingProfilerMiddleware`` profiles a ``PROFILER_SAMPLE_RATE`` fraction
+of requests, and every request carrying a token from the
+``profiler_token`` command in the ``X-Profile-Token`` header. A background
+thread samples the stack of the thread serving the request every
+``PROFILER_INTERVAL`` seconds. The samples are written to ``PROFILER_DIR``
+in the collapsed-stack format that flamegraph.pl, inferno and speedscope
+read.
+
+The cost stays bounded under load:
+- only one request per process is profiled at a time;
+- a profile stops after ``PROFILER_MAX_SAMPLES`` samples;
+- the oldest profiles are deleted beyond ``PROFILER_MAX_FILES`` files or
+  ``PROFILER_MAX_BYTES`` bytes.
+
+Only the request's own thread is sampled. Under ASGI that is the event
+loop, sampled while the request's coroutine runs on it: the time it awaits,
+e.g. the ORM in a ``sync_to_async`` thread, is left out of the profile.
+"""
+
+import itertools
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+
+TOKEN_HEADER = "X-Profile-Token"  # noqa: S105
+TOKEN_SALT = "wm_test.utils.profiler"  # noqa: S105
+# Only one profile per process at a time, the others are skipped.
+_profiling = threading.Lock()
+# Keeps profile names unique within a second.
+_sequence = itertools.count()
+
+
+def make_token() -> str:
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign("profile")
+
+
+def check_token(token: str) -> bool:
+    try:
+        signing.TimestampSigner(salt=TOKEN_SALT).unsign(
+            token,
+            max_age=settings.PROFILER_TOKEN_MAX_AGE,
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def frame_label(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+class StackSampler:
+    """Count the stacks of ``thread_id`` below ``root`` until stopped."""
+
+    def __init__(self, thread_id: int, root, interval: float, max_samples: int):
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = interval
+        self.max_samples = max_samples
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        samples = 0
+        while not self._stop.wait(self.interval) and samples < self.max_samples:
+            frame = sys._current_frames().get(self.thread_id)  # noqa: SLF001
+            labels = []
+            while frame is not None and frame is not self.root:
+                labels.append(frame_label(frame))
+                frame = frame.f_back
+            # Not below the root: the event loop runs another coroutine.
+            if labels and frame is self.root:
+                self.stacks[";".join(reversed(labels))] += 1
+                samples += 1
+
+
+class SamplingProfilerMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILER_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.directory = Path(settings.PROFILER_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.wanted(request) or not _profiling.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            sampler = self.sampler(sys._getframe())  # noqa: SLF001
+            started = time.perf_counter()
+            sampler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                stacks = sampler.stop()
+            elapsed = time.perf_counter() - started
+        finally:
+            _profiling.release()
+        return self.save(request, response, stacks, elapsed)
+
+    async def __acall__(self, request):
+        if not self.wanted(request) or not _profiling.acquire(blocking=False):
+            return await self.get_response(request)
+        try:
+            sampler = self.sampler(sys._getframe())  # noqa: SLF001
+            started = time.perf_counter()
+            sampler.start()
+            try:
+                response = await self.get_response(request)
+            finally:
+                stacks = sampler.stop()
+            elapsed = time.perf_counter() - started
+        finally:
+            _profiling.release()
+        return self.save(request, response, stacks, elapsed)
+
+    def sampler(self, root) -> StackSampler:
+        return StackSampler(
+            threading.get_ident(),
+            root,
+            settings.PROFILER_INTERVAL,
+            settings.PROFILER_MAX_SAMPLES,
+        )
+
+    def save(self, request, response, stacks: Counter[str], elapsed: float):
+        if stacks:
+            path = self.write(request, stacks, elapsed)
+            response["X-Profile"] = path.name
+        return response
+
+    def wanted(self, request) -> bool:
+        token = request.headers.get(TOKEN_HEADER)
+        if token is not None:
+            return check_token(token)
+        return random.random() < settings.PROFILER_SAMPLE_RATE  # noqa: S311
+
+    def write(self, request, stacks: Counter[str], elapsed: float) -> Path:
+        match = request.resolver_match
+        view = match.view_name if match is not None else "unresolved"
+        root = f"{request.method} {view}"
+        name = re.sub(r"[^\w.-]+", "_", f"{request.method}-{view}")
+        path = self.directory / (
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-"
+            f"{elapsed * 1000:.0f}ms-{os.getpid()}-{next(_sequence)}.folded"
+        )
+        path.write_text(
+            "".join(f"{root};{stack} {count}\n" for stack, count in stacks.items()),
+        )
+        self.rotate()
+        return path
+
+    def rotate(self) -> None:
+        """Delete the oldest profiles beyond the file count and size limits."""
+        profiles = []
+        for path in self.directory.glob("*.folded"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            profiles.append((stat.st_mtime, stat.st_size, path))
+        profiles.sort(reverse=True)
+
+        total = 0
+        for kept, (_, size, path) in enumerate(profiles, start=1):
+            total += size
+            if (
+                kept > settings.PROFILER_MAX_FILES
+                or total > settings.PROFILER_MAX_BYTES
+            ):
+                path.unlink(missing_ok=True)
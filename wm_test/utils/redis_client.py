@@ -0,0 +1,10 @@
+import functools
+
+import redis
+from django.conf import settings
+
+
+@functools.cache
+def get_redis() -> redis.Redis:
+    """Return the process-wide client for ``settings.REDIS_URL``."""
+    return redis.Redis.from_url(settings.REDIS_URL)
@@ -0,0 +1,148 @@
+"""
+Derive ``select_related``/``prefetch_related``/``only()`` from serializers.
+
+A ``PlannedModelSerializer`` reads the relations it needs from its own
+declared fields. ``PlannedQuerysetMixin`` applies them to a viewset's
+queryset, so a list page costs a fixed number of queries whatever its size.
+
+Plain and dotted sources (``source="owner.name"``) over forward foreign
+keys become ``select_related`` joins, nested serializers over to-many
+relations become ``Prefetch`` objects with their own planned querysets.
+Columns are limited with ``only()`` unless a field reads something the
+planner cannot resolve to a model field (a property or a method), in which
+case every column of the queryset is loaded.
+"""
+
+from dataclasses import dataclass
+from dataclasses import field as dataclass_field
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.relations import RelatedField
+
+
+@dataclass
+class QueryPlan:
+    select_related: set[str] = dataclass_field(default_factory=set)
+    prefetch_related: list[Prefetch | str] = dataclass_field(default_factory=list)
+    only: set[str] = dataclass_field(default_factory=set)
+    # False once a field reads an attribute that is not a model field.
+    exact: bool = True
+
+    def apply(self, queryset: models.QuerySet) -> models.QuerySet:
+        if self.select_related:
+            queryset = queryset.select_related(*sorted(self.select_related))
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.exact:
+            queryset = queryset.only(*sorted(self.only))
+        return queryset
+
+
+def plan_queryset(
+    serializer: serializers.Serializer,
+    queryset: models.QuerySet,
+) -> models.QuerySet:
+    """Return ``queryset`` with the loading ``serializer`` needs applied."""
+    plan = QueryPlan()
+    _collect(serializer, queryset.model, [], plan)
+    return plan.apply(queryset)
+
+
+def _collect(
+    serializer: serializers.Serializer,
+    model: type[models.Model],
+    prefix: list[str],
+    plan: QueryPlan,
+) -> None:
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == "*":
+            # Identity fields only need the always loaded primary key, a
+            # nested serializer with source="*" reads the same instance.
+            if isinstance(field, serializers.Serializer):
+                _collect(field, model, prefix, plan)
+            continue
+        _collect_field(field, model, prefix, plan)
+
+
+def _collect_field(field, model, prefix, plan) -> None:
+    path = list(prefix)
+    current = model
+    last = len(field.source_attrs) - 1
+    for position, attr in enumerate(field.source_attrs):
+        try:
+            model_field = current._meta.get_field(attr)  # noqa: SLF001
+        except FieldDoesNotExist:
+            plan.exact = False
+            return
+        lookup = "__".join([*path, attr])
+
+        if model_field.many_to_many or model_field.one_to_many:
+            if position != last:
+                plan.exact = False
+                return
+            plan.prefetch_related.append(_prefetch(field, model_field, lookup))
+            return
+
+        if not model_field.is_relation:
+            plan.only.add(lookup)
+            return
+
+        if not model_field.concrete:
+            # Reverse one-to-one, the related row may not exist.
+            plan.exact = False
+            return
+
+        plan.only.add(lookup)
+        if position == last:
+            if isinstance(field, serializers.Serializer):
+                plan.select_related.add(lookup)
+                _collect(field, model_field.related_model, [*path, attr], plan)
+            elif not (
+                isinstance(field, RelatedField) and field.use_pk_only_optimization()
+            ):
+                # The field renders the related object itself, e.g. str().
+                plan.select_related.add(lookup)
+                plan.exact = False
+            return
+        plan.select_related.add(lookup)
+        path.append(attr)
+        current = model_field.related_model
+
+
+def _prefetch(field, model_field, lookup: str) -> Prefetch | str:
+    child = getattr(field, "child", None)
+    if not isinstance(child, serializers.Serializer):
+        # A many related field of primary keys or strings.
+        return lookup
+    related_model = model_field.related_model
+    child_plan = QueryPlan()
+    _collect(child, related_model, [], child_plan)
+    if model_field.one_to_many:
+        # Prefetching matches children to parents by their foreign key.
+        child_plan.only.add(model_field.field.name)
+    queryset = child_plan.apply(related_model._default_manager.all())  # noqa: SLF001
+    return Prefetch(lookup, queryset=queryset)
+
+
+class PlannedModelSerializer(serializers.ModelSerializer):
+    """A ``ModelSerializer`` that can plan the queryset it serializes."""
+
+    @classmethod
+    def setup_queryset(cls, queryset: models.QuerySet) -> models.QuerySet:
+        return plan_queryset(cls(), queryset)
+
+
+class PlannedQuerysetMixin:
+    """Plan the viewset queryset for its serializer class."""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()  # type: ignore[misc]
+        serializer_class = self.get_serializer_class()  # type: ignore[attr-defined]
+        if issubclass(serializer_class, PlannedModelSerializer):
+            queryset = serializer_class.setup_queryset(queryset)
+        return queryset
@@ -0,0 +1,62 @@
+"""
+Session engine and middleware that don't save unchanged sessions.
+
+``SESSION_ENGINE = "wm_test.utils.sessions"`` is Django's ``cached_db``
+engine: sessions are read from the cache and only from the database on a
+miss, writes go to both. If the cache is down, sessions keep working from
+the database.
+
+``SessionMiddleware`` replaces Django's. A session marked modified is not
+saved when its key and data are still what was loaded, as happens when a
+view assigns a value equal to the stored one.
+
+Sessions logged in through an authentication backend that was since replaced
+are moved to its replacement on their next request. Django logs out a
+session whose backend is no longer in ``AUTHENTICATION_BACKENDS``.
+"""
+
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.sessions.backends import cached_db
+from django.contrib.sessions.middleware import (
+    SessionMiddleware as BaseSessionMiddleware,
+)
+
+# Backends of stored sessions -> the backend they log in through now.
+REPLACED_BACKENDS = {
+    "django.contrib.auth.backends.ModelBackend": "wm_test.users.backends.EmailBackend",
+    "allauth.account.auth_backends.AuthenticationBackend": (
+        "wm_test.users.backends.EmailBackend"
+    ),
+}
+
+
+class SessionStore(cached_db.SessionStore):
+    _loaded: tuple[str | None, bytes] | None = None
+
+    def load(self):
+        data = super().load()
+        self._loaded = (self.session_key, self.serializer().dumps(data))
+        backend = data.get(BACKEND_SESSION_KEY)
+        if backend in REPLACED_BACKENDS:
+            data[BACKEND_SESSION_KEY] = REPLACED_BACKENDS[backend]
+            self.modified = True
+        return data
+
+    def unchanged(self) -> bool:
+        """Whether the key and data are those loaded from the store."""
+        if self._loaded is None or not hasattr(self, "_session_cache"):
+            return False
+        current = self.serializer().dumps(self._session_cache)
+        return self._loaded == (self.session_key, current)
+
+
+class SessionMiddleware(BaseSessionMiddleware):
+    def process_response(self, request, response):
+        session = getattr(request, "session", None)
+        if (
+            isinstance(session, SessionStore)
+            and session.modified
+            and session.unchanged()
+        ):
+            session.modified = False
+        return super().process_response(request, response)
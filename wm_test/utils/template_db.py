@@ -0,0 +1,168 @@
+"""
+Test databases cloned from a migrated template.
+
+Migrating an empty test database is most of the setup time of a test run,
+and with pytest-xdist every worker would migrate its own. Instead the
+migrations run once into ``<test name>_template_<fingerprint>``, the
+fingerprint hashing the source of every migration, and each worker gets a
+``CREATE DATABASE ... TEMPLATE`` copy of it, which PostgreSQL makes by
+copying files. The template is kept between runs until a migration changes
+or ``--create-db`` is given, the templates of older migrations are dropped.
+A template is labelled with the run that built it once its migrations are
+done, so under ``--create-db`` the first worker rebuilds it and the others
+clone that build, and a template left without a label by a failed or
+interrupted build is built again.
+
+The clones are dropped at the end of the session. Data serialized for
+``serialized_rollback`` is not supported.
+"""
+
+import hashlib
+import inspect
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.db import connections
+from django.db.migrations.loader import MigrationLoader
+from django.test.utils import get_unique_databases_and_mirrors
+
+# Serializes the template checks and clones of concurrent workers.
+LOCK_KEY = zlib.crc32(b"wm_test.utils.template_db")
+
+
+def migrations_fingerprint() -> str:
+    digest = hashlib.sha256(django.get_version().encode())
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    for key, migration in sorted(loader.disk_migrations.items()):
+        digest.update("/".join(key).encode())
+        digest.update(Path(inspect.getfile(type(migration))).read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def setup_databases(
+    suffix: str,
+    *,
+    rebuild: bool,
+    run_id: str,
+) -> list[tuple[str, str, str]]:
+    """
+    Give every test database a fresh clone of its template.
+
+    ``suffix`` tells concurrent workers' clones apart, ``run_id`` is shared
+    by the workers of one run. Returns the ``(alias, original name, clone
+    name)`` that ``teardown_databases`` needs.
+    """
+    fingerprint = migrations_fingerprint()
+    test_databases, mirrored_aliases = get_unique_databases_and_mirrors()
+    databases = []
+    for _, aliases in test_databases.values():
+        first, *others = aliases
+        connection = connections[first]
+        old_name = connection.settings_dict["NAME"]
+        name = _clone(connection, fingerprint, suffix, rebuild=rebuild, run_id=run_id)
+        for alias in aliases:
+            connections[alias].settings_dict["NAME"] = name
+            settings.DATABASES[alias]["NAME"] = name
+        databases.append((first, old_name, name))
+        for alias in others:
+            connections[alias].close()
+    for alias, mirror in mirrored_aliases.items():
+        connections[alias].creation.set_as_test_mirror(
+            connections[mirror].settings_dict,
+        )
+    return databases
+
+
+def teardown_databases(databases: list[tuple[str, str, str]]) -> None:
+    for alias, old_name, name in databases:
+        connection = connections[alias]
+        connection.close()
+        connection.settings_dict["NAME"] = old_name
+        settings.DATABASES[alias]["NAME"] = old_name
+        with connection._nodb_cursor() as cursor:  # noqa: SLF001
+            cursor.execute(f"DROP DATABASE IF EXISTS {_quote(connection, name)}")
+
+
+def needs_build(
+    templates: Mapping[str, str | None],
+    template: str,
+    *,
+    rebuild: bool,
+    run_id: str,
+) -> bool:
+    """Whether to migrate ``template``, given the templates and their runs."""
+    if templates.get(template) is None:
+        # Missing, or its build did not finish.
+        return True
+    # A rebuild asked for by every worker of the run, done by the first.
+    return rebuild and templates[template] != run_id
+
+
+def _clone(
+    connection,
+    fingerprint: str,
+    suffix: str,
+    *,
+    rebuild: bool,
+    run_id: str,
+) -> str:
+    test_name = connection.creation._get_test_db_name()  # noqa: SLF001
+    template = f"{test_name}_template_{fingerprint}"
+    name = f"{test_name}_{suffix}" if suffix else test_name
+    with connection._nodb_cursor() as cursor:  # noqa: SLF001
+        cursor.execute("SELECT pg_advisory_lock(%s)", [LOCK_KEY])
+        try:
+            cursor.execute(
+                "SELECT datname, shobj_description(oid, 'pg_database')"
+                " FROM pg_database WHERE datname LIKE %s",
+                [f"{test_name}\\_template\\_%"],
+            )
+            templates = dict(cursor.fetchall())
+            if needs_build(templates, template, rebuild=rebuild, run_id=run_id):
+                for stale in templates:
+                    cursor.execute(f"DROP DATABASE {_quote(connection, stale)}")
+                try:
+                    _migrate(connection, template)
+                except BaseException:
+                    cursor.execute(
+                        f"DROP DATABASE IF EXISTS {_quote(connection, template)}",
+                    )
+                    raise
+                cursor.execute(
+                    f"COMMENT ON DATABASE {_quote(connection, template)} IS %s",
+                    [run_id],
+                )
+            cursor.execute(f"DROP DATABASE IF EXISTS {_quote(connection, name)}")
+            cursor.execute(
+                f"CREATE DATABASE {_quote(connection, name)} "
+                f"TEMPLATE {_quote(connection, template)}",
+            )
+        finally:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [LOCK_KEY])
+    return name
+
+
+def _migrate(connection, template: str) -> None:
+    """Create and migrate ``template``, leaving no connection to it open."""
+    old_name = connection.settings_dict["NAME"]
+    test_settings = connection.settings_dict["TEST"]
+    old_test_name = test_settings["NAME"]
+    test_settings["NAME"] = template
+    try:
+        connection.creation.create_test_db(
+            verbosity=0,
+            autoclobber=True,
+            serialize=False,
+        )
+    finally:
+        connection.close()
+        test_settings["NAME"] = old_test_name
+        connection.settings_dict["NAME"] = old_name
+        settings.DATABASES[connection.alias]["NAME"] = old_name
+
+
+def _quote(connection, name: str) -> str:
+    return connection.ops.quote_name(name)
@@ -0,0 +1,279 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.sync import iscoroutinefunction
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.db import connections
+from django.http import HttpResponse
+from django.test import Client
+from django.test import RequestFactory
+from django.urls import reverse
+from psycopg.pq import TransactionStatus
+from rest_framework.test import APIClient
+
+from wm_test.users.models import User
+from wm_test.utils.db import PIN_COOKIE
+from wm_test.utils.db import ReplicaPinningMiddleware
+from wm_test.utils.db import ReplicaRouter
+from wm_test.utils.db import _check_lock
+from wm_test.utils.db import _replica_checks
+from wm_test.utils.db import read_only_requests
+from wm_test.utils.db import replica_lag
+from wm_test.utils.db import usable_replicas
+from wm_test.utils.loadtest import free_port
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class ViewFailedError(Exception):
+    pass
+
+
+@contextmanager
+def transaction_states():
+    """Collect whether each query ran inside a transaction."""
+    states = []
+
+    def record(execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        status = connection.connection.info.transaction_status
+        states.append((sql, status == TransactionStatus.INTRANS))
+        return result
+
+    with connection.execute_wrapper(record):
+        yield states
+
+
+@read_only_requests
+def rename_and_fail(request, pk):
+    User.objects.filter(pk=pk).update(name="renamed")
+    raise ViewFailedError
+
+
+@pytest.fixture
+def replica(settings) -> Iterator[str]:
+    """
+    Clone the test database into ``replica_1``.
+
+    The clone takes no updates from the primary, so a row differing between
+    the two shows where it was read.
+    """
+    alias = "replica_1"
+    name = f"{connection.settings_dict['NAME']}_replica"
+    connections.close_all()
+    with connection._nodb_cursor() as cursor:  # noqa: SLF001
+        cursor.execute(f"DROP DATABASE IF EXISTS {name}")
+        cursor.execute(
+            f"CREATE DATABASE {name} TEMPLATE {connection.settings_dict['NAME']}",
+        )
+    settings_dict = {**connection.settings_dict, "NAME": name, "ATOMIC_REQUESTS": False}
+    connections.settings[alias] = settings_dict
+    settings.DATABASES = {**settings.DATABASES, alias: settings_dict}
+    _replica_checks.clear()
+    yield alias
+    _replica_checks.clear()
+    connections[alias].close()
+    del connections[alias]
+    del connections.settings[alias]
+    with connection._nodb_cursor() as cursor:  # noqa: SLF001
+        cursor.execute(f"DROP DATABASE IF EXISTS {name}")
+
+
+def test_reads_avoid_transactions(client: Client, user: User):
+    client.force_login(user)
+
+    with transaction_states() as states:
+        response = client.get(reverse("users:detail", kwargs={"pk": user.pk}))
+
+    assert response.status_code == HTTPStatus.OK
+    assert states
+    assert not any(in_transaction for _, in_transaction in states)
+
+
+def test_writes_stay_atomic(client: Client, user: User):
+    client.force_login(user)
+
+    with transaction_states() as states:
+        client.post(reverse("users:update"), {"name": "Renamed"})
+
+    updates = [state for state in states if state[0].startswith("UPDATE")]
+    assert updates
+    assert all(in_transaction for _, in_transaction in updates)
+
+
+def test_unsafe_methods_of_read_only_views_roll_back(rf: RequestFactory, user: User):
+    with pytest.raises(ViewFailedError):
+        rename_and_fail(rf.post("/"), user.pk)
+
+    user.refresh_from_db()
+    assert user.name != "renamed"
+
+
+def test_safe_methods_run_in_autocommit(rf: RequestFactory, user: User):
+    with pytest.raises(ViewFailedError):
+        rename_and_fail(rf.get("/"), user.pk)
+
+    user.refresh_from_db()
+    assert user.name == "renamed"
+
+
+def test_snapshot_is_read_only(rf: RequestFactory):
+    @read_only_requests(snapshot=True)
+    def view(request):
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW transaction_read_only")
+            read_only = cursor.fetchone()[0]
+            cursor.execute("SHOW transaction_isolation")
+            return HttpResponse(f"{read_only} {cursor.fetchone()[0]}")
+
+    assert view(rf.get("/")).content == b"on repeatable read"
+
+
+@pytest.mark.usefixtures("replica")
+def test_router_sends_safe_reads_to_the_replica(rf: RequestFactory):
+    @read_only_requests
+    def view(request):
+        return HttpResponse(ReplicaRouter().db_for_read(User) or "")
+
+    @read_only_requests
+    async def async_view(request):
+        return HttpResponse(ReplicaRouter().db_for_read(User) or "")
+
+    assert view(rf.get("/")).content == b"replica_1"
+    assert async_to_sync(async_view)(rf.get("/")).content == b"replica_1"
+    assert view(rf.post("/")).content == b""
+    assert ReplicaRouter().db_for_read(User) is None
+    assert ReplicaRouter().db_for_write(User) is None
+
+
+def test_router_keeps_the_replica_of_the_request(rf: RequestFactory, monkeypatch):
+    checks = []
+
+    def usable_replicas():
+        checks.append(1)
+        return ["replica_1", "replica_2", "replica_3"]
+
+    monkeypatch.setattr("wm_test.utils.db.usable_replicas", usable_replicas)
+
+    @read_only_requests
+    def view(request):
+        aliases = {ReplicaRouter().db_for_read(User) for _ in range(20)}
+        return HttpResponse(" ".join(aliases))
+
+    assert len(view(rf.get("/")).content.split()) == 1
+    assert len(checks) == 1
+
+
+@pytest.mark.usefixtures("replica")
+def test_lag_is_checked_by_one_thread(monkeypatch):
+    def replica_lag(alias):
+        pytest.fail("Checked while another thread is checking.")
+
+    monkeypatch.setattr("wm_test.utils.db.replica_lag", replica_lag)
+
+    with _check_lock:
+        assert usable_replicas() == []
+
+
+def test_router_without_replica(rf: RequestFactory):
+    @read_only_requests
+    def view(request):
+        return HttpResponse(ReplicaRouter().db_for_read(User) or "")
+
+    assert view(rf.get("/")).content == b""
+    assert ReplicaRouter().allow_migrate("replica_1", "users") is False
+    assert ReplicaRouter().allow_migrate("default", "users") is None
+
+
+class TestReplicaHarness:
+    """A second local database stands in for a streaming replica."""
+
+    @pytest.fixture(autouse=True)
+    def _replica_name(self, user: User, replica: str):
+        # The user is created first, so the clone has them.
+        User.objects.using(replica).filter(pk=user.pk).update(name="On the replica")
+        User.objects.filter(pk=user.pk).update(name="On the primary")
+
+    def name_shown(self, client: Client, user: User) -> str:
+        response = client.get(reverse("users:detail", kwargs={"pk": user.pk}))
+        assert response.status_code == HTTPStatus.OK
+        return response.context["object"].name
+
+    def test_reads_go_to_the_replica(self, client: Client, user: User):
+        client.force_login(user)
+
+        assert self.name_shown(client, user) == "On the replica"
+
+    def test_writes_pin_reads_to_the_primary(self, client: Client, user: User):
+        client.force_login(user)
+
+        response = client.post(reverse("users:update"), {"name": "Updated"})
+
+        assert response.cookies[PIN_COOKIE]["max-age"] == 5  # noqa: PLR2004
+        assert self.name_shown(client, user) == "Updated"
+        client.cookies.pop(PIN_COOKIE)
+        assert self.name_shown(client, user) == "On the replica"
+
+    def test_me_is_cached_from_the_primary(self, user: User):
+        api_client = APIClient()
+        api_client.force_authenticate(user)
+
+        response = api_client.get(reverse("api:user-me"))
+
+        assert response.data["name"] == "On the primary"
+
+    def test_snapshot_is_on_the_replica_read_from(
+        self,
+        rf: RequestFactory,
+        user: User,
+        replica: str,
+    ):
+        @read_only_requests(snapshot=True)
+        def view(request):
+            name = User.objects.get(pk=user.pk).name
+            return HttpResponse(f"{name}, {connections[replica].in_atomic_block}")
+
+        assert view(rf.get("/")).content == b"On the replica, True"
+
+    def test_lagging_replicas_are_skipped(self, client: Client, user: User, settings):
+        settings.REPLICA_MAX_LAG = -1
+        client.force_login(user)
+
+        assert self.name_shown(client, user) == "On the primary"
+
+    def test_unreachable_replicas_are_skipped(
+        self,
+        client: Client,
+        user: User,
+        replica: str,
+    ):
+        connections.settings[replica]["PORT"] = free_port()
+        connections[replica].close()
+        client.force_login(user)
+
+        assert self.name_shown(client, user) == "On the primary"
+
+    def test_lag_of_an_idle_replica(self, replica: str):
+        assert replica_lag(replica) == 0
+
+
+@pytest.mark.usefixtures("replica")
+def test_pinning_middleware_stays_async(rf: RequestFactory):
+    async def write_view(request):
+        ReplicaRouter().db_for_write(User)
+        return HttpResponse()
+
+    middleware = ReplicaPinningMiddleware(write_view)
+
+    assert iscoroutinefunction(middleware)
+    response = async_to_sync(middleware)(rf.post("/"))
+    assert response.cookies[PIN_COOKIE].value == "1"
+
+
+def test_pinning_middleware_needs_replicas():
+    with pytest.raises(MiddlewareNotUsed):
+        ReplicaPinningMiddleware(HttpResponse)
@@ -0,0 +1,142 @@
+import logging
+import logging.config
+import threading
+import time
+from collections.abc import Iterator
+
+import pytest
+from django.core import mail
+
+from wm_test.utils import error_reports
+from wm_test.utils.error_reports import ErrorReportHandler
+from wm_test.utils.error_reports import ReportMailer
+from wm_test.utils.error_reports import fingerprint
+
+
+@pytest.fixture
+def handler() -> Iterator[ErrorReportHandler]:
+    handler = ErrorReportHandler(window=60, interval=0.01)
+    yield handler
+    handler.close()
+
+
+@pytest.fixture
+def logger(handler: ErrorReportHandler) -> Iterator[logging.Logger]:
+    logger = logging.getLogger("wm_test.tests.error_reports")
+    logger.addHandler(handler)
+    logger.propagate = False
+    yield logger
+    logger.removeHandler(handler)
+    logger.propagate = True
+
+
+class Clock:
+    """Stands in for the ``time`` module of ``error_reports``."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def fail(logger: logging.Logger, kind: str) -> None:
+    try:
+        if kind == "a":
+            raise ValueError(kind)  # noqa: TRY301
+        raise ValueError(kind)  # noqa: TRY301
+    except ValueError:
+        logger.exception("Failed with %s", kind)
+
+
+def wait_for_mails(count: int) -> list[mail.EmailMessage]:
+    deadline = time.monotonic() + 5
+    while len(mail.outbox) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return mail.outbox
+
+
+def test_fingerprint_is_the_traceback_location(logger: logging.Logger, monkeypatch):
+    records: list[logging.LogRecord] = []
+    monkeypatch.setattr(logger.handlers[0], "emit", records.append)
+
+    fail(logger, "a")
+    fail(logger, "a")
+    fail(logger, "b")
+
+    first, again, elsewhere = map(fingerprint, records)
+    assert first == again
+    assert first != elsewhere
+
+
+def test_repeats_are_mailed_as_one_digest(logger, handler: ErrorReportHandler):
+    for _ in range(5):
+        fail(logger, "a")
+    fail(logger, "b")
+
+    assert [m.subject for m in wait_for_mails(2)] == [
+        "[Django] ERROR: Failed with a",
+        "[Django] ERROR: Failed with b",
+    ]
+    assert "ValueError" in mail.outbox[0].body
+    assert "Fingerprint: " in mail.outbox[0].body
+
+    handler.close()
+
+    assert len(mail.outbox) == 3  # noqa: PLR2004
+    assert mail.outbox[2].subject == "[Django] [4 more] ERROR: Failed with a"
+
+
+def test_digest_is_sent_when_the_window_ends(
+    logger,
+    handler: ErrorReportHandler,
+    monkeypatch,
+):
+    clock = Clock()
+    monkeypatch.setattr(error_reports, "time", clock)
+    fail(logger, "a")
+    fail(logger, "a")
+    assert len(wait_for_mails(1)) == 1
+
+    clock.now += handler.window
+    subjects = [m.subject for m in wait_for_mails(2)]
+
+    assert subjects == [
+        "[Django] ERROR: Failed with a",
+        "[Django] [1 more] ERROR: Failed with a",
+    ]
+    assert not handler.windows
+
+
+def test_logging_does_not_wait_for_the_mail(logger, monkeypatch):
+    sending = threading.Event()
+    monkeypatch.setattr(
+        ReportMailer,
+        "send_mail",
+        lambda *args, **kwargs: sending.wait(),
+    )
+
+    started = time.perf_counter()
+    fail(logger, "a")
+
+    assert time.perf_counter() - started < 1
+    sending.set()
+
+
+def test_dict_config():
+    # Only the handler is built, configure() would disable the loggers of
+    # every later test.
+    configurator = logging.config.DictConfigurator({"version": 1})
+    handler = configurator.configure_handler(
+        {
+            "()": "wm_test.utils.error_reports.ErrorReportHandler",
+            "level": "ERROR",
+            "window": 10,
+            "email_backend": "django.core.mail.backends.locmem.EmailBackend",
+        },
+    )
+
+    assert isinstance(handler, ErrorReportHandler)
+    assert handler.window == 10  # noqa: PLR2004
+    assert handler.level == logging.ERROR
+    handler.close()
@@ -0,0 +1,133 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.sync import iscoroutinefunction
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from wm_test.users.models import User
+from wm_test.utils.metrics import Histogram
+from wm_test.utils.metrics import MetricsMiddleware
+from wm_test.utils.metrics import registry
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_metrics():
+    cache.clear()
+    registry.clear()
+
+
+def sample(text: str, line: str) -> float:
+    for row in text.splitlines():
+        name, _, value = row.rpartition(" ")
+        if name == line:
+            return float(value)
+    msg = f"{line} not in the metrics"
+    raise AssertionError(msg)
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((1, 5))
+    for value in (0, 1, 3, 9):
+        histogram.observe(value)
+
+    assert histogram.render("size", 'view="v"') == [
+        'size_bucket{view="v",le="1"} 2',
+        'size_bucket{view="v",le="5"} 3',
+        'size_bucket{view="v",le="+Inf"} 4',
+        'size_sum{view="v"} 13.0',
+        'size_count{view="v"} 4',
+    ]
+
+
+def test_async_requests_stay_async(rf: RequestFactory):
+    async def view(request):
+        return HttpResponse(status=HTTPStatus.ACCEPTED)
+
+    middleware = MetricsMiddleware(view)
+
+    assert iscoroutinefunction(middleware)
+    assert async_to_sync(middleware)(rf.get("/")).status_code == HTTPStatus.ACCEPTED
+    assert (
+        sample(
+            registry.render(),
+            'django_http_requests_total{view="<unresolved>",status="202"}',
+        )
+        == 1
+    )
+
+
+def test_records_per_view(user: User):
+    client = APIClient()
+    client.force_authenticate(user)
+    client.get(reverse("api:user-me"))
+    me = client.get(reverse("api:user-me"))
+    client.get(reverse("api:user-detail", kwargs={"pk": user.pk}))
+    client.get("/no-such-page/")
+
+    text = registry.render()
+
+    view = 'view="api:user-me"'
+    assert sample(text, f'django_http_requests_total{{{view},status="200"}}') == 2  # noqa: PLR2004
+    # One query to load the user on the first, cache missing request.
+    assert sample(text, f"django_http_request_db_queries_sum{{{view}}}") == 1
+    assert sample(text, f'django_http_request_db_queries_bucket{{{view},le="0"}}') == 1
+    assert sample(text, f"django_http_request_db_duration_seconds_sum{{{view}}}") > 0
+    # The miss is counted twice, by the lookup and by the read before the write.
+    assert sample(text, f"django_cache_misses_total{{{view}}}") == 2  # noqa: PLR2004
+    assert sample(text, f"django_cache_hits_total{{{view}}}") == 1
+    assert sample(
+        text,
+        f"django_http_response_size_bytes_sum{{{view}}}",
+    ) == 2 * len(me.content)
+    assert sample(text, f"django_http_request_duration_seconds_count{{{view}}}") == 2  # noqa: PLR2004
+    assert (
+        sample(
+            text,
+            'django_http_requests_total{view="api:user-detail",status="200"}',
+        )
+        == 1
+    )
+    assert (
+        sample(text, 'django_http_requests_total{view="<unresolved>",status="404"}')
+        == 1
+    )
+
+
+class TestMetricsView:
+    def test_hidden_from_anonymous_users(self, client):
+        response = client.get(reverse("metrics"))
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_token(self, client, settings):
+        settings.METRICS_TOKEN = "scrape-token"  # noqa: S105
+
+        wrong = client.get(reverse("metrics"), headers={"Authorization": "Bearer no"})
+        response = client.get(
+            reverse("metrics"),
+            headers={"Authorization": "Bearer scrape-token"},
+        )
+
+        assert wrong.status_code == HTTPStatus.NOT_FOUND
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE django_http_request_duration_seconds histogram" in (
+            response.content.decode()
+        )
+
+    def test_staff(self, admin_client):
+        admin_client.get(reverse("metrics"))
+
+        response = admin_client.get(reverse("metrics"))
+
+        assert response.status_code == HTTPStatus.OK
+        assert 'django_http_requests_total{view="metrics",status="200"} 1' in (
+            response.content.decode()
+        )
@@ -0,0 +1,143 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.test import Client
+from django.test import RequestFactory
+from django.urls import reverse
+
+from wm_test.users.models import User
+from wm_test.users.tests.factories import UserFactory
+from wm_test.utils.page_cache import cache_anonymous_page
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class CountingView:
+    def __init__(self, respond=None):
+        self.renders = 0
+        self.respond = respond or (lambda request: HttpResponse("page"))
+        self.view = cache_anonymous_page(self)
+
+    def __call__(self, request):
+        self.renders += 1
+        return self.respond(request)
+
+    def get(self, rf: RequestFactory, path="/", language="en", user=None, **kwargs):
+        request = rf.get(path, **kwargs)
+        request.LANGUAGE_CODE = language
+        request.user = user or AnonymousUser()
+        return self.view(request)
+
+
+def test_anonymous_pages_are_cached(rf: RequestFactory):
+    counting = CountingView()
+
+    first = counting.get(rf)
+    second = counting.get(rf)
+
+    assert counting.renders == 1
+    assert second.content == first.content == b"page"
+
+
+def test_one_entry_per_language_and_path(rf: RequestFactory):
+    counting = CountingView()
+
+    counting.get(rf, language="en")
+    counting.get(rf, language="ru")
+    counting.get(rf, path="/about/")
+    counting.get(rf, language="ru")
+
+    assert counting.renders == 3  # noqa: PLR2004
+
+
+def test_logged_in_users_are_not_cached(rf: RequestFactory, user: User):
+    counting = CountingView()
+    rf.cookies[settings.SESSION_COOKIE_NAME] = "session"
+
+    counting.get(rf, user=user)
+    counting.get(rf, user=user)
+
+    assert counting.renders == 2  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"data": {"utm_source": "mail"}}, {"headers": {"Cookie": "messages=pending"}}],
+)
+def test_bypassed_requests(rf: RequestFactory, kwargs):
+    counting = CountingView()
+
+    counting.get(rf, **kwargs)
+    counting.get(rf, **kwargs)
+
+    assert counting.renders == 2  # noqa: PLR2004
+
+
+def set_cookie(request):
+    response = HttpResponse("page")
+    response.set_cookie("visitor", "1")
+    return response
+
+
+def with_csrf_token(request):
+    return HttpResponse(get_token(request))
+
+
+@pytest.mark.parametrize(
+    "respond",
+    [set_cookie, with_csrf_token, lambda request: HttpResponse(status=404)],
+)
+def test_visitor_specific_responses_are_not_stored(rf: RequestFactory, respond):
+    counting = CountingView(respond)
+
+    counting.get(rf)
+    counting.get(rf)
+
+    assert counting.renders == 2  # noqa: PLR2004
+
+
+def test_timeout_zero_turns_it_off(rf: RequestFactory, settings):
+    settings.PAGE_CACHE_TIMEOUT = 0
+    counting = CountingView()
+
+    counting.get(rf)
+    counting.get(rf)
+
+    assert counting.renders == 2  # noqa: PLR2004
+
+
+def test_navbar_fragment_is_per_user(client: Client, user: User):
+    other = UserFactory()
+
+    anonymous = client.get(reverse("home")).content.decode()
+    client.force_login(user)
+    first = client.get(reverse("home")).content.decode()
+    client.force_login(other)
+    second = client.get(reverse("home")).content.decode()
+
+    assert 'id="log-in-link"' in anonymous
+    assert reverse("users:detail", kwargs={"pk": user.pk}) in first
+    assert reverse("users:detail", kwargs={"pk": other.pk}) in second
+
+
+def test_anonymous_home_is_served_from_the_cache(client: Client):
+    first = client.get(reverse("home"))
+    second = client.get(reverse("home"))
+
+    assert first.status_code == second.status_code == HTTPStatus.OK
+    # Cached hits are plain responses, the render produced a TemplateResponse.
+    assert hasattr(first, "template_name")
+    assert not hasattr(second, "template_name")
+    assert second.content == first.content
@@ -0,0 +1,48 @@
+import pytest
+from django.db import connection
+
+from wm_test.users.models import User
+from wm_test.utils.paginator import EstimatedCountPaginator
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def _analyzed_users(make_users, settings):
+    make_users(5)
+    with connection.cursor() as cursor:
+        # Counts the rows inserted by the test's own transaction too.
+        cursor.execute(f"ANALYZE {User._meta.db_table}")  # noqa: SLF001
+    settings.PAGINATOR_ESTIMATE_THRESHOLD = 3
+
+
+@pytest.mark.usefixtures("_analyzed_users")
+def test_large_table_is_not_counted(django_assert_num_queries):
+    paginator = EstimatedCountPaginator(User.objects.order_by("id"), 2)
+    count = User.objects.count()
+
+    with django_assert_num_queries(1) as captured:
+        assert paginator.count == count
+    assert "reltuples" in captured.captured_queries[0]["sql"]
+    assert paginator.estimated_count == paginator.count
+    assert len(paginator.page(3)) == 1
+
+
+@pytest.mark.usefixtures("_analyzed_users")
+def test_small_table_is_counted(settings):
+    settings.PAGINATOR_ESTIMATE_THRESHOLD = 100
+    paginator = EstimatedCountPaginator(User.objects.order_by("id"), 2)
+
+    assert paginator.count == User.objects.count()
+    assert paginator.estimated_count is None
+
+
+@pytest.mark.usefixtures("_analyzed_users")
+def test_filtered_queryset_is_counted(django_assert_num_queries):
+    first = User.objects.order_by("id")[0]
+    paginator = EstimatedCountPaginator(User.objects.filter(pk=first.pk), 2)
+
+    with django_assert_num_queries(1) as captured:
+        assert paginator.count == 1
+    assert "COUNT(*)" in captured.captured_queries[0]["sql"]
+    assert paginator.estimated_count is None
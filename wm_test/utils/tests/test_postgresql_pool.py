@@ -0,0 +1,82 @@
+import copy
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+from wm_test.utils.metrics import registry
+from wm_test.utils.postgresql_pool.base import DatabaseWrapper
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def pooled():
+    settings_dict = copy.deepcopy(connection.settings_dict)
+    settings_dict["ENGINE"] = "wm_test.utils.postgresql_pool"
+    settings_dict["CONN_MAX_AGE"] = 0
+    settings_dict["OPTIONS"]["pool"] = {"min_size": 1, "max_size": 1}
+    wrapper = DatabaseWrapper(settings_dict, alias="pooled")
+    registry.clear()
+    yield wrapper
+    wrapper.close()
+    wrapper.close_pool()
+
+
+def backend_pid(wrapper: DatabaseWrapper) -> int:
+    with wrapper.cursor() as cursor:
+        cursor.execute("SELECT pg_backend_pid()")
+        return cursor.fetchone()[0]
+
+
+def test_connections_are_reused(pooled: DatabaseWrapper):
+    first = backend_pid(pooled)
+    pooled.close()
+
+    assert pooled.connection is None
+    assert backend_pid(pooled) == first
+    assert pooled.pool is not None
+    assert pooled.pool.get_stats()["pool_size"] == 1
+
+
+def test_closing_rolls_back(pooled: DatabaseWrapper):
+    pooled.set_autocommit(False)
+    with pooled.cursor() as cursor:
+        cursor.execute("CREATE TEMPORARY TABLE leftover (id int)")
+    pooled.close()
+
+    with pooled.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('pg_temp.leftover')")
+        assert cursor.fetchone() == (None,)
+    assert pooled.get_autocommit()
+
+
+def test_broken_connections_are_replaced(pooled: DatabaseWrapper):
+    pooled.settings_dict["CONN_HEALTH_CHECKS"] = True
+    pooled.close_pool()
+    first = backend_pid(pooled)
+    pooled.close()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_terminate_backend(%s)", [first])
+
+    assert backend_pid(pooled) != first
+
+
+def test_wait_time_and_size_are_reported(pooled: DatabaseWrapper):
+    backend_pid(pooled)
+    pooled.close()
+    backend_pid(pooled)
+
+    text = registry.render()
+
+    assert 'django_db_pool_wait_seconds_count{alias="pooled"} 2' in text
+    assert 'django_db_pool_size{alias="pooled"} 1' in text
+    assert 'django_db_pool_available{alias="pooled"} 0' in text
+
+
+def test_persistent_connections_are_rejected(pooled: DatabaseWrapper):
+    pooled.close_pool()
+    pooled.settings_dict["CONN_MAX_AGE"] = 60
+
+    with pytest.raises(ImproperlyConfigured):
+        pooled.connect()
@@ -0,0 +1,90 @@
+import time
+from pathlib import Path
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from wm_test.utils.profiler import TOKEN_HEADER
+from wm_test.utils.profiler import SamplingProfilerMiddleware
+from wm_test.utils.profiler import make_token
+
+
+def slow_view(request):
+    time.sleep(0.03)
+    return HttpResponse("ok")
+
+
+@pytest.fixture
+def profiles(settings, tmp_path) -> Path:
+    settings.PROFILER_ENABLED = True
+    settings.PROFILER_SAMPLE_RATE = 0.0
+    settings.PROFILER_DIR = str(tmp_path / "profiles")
+    settings.PROFILER_INTERVAL = 0.001
+    return tmp_path / "profiles"
+
+
+def test_disabled_by_default(settings):
+    settings.PROFILER_ENABLED = False
+
+    with pytest.raises(MiddlewareNotUsed):
+        SamplingProfilerMiddleware(slow_view)
+
+
+def test_signed_token_profiles_request(profiles, rf: RequestFactory):
+    middleware = SamplingProfilerMiddleware(slow_view)
+
+    response = middleware(rf.get("/", headers={TOKEN_HEADER: make_token()}))
+
+    (path,) = profiles.iterdir()
+    assert response["X-Profile"] == path.name
+    stack, count = path.read_text().splitlines()[0].rsplit(" ", 1)
+    assert stack == ("GET unresolved;wm_test.utils.tests.test_profiler:slow_view")
+    assert int(count) > 1
+
+
+def test_profiles_async_requests(profiles, rf: RequestFactory):
+    async def busy_view(request):
+        deadline = time.perf_counter() + 0.03
+        while time.perf_counter() < deadline:
+            pass
+        return HttpResponse("ok")
+
+    middleware = SamplingProfilerMiddleware(busy_view)
+
+    response = async_to_sync(middleware)(
+        rf.get("/", headers={TOKEN_HEADER: make_token()}),
+    )
+
+    (path,) = profiles.iterdir()
+    assert response["X-Profile"] == path.name
+    stacks = [line.rsplit(" ", 1)[0] for line in path.read_text().splitlines()]
+    assert stacks[0] == (
+        "GET unresolved;"
+        "wm_test.utils.tests.test_profiler:test_profiles_async_requests.<locals>.busy_view"
+    )
+
+
+def test_bad_token_is_ignored(profiles, rf: RequestFactory):
+    middleware = SamplingProfilerMiddleware(slow_view)
+
+    response = middleware(rf.get("/", headers={TOKEN_HEADER: "profile:forged"}))
+
+    assert "X-Profile" not in response
+    assert list(profiles.iterdir()) == []
+
+
+def test_sample_rate_and_rotation(profiles, settings, rf: RequestFactory):
+    settings.PROFILER_SAMPLE_RATE = 1.0
+    settings.PROFILER_MAX_FILES = 2
+    middleware = SamplingProfilerMiddleware(slow_view)
+
+    names = []
+    for _ in range(3):
+        names.append(middleware(rf.get("/"))["X-Profile"])
+        # Distinct modification times for the rotation order.
+        time.sleep(0.01)
+
+    assert sorted(path.name for path in profiles.iterdir()) == sorted(names[1:])
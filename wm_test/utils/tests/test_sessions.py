@@ -0,0 +1,126 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from wm_test.users.models import User
+from wm_test.utils.sessions import SessionMiddleware
+from wm_test.utils.sessions import SessionStore
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _engine(settings):
+    settings.SESSION_ENGINE = "wm_test.utils.sessions"
+
+
+@pytest.fixture
+def saves(monkeypatch) -> list[str]:
+    saved = []
+    save = SessionStore.save
+
+    def counting_save(self, *args, **kwargs):
+        saved.append(self.session_key)
+        return save(self, *args, **kwargs)
+
+    monkeypatch.setattr(SessionStore, "save", counting_save)
+    return saved
+
+
+def run(view, rf: RequestFactory, session_key: str | None = None):
+    request = rf.get("/")
+    if session_key is not None:
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = session_key
+    return SessionMiddleware(view)(request)
+
+
+def stored_session(**data) -> str:
+    session = SessionStore()
+    session.update(data)
+    session.save()
+    assert session.session_key is not None
+    return session.session_key
+
+
+def test_logged_in_pages_skip_the_session_table(client: Client, user: User):
+    client.force_login(user)
+
+    with CaptureQueriesContext(connection) as queries:
+        client.get(reverse("users:detail", kwargs={"pk": user.pk}))
+
+    assert not [query for query in queries if "django_session" in query["sql"]]
+
+
+def test_sessions_of_replaced_backends_stay_logged_in(client: Client, user: User):
+    client.force_login(user, backend="wm_test.users.backends.EmailBackend")
+    session = SessionStore(client.cookies[settings.SESSION_COOKIE_NAME].value)
+    session["_auth_user_backend"] = "django.contrib.auth.backends.ModelBackend"
+    session.save()
+
+    response = client.get(reverse("users:detail", kwargs={"pk": user.pk}))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.wsgi_request.user == user
+    stored = SessionStore(session.session_key).load()
+    assert stored["_auth_user_backend"] == "wm_test.users.backends.EmailBackend"
+
+
+def test_equal_values_are_not_saved(rf: RequestFactory, saves: list[str]):
+    session_key = stored_session(theme="dark")
+    saves.clear()
+
+    def view(request):
+        request.session["theme"] = "dark"
+        return HttpResponse()
+
+    run(view, rf, session_key)
+
+    assert saves == []
+
+
+def test_changes_are_saved(rf: RequestFactory, saves: list[str]):
+    session_key = stored_session(theme="dark")
+    saves.clear()
+
+    def view(request):
+        request.session["theme"] = "light"
+        return HttpResponse()
+
+    run(view, rf, session_key)
+
+    assert saves == [session_key]
+    assert SessionStore(session_key)["theme"] == "light"
+
+
+def test_new_keys_are_saved(rf: RequestFactory, saves: list[str]):
+    session_key = stored_session(theme="dark")
+    saves.clear()
+
+    def view(request):
+        request.session.cycle_key()
+        return HttpResponse()
+
+    response = run(view, rf, session_key)
+
+    new_key = response.cookies[settings.SESSION_COOKIE_NAME].value
+    assert new_key != session_key
+    assert saves[-1] == new_key
+    assert SessionStore(new_key)["theme"] == "dark"
+
+
+def test_new_sessions_are_saved(rf: RequestFactory):
+    def view(request):
+        request.session["theme"] = "dark"
+        return HttpResponse()
+
+    response = run(view, rf)
+
+    session_key = response.cookies[settings.SESSION_COOKIE_NAME].value
+    assert SessionStore(session_key)["theme"] == "dark"
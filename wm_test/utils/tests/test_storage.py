@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.templatetags.static import static
+from django.test import Client
+from django.test import override_settings
+
+from wm_test.utils.storage import ParallelCompressedManifestStaticFilesStorage
+
+BACKEND = "wm_test.utils.storage.ParallelCompressedManifestStaticFilesStorage"
+
+
+@pytest.fixture(params=[1, 2], ids=["serial", "parallel"])
+def collected(request, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        ParallelCompressedManifestStaticFilesStorage,
+        "workers",
+        request.param,
+    )
+    source = tmp_path / "static"
+    (source / "css").mkdir(parents=True)
+    (source / "css" / "site.css").write_text("body { color: red; }\n" * 200)
+    (source / "js").mkdir()
+    (source / "js" / "site.js").write_text("console.log('hello');\n" * 200)
+    (source / "logo.png").write_bytes(b"\x89PNG" + bytes(range(256)) * 8)
+    root = tmp_path / "staticfiles"
+    with override_settings(
+        STATIC_ROOT=str(root),
+        STATICFILES_DIRS=[str(source)],
+        STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+        STORAGES={
+            "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+            "staticfiles": {"BACKEND": BACKEND},
+        },
+        WHITENOISE_KEEP_ONLY_HASHED_FILES=True,
+    ):
+        call_command("collectstatic", interactive=False, verbosity=0)
+        yield root
+
+
+def test_compresses_hashed_files_with_brotli_and_gzip(collected):
+    pytest.importorskip("brotli")
+    css = sorted(path.name for path in (collected / "css").iterdir())
+    js = sorted(path.name for path in (collected / "js").iterdir())
+
+    assert len(css) == 3  # noqa: PLR2004
+    hashed = css[0]
+    assert hashed.startswith("site.")
+    assert hashed != "site.css"
+    assert css == [hashed, f"{hashed}.br", f"{hashed}.gz"]
+    assert [name.rsplit(".", 2)[-1] for name in js] == ["js", "br", "gz"]
+    # Already compressed formats are left alone.
+    assert [path.suffix for path in collected.glob("logo.*")] == [".png"]
+
+
+def test_serves_hashed_files_immutable(collected):
+    pytest.importorskip("brotli")
+    url = static("css/site.css")
+    assert url != "/static/css/site.css"
+
+    response = Client().get(url, headers={"accept-encoding": "br, gzip"})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Encoding"] == "br"
+    cache_control = response["Cache-Control"]
+    assert "immutable" in cache_control
+    max_age = int(cache_control.split("max-age=")[1].split(",")[0])
+    assert max_age >= 365 * 24 * 60 * 60
@@ -0,0 +1,46 @@
+import os
+
+import pytest
+from django.db import connection
+
+from wm_test.utils.template_db import migrations_fingerprint
+from wm_test.utils.template_db import needs_build
+
+pytestmark = pytest.mark.django_db
+
+
+def test_fingerprint_is_stable():
+    assert migrations_fingerprint() == migrations_fingerprint()
+
+
+def test_create_db_builds_once_per_run():
+    templates = {"test_template_new": "run-1", "test_template_old": None}
+
+    assert needs_build(templates, "test_template_next", rebuild=False, run_id="run-1")
+    assert not needs_build(
+        templates, "test_template_new", rebuild=False, run_id="run-2"
+    )
+    assert needs_build(templates, "test_template_new", rebuild=True, run_id="run-2")
+    assert not needs_build(templates, "test_template_new", rebuild=True, run_id="run-1")
+
+
+def test_unfinished_template_is_rebuilt():
+    # Created, but its build failed before labelling it.
+    templates = {"test_template_new": None}
+
+    assert needs_build(templates, "test_template_new", rebuild=False, run_id="run-1")
+
+
+def test_runs_on_a_clone_of_the_template():
+    name = connection.settings_dict["NAME"]
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    test_name = name.removesuffix(f"_{worker}") if worker else name
+
+    assert name.startswith("test_")
+    assert name != test_name or not worker
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_database WHERE datname = %s",
+            [f"{test_name}_template_{migrations_fingerprint()}"],
+        )
+        assert cursor.fetchone() is not None
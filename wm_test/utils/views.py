@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.http import Http404
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from .metrics import registry
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@require_GET
+def metrics_view(request):
+    """Serve this worker's request metrics to Prometheus."""
+    authorization = request.headers.get("Authorization", "")
+    token = authorization.removeprefix("Bearer ")
+    authorized = (
+        settings.METRICS_TOKEN
+        and authorization.startswith("Bearer ")
+        and constant_time_compare(token, settings.METRICS_TOKEN)
+    )
+    if not authorized and not request.user.is_staff:
+        raise Http404
+    return HttpResponse(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)